@@ -1,10 +1,8 @@
 from hanspell import spell_checker
-from kiwipiepy import Kiwi
-
-kiwi = Kiwi()
+from ai_common.kiwi_provider import get_kiwi_provider
 
 def safe_spell_check(text: str) -> str:
-    spaced_sentence = kiwi.space(text)
+    spaced_sentence = get_kiwi_provider().space(text)
     try:
         result = spell_checker.check(spaced_sentence)
         return result.checked
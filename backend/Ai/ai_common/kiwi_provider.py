@@ -0,0 +1,129 @@
+# ai_common/kiwi_provider.py (프로세스 공용 Kiwi 형태소 분석기)
+"""
+Kiwi()는 만들 때마다 모델 파일을 읽어서 느리므로 프로세스에서 몇 개만 만들어 함께 쓴다.
+
+- 인스턴스 풀: 최대 KIWI_POOL_SIZE개 (필요할 때 하나씩 생성), 한 인스턴스는 한 번에 한 스레드만 사용
+- analyze_many: 여러 문장을 Kiwi 멀티스레드 배치 분석(KIWI_NUM_WORKERS개 스레드)으로 한 번에 처리
+- nouns / nouns_many: 문단별 명사 추출 결과 LRU 캐시
+
+AI 서버: from ai_common.kiwi_provider import get_kiwi_provider
+백엔드:  from Ai.ai_common.kiwi_provider import get_kiwi_provider
+"""
+import os, queue, threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Iterator, List, Sequence, Tuple
+
+from kiwipiepy import Kiwi
+
+NOUN_TAGS = ('NNG', 'NNP')   # 일반명사, 고유명사
+NOUN_MIN_LENGTH = 2
+
+
+def _nouns_of(result) -> Tuple[str, ...]:
+    """analyze 결과(top_n=1) → 두 글자 이상 명사 (중복 제거, 나온 순서)"""
+    if not result or not result[0][0]:
+        return ()
+    return tuple(dict.fromkeys(token.form for token in result[0][0]
+                               if token.tag in NOUN_TAGS and len(token.form) >= NOUN_MIN_LENGTH))
+
+
+class KiwiProvider:
+    def __init__(self, pool_size: int = None, num_workers: int = None, noun_cache_size: int = 4096):
+        self.pool_size = pool_size or int(os.getenv("KIWI_POOL_SIZE", "2"))
+        self.num_workers = num_workers if num_workers is not None else \
+            int(os.getenv("KIWI_NUM_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.noun_cache_size = noun_cache_size
+
+        self._idle: 'queue.LifoQueue[Kiwi]' = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._nouns: 'OrderedDict[str, Tuple[str, ...]]' = OrderedDict()
+        self._nouns_lock = threading.Lock()
+
+    # ---------- 인스턴스 풀 ----------
+    @contextmanager
+    def acquire(self) -> Iterator[Kiwi]:
+        """쉬고 있는 인스턴스를 빌려줌 (없으면 pool_size까지 새로 만들고, 다 쓰는 중이면 반납될 때까지 대기)"""
+        try:
+            kiwi = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    kiwi = Kiwi(num_workers=self.num_workers)
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                print(f"✅ Kiwi 인스턴스 생성 ({self._created}/{self.pool_size})")
+            else:
+                kiwi = self._idle.get()
+        try:
+            yield kiwi
+        finally:
+            self._idle.put(kiwi)
+
+    # ---------- 분석 ----------
+    def analyze(self, text: str, top_n: int = 1):
+        with self.acquire() as kiwi:
+            return kiwi.analyze(text, top_n=top_n)
+
+    def analyze_many(self, texts: Sequence[str], top_n: int = 1) -> list:
+        """여러 문장을 한 번에 분석 (입력 순서대로 결과)"""
+        if not texts:
+            return []
+        with self.acquire() as kiwi:
+            return list(kiwi.analyze(list(texts), top_n=top_n))
+
+    def space(self, text: str) -> str:
+        with self.acquire() as kiwi:
+            return kiwi.space(text)
+
+    # ---------- 명사 추출 (LRU) ----------
+    def _cached_nouns(self, paragraph: str):
+        with self._nouns_lock:
+            nouns = self._nouns.get(paragraph)
+            if nouns is not None:
+                self._nouns.move_to_end(paragraph)
+            return nouns
+
+    def _remember_nouns(self, paragraph: str, nouns: Tuple[str, ...]):
+        with self._nouns_lock:
+            self._nouns[paragraph] = nouns
+            self._nouns.move_to_end(paragraph)
+            while len(self._nouns) > self.noun_cache_size:
+                self._nouns.popitem(last=False)
+
+    def nouns(self, paragraph: str) -> List[str]:
+        nouns = self._cached_nouns(paragraph)
+        if nouns is None:
+            nouns = _nouns_of(self.analyze(paragraph))
+            self._remember_nouns(paragraph, nouns)
+        return list(nouns)
+
+    def nouns_many(self, paragraphs: Sequence[str]) -> List[List[str]]:
+        """캐시에 없는 문단만 배치 분석 (문제 여러 개를 만들기 전에 미리 채워 두는 용도)"""
+        found = {paragraph: self._cached_nouns(paragraph) for paragraph in paragraphs}
+        missing = [paragraph for paragraph, nouns in found.items() if nouns is None]
+        for paragraph, result in zip(missing, self.analyze_many(missing)):
+            found[paragraph] = _nouns_of(result)
+            self._remember_nouns(paragraph, found[paragraph])
+        return [list(found[paragraph]) for paragraph in paragraphs]
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_kiwi_provider() -> KiwiProvider:
+    """프로세스 공용 KiwiProvider (처음 호출할 때 생성)"""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = KiwiProvider()
+    return _provider
@@ -3,7 +3,6 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from kiwipiepy import Kiwi
 from collections import Counter
 import re
 import warnings
@@ -11,9 +10,7 @@ warnings.filterwarnings("ignore")
 
 # 맞춤법 검사기 모듈 가져오기
 from ai_common.clean_contents import safe_spell_check
-
-
-kiwi = Kiwi()
+from ai_common.kiwi_provider import get_kiwi_provider
 
 # -------- 설정 --------
 _RE_KOREAN = re.compile(r"[^가-힣\s]")
@@ -30,7 +27,7 @@ def extract_tokens(text: str):
     avg_sentence_len = (sum(sentences) / len(sentences)) if sentences else 0.0
 
     # Kiwi 형태소 분석
-    analyzed = kiwi.analyze(checked_sentence)
+    analyzed = get_kiwi_provider().analyze(checked_sentence)
     tokens = []
     if analyzed and analyzed[0][0]:
         for token in analyzed[0][0]:
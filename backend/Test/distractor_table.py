@@ -0,0 +1,154 @@
+"""
+오답 보기 미리 계산 (voca_labels 단어마다 오답 후보 목록 + 나이별 무작위 후보 풀)
+
+요청마다 DB 쿼리 2~3번(ORDER BY RANDOM() 포함)과 Kiwi 분석을 하던 것을
+오프라인에서 한 번 계산해 둔 표에서 찾기 + 무작위 선택으로 대체한다.
+
+- 단어마다 정답과 거리가 [MIN_DISTANCE, MAX_DISTANCE]인 단어를 먼 순서로, VocabularyAssessment._is_valid_distractor를
+  통과한 것만 PER_WORD개 저장 (문해력 평가는 자기 기준으로 한 번 더 거름)
+- 저장 형식: data/distractors.npz (words, ages, offsets, distractors - 단어 번호 배열, pickle 없음)
+
+생성: python -m Test.distractor_table  (backend 디렉토리에서, DATABASE_URL 필요)
+"""
+import os, random, re, sys, threading, time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from Test.similar_words import MAX_DISTANCE, MIN_DISTANCE, normalize
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PATH = os.path.join(BASE_DIR, "data/distractors.npz")
+PER_WORD = 20
+# 무작위 후보는 정답 나이 ± AGE_SPREAD (기존 쿼리의 BETWEEN age-1 AND age+1)
+AGE_SPREAD = 1
+_BLOCK = 256
+_HANGUL_WORD = re.compile(r"[가-힣]{2,}")
+
+
+class DistractorTable:
+    """미리 계산한 오답 후보 (lookup: 정답 → 먼 순서 후보, random_words: 나이별 무작위 후보)"""
+
+    def __init__(self, words: np.ndarray, ages: np.ndarray, offsets: np.ndarray, distractors: np.ndarray):
+        self.words: List[str] = [str(w) for w in words]
+        self.ages = ages
+        self.offsets = offsets
+        self.distractors = distractors
+        self.row_of: Dict[str, int] = {word: i for i, word in enumerate(self.words)}
+
+        # 나이 → 그 나이 ± AGE_SPREAD의 한글 두 글자 이상 단어 번호 (요청마다 concat하지 않도록 미리)
+        usable = np.array([bool(_HANGUL_WORD.fullmatch(w)) for w in self.words], dtype=bool)
+        self.age_pools: Dict[int, np.ndarray] = {}
+        for age in np.unique(ages):
+            band = (ages >= age - AGE_SPREAD) & (ages <= age + AGE_SPREAD) & usable
+            self.age_pools[int(age)] = np.flatnonzero(band).astype(np.int32)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def lookup(self, word: str, limit: int = None) -> List[str]:
+        row = self.row_of.get(word)
+        if row is None:
+            return []
+        ids = self.distractors[self.offsets[row]:self.offsets[row + 1]]
+        return [self.words[i] for i in ids[:limit]]
+
+    def random_words(self, age_level: int, exclude: str, count: int = 10, rng: random.Random = random) -> List[str]:
+        pool = self.age_pools.get(age_level)
+        if pool is None:
+            # 표에 없는 나이 → 가장 가까운 나이의 풀
+            if not self.age_pools:
+                return []
+            pool = self.age_pools[min(self.age_pools, key=lambda age: abs(age - age_level))]
+        picks = rng.sample(range(len(pool)), min(count + 1, len(pool)))
+        return [w for w in (self.words[pool[i]] for i in picks) if w != exclude][:count]
+
+    # ---------- 생성 / 저장 / 로드 ----------
+    @classmethod
+    def build(cls, words: List[str], ages: np.ndarray, embeddings: np.ndarray, per_word: int = PER_WORD,
+              is_valid: Callable[[str, str], bool] = None) -> 'DistractorTable':
+        """단어마다 거리가 [MIN_DISTANCE, MAX_DISTANCE]인 단어를 먼 순서로 is_valid 통과분만 per_word개 (행렬 곱을 블록 단위로)"""
+        if is_valid is None:
+            from Test.vocabulary_assessment import VocabularyAssessment
+            is_valid = VocabularyAssessment._is_valid_distractor
+
+        matrix = normalize(embeddings)
+        n = len(words)
+        candidates = min(n, per_word * 4)
+        rows: List[List[int]] = []
+        for start in range(0, n, _BLOCK):
+            distances = 1.0 - matrix[start:start + _BLOCK] @ matrix.T
+            distances[(distances < MIN_DISTANCE) | (distances > MAX_DISTANCE)] = -np.inf
+            top = np.argpartition(-distances, candidates - 1, axis=1)[:, :candidates] if candidates else \
+                np.zeros((len(distances), 0), dtype=np.int64)
+            for offset, (row_distances, row_top) in enumerate(zip(distances, top)):
+                answer = words[start + offset]
+                chosen, seen = [], {answer}
+                for j in row_top[np.argsort(-row_distances[row_top], kind='stable')]:
+                    word = words[j]
+                    if np.isinf(row_distances[j]) or word in seen or not is_valid(word, answer):
+                        continue
+                    seen.add(word)
+                    chosen.append(int(j))
+                    if len(chosen) >= per_word:
+                        break
+                rows.append(chosen)
+
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(r) for r in rows], out=offsets[1:])
+        distractors = np.fromiter((j for r in rows for j in r), dtype=np.int32, count=int(offsets[-1]))
+        return cls(np.array(words), np.asarray(ages, dtype=np.int16), offsets, distractors)
+
+    @classmethod
+    def build_from_db(cls, db, per_word: int = PER_WORD) -> 'DistractorTable':
+        from models import VocaLabels
+
+        rows = (db.query(VocaLabels.word, VocaLabels.assigned_age, VocaLabels.embedding)
+                .filter(VocaLabels.embedding.isnot(None)).all())
+        words = [row[0] for row in rows]
+        ages = np.array([row[1] or 0 for row in rows], dtype=np.int16)
+        embeddings = np.stack([np.asarray(row[2], dtype=np.float32) for row in rows])
+        return cls.build(words, ages, embeddings, per_word)
+
+    def save(self, path: str = DEFAULT_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp.npz'
+        np.savez(tmp_path, words=np.array(self.words), ages=self.ages, offsets=self.offsets,
+                 distractors=self.distractors)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> 'DistractorTable':
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['words'], data['ages'], data['offsets'], data['distractors'])
+
+
+_table = None
+_table_lock = threading.Lock()
+
+
+def get_distractor_table(path: str = DEFAULT_PATH) -> Optional[DistractorTable]:
+    """미리 계산한 표 (프로세스당 한 번 로드), 파일이 없으면 None → 기존 DB 검색 사용"""
+    global _table
+    if _table is None:
+        with _table_lock:
+            if _table is None:
+                if os.path.exists(path):
+                    _table = DistractorTable.load(path)
+                    print(f"✅ 오답 보기 표 로드 완료: {len(_table)}개 단어")
+                else:
+                    print(f"⚠️ 오답 보기 표가 없어 DB 검색을 사용합니다 (python -m Test.distractor_table 로 생성)")
+                    _table = False
+    return _table if _table is not False else None
+
+
+if __name__ == "__main__":
+    from data.postgresDB import SessionLocal
+
+    start = time.perf_counter()
+    with SessionLocal() as db:
+        table = DistractorTable.build_from_db(db)
+    out_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH
+    table.save(out_path)
+    print(f"✅ 오답 보기 표 생성 완료: {out_path} ({len(table)}개 단어, 후보 {len(table.distractors)}개, "
+          f"{time.perf_counter() - start:.0f}s)")
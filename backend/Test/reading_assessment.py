@@ -1,13 +1,21 @@
-from kiwipiepy import Kiwi
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 import random, torch, re, os, json
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-from peft import PeftModel, PeftConfig
+from Test.reading_model import load_reading_model
+from Test.similar_words import find_distant_words
+from Test.distractor_table import get_distractor_table
+from Ai.ai_common.kiwi_provider import get_kiwi_provider
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # 현재 파일 위치
 filepath = os.path.join(BASE_DIR, "data/labeled_fairytale.json")
 
+# T5 질문 생성: 한 번에 generate할 문단 수
+QNA_BATCH_SIZE = 8
+# 문제 은행(백그라운드)에서 문단마다 뽑을 후보 수 (정답 없는 출력이면 다음 후보 사용)
+# 바로 생성(/start)은 후보 1개 + 정답을 파싱하지 못한 문단만 QNA_RETRIES번 다시 생성
+QNA_RETURN_SEQUENCES = 3
+QNA_RETRIES = 1
+
 class ReadingAssessment:
     # 클래스 변수로 모델 로드 (모든 인스턴스가 공유)
     _model = None
@@ -21,19 +29,21 @@ class ReadingAssessment:
         if cls._model_loaded:
             return
 
-        MODEL_DIR = "eunchea/t5_fairytale_read"
         cls._device = "cuda" if torch.cuda.is_available() else "cpu"
 
-        try:
-            config = PeftConfig.from_pretrained(MODEL_DIR)
-            base = AutoModelForSeq2SeqLM.from_pretrained(config.base_model_name_or_path)
-            cls._model = PeftModel.from_pretrained(base, MODEL_DIR).to(cls._device)
-            cls._tokenizer = AutoTokenizer.from_pretrained(MODEL_DIR)
-            cls._model.eval()
-            cls._model_loaded = True
-            print("✅ T5 LoRA 모델 로드 완료")
-        except Exception as e:
-            print(f"⚠️ T5 모델 로드 실패: {e}")
+        # READING_MODEL_BACKEND: peft(기본) / merged (Test/reading_model.py)
+        # peft가 아닌 백엔드가 실패하면 (알 수 없는 백엔드, 병합 실패 등) 기본 LoRA 모델로 한 번 더 시도
+        backend = os.getenv("READING_MODEL_BACKEND", "peft")
+        backends = [backend] if backend == 'peft' else [backend, 'peft']
+        for backend in backends:
+            try:
+                cls._model, cls._tokenizer, cls._device = load_reading_model(backend)
+                cls._model_loaded = True
+                print("✅ T5 LoRA 모델 로드 완료")
+                break
+            except Exception as e:
+                print(f"⚠️ T5 모델 로드 실패 ({backend}): {e}")
+        else:
             print("🔄 기본 T5 모델을 사용합니다...")
 
             try:
@@ -60,7 +70,6 @@ class ReadingAssessment:
         if not self.__class__._model_loaded:
             self.__class__._load_model()
         self.db = db_session
-        self.kiwi = Kiwi()
 
     def clean_question(self, text: str) -> str:
         """질문 문장을 자연스럽게 다듬는 간단한 후처리"""
@@ -90,45 +99,17 @@ class ReadingAssessment:
         return q
 
     def _extract_nouns_from_paragraph(self, paragraph: str) -> list[str]:
-        """Kiwi를 사용해 문단에서 명사 추출"""
-        result = self.kiwi.analyze(paragraph)
-        nouns = []
-
-        for token in result[0][0]:
-            # 일반명사(NNG), 고유명사(NNP)만 추출
-            if token.tag in ['NNG', 'NNP'] and len(token.form) >= 2:
-                nouns.append(token.form)
-
-        return list(set(nouns))  # 중복 제거
+        """Kiwi를 사용해 문단에서 명사 추출 (일반명사/고유명사, 중복 제거, 프로세스 공용 Kiwi + 문단별 캐시)"""
+        return get_kiwi_provider().nouns(paragraph)
 
     def _find_similar_words_from_db(self, correct_answer: str, limit: int = 10) -> list[str]:
-        """DB에서 임베딩 유사도 기반으로 유사 단어 찾기"""
+        """DB에서 임베딩 유사도 기반으로 유사 단어 찾기 (정답과 거리 0.5 이상, 먼 순서)"""
         if not self.db:
             return []
 
         try:
-            # voca_labels 테이블 내에서 임베딩 유사도 계산
-            query = text("""
-                        SELECT v2.word, 1 - (v1.embedding <=> v2.embedding) AS similarity
-                        FROM voca_labels v1
-                        JOIN voca_labels v2 ON v1.word != v2.word
-                        WHERE v1.word = :correct_answer
-                        -- 🎯 유사도가 0.5 이하인 단어만 선택 (거리 >= 0.5)
-                        AND (v1.embedding <=> v2.embedding) >= 0.5 
-                        ORDER BY 
-                            -- 🎯 거리가 가장 먼(유사도가 가장 낮은) 단어부터 정렬
-                            v1.embedding <=> v2.embedding DESC
-                        LIMIT :limit
-                    """)
-
-            result = self.db.execute(
-                query,
-                {"correct_answer": correct_answer, "limit": limit}
-            )
-
-            similar_words = [row[0] for row in result.fetchall()]
-            return similar_words
-
+            # 정답 임베딩을 한 번 조회하고 HNSW 인덱스로 검색 (실패하면 메모리 행렬 검색)
+            return find_distant_words(self.db, correct_answer, limit=limit)
         except Exception as e:
             print(f"⚠️ DB 유사도 검색 실패: {e}")
             return []
@@ -183,9 +164,14 @@ class ReadingAssessment:
     ) -> list[str]:
         """오답 선택지 생성 (임베딩 유사도 기반)"""
         distractors = []
+        # 미리 계산한 오답 표가 있으면 DB 대신 사용 (python -m Test.distractor_table)
+        table = get_distractor_table()
 
         # 1순위: DB 임베딩 유사도
-        if self.db:
+        if table:
+            similar_words = table.lookup(correct_answer, limit=10)
+            distractors.extend(self._generate_distractors_from_list(correct_answer, similar_words, 5))
+        elif self.db:
             similar_words = self._find_similar_words_from_db(correct_answer, limit=10)
             distractors.extend(self._generate_distractors_from_list(correct_answer, similar_words, 5))
 
@@ -200,8 +186,11 @@ class ReadingAssessment:
             remaining = self._generate_distractors_from_list(correct_answer, paragraph_nouns, 3)
             distractors.extend(remaining)
 
-        # 4순위: DB에서 같은 난이도 랜덤
-        if len(distractors) < 3 and self.db:
+        # 4순위: DB에서 같은 난이도 랜덤 (표가 있으면 나이별 후보 풀에서)
+        if len(distractors) < 3 and table:
+            random_words = table.random_words(age_level, correct_answer)
+            distractors.extend(self._generate_distractors_from_list(correct_answer, random_words, 5))
+        elif len(distractors) < 3 and self.db:
             try:
                 query = text("""
                             SELECT word FROM voca_labels
@@ -332,26 +321,13 @@ class ReadingAssessment:
             'user_answer': question_data.get('choices', [])[user_choice_index] if user_choice_index < len(question_data.get('choices', [])) else ''
         }
 
-    def generate_qna_from_paragraph(self, age: int, paragraph: str, db_words: list[str] = None) -> dict:
-        """
-        T5 모델로 QnA 생성 + 오답 생성
-
-        Args:
-            age: 난이도 (연령)
-            paragraph: 문단
-            db_words: DB에서 가져온 단어 리스트 (오답 후보용)
-
-        Returns:
-            dict: {question, answer, distractors, choices}
-        """
-        if not self.__class__._model or not self.__class__._tokenizer:
-            return {"error": "모델이 로드되지 않았습니다.", "question": "", "answer": "", "distractors": [], "choices": []}
-
-        # T5 모델 실행
-        prompt = f"문단을 읽고 {age}세 수준의 질문과 정답을 만들어 주세요.\n\n문단: {paragraph}"
-        inputs = self.__class__._tokenizer(
-            prompt,
+    def _generate_t5_outputs(self, prompts: list[str], num_return_sequences: int) -> list[list[str]]:
+        """프롬프트 여러 개를 패딩해서 generate 한 번으로 실행 → 프롬프트마다 출력 num_return_sequences개"""
+        tokenizer = self.__class__._tokenizer
+        inputs = tokenizer(
+            prompts,
             return_tensors="pt",
+            padding=True,
             truncation=True,
             max_length=512
         ).to(self.__class__._device)
@@ -363,12 +339,15 @@ class ReadingAssessment:
                 temperature=0.9,
                 top_p=0.9,
                 do_sample=True,
-                num_return_sequences=1
+                num_return_sequences=num_return_sequences
             )
 
-        result = self.__class__._tokenizer.decode(outputs[0], skip_special_tokens=True)
+        # 출력은 입력 순서대로 num_return_sequences개씩 이어져 있음
+        decoded = tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        return [decoded[i:i + num_return_sequences] for i in range(0, len(decoded), num_return_sequences)]
 
-        # 파싱
+    def _split_qna(self, result: str) -> tuple[str, str]:
+        """T5 출력 → (질문, 정답), 정답 패턴이 없으면 정답은 빈 문자열"""
         answer_patterns = [r"정답\s*[:：]\s*", r"답\s*[:：]\s*", r"Answer\s*[:：]\s*"]
         question, answer = result, ""
 
@@ -382,29 +361,95 @@ class ReadingAssessment:
         # 질문 정리
         question = re.sub(r"^(질문\s*[:：]\s*)", "", question).strip()
         question = self.clean_question(question)
+        return question, answer
+
+    def generate_qna_batch(
+            self,
+            items: list[tuple[str, int]],
+            db_words: list[str] = None,
+            num_return_sequences: int = 1,
+            retries: int = QNA_RETRIES
+    ) -> list[dict]:
+        """
+        여러 문단의 QnA를 한 번에 생성 + 오답 생성
+
+        Args:
+            items: [(paragraph, age), ...]
+            db_words: DB에서 가져온 단어 리스트 (오답 후보용)
+            num_return_sequences: 문단마다 뽑을 후보 수 (정답이 파싱되는 첫 후보를 사용)
+            retries: 정답이 파싱되는 후보가 없는 문단만 모아서 다시 생성할 횟수
 
-        # 정답이 없으면 오답도 생성 불가
-        if not answer:
-            return {
+        Returns:
+            [{question, answer, distractors, choices}, ...] (items 순서)
+        """
+        if not self.__class__._model or not self.__class__._tokenizer:
+            return [{"error": "모델이 로드되지 않았습니다.", "question": "", "answer": "", "distractors": [], "choices": []}
+                    for _ in items]
+
+        # T5 모델 실행 (QNA_BATCH_SIZE개씩), 정답을 파싱하지 못한 문단만 다시 생성
+        prompts = [f"문단을 읽고 {age}세 수준의 질문과 정답을 만들어 주세요.\n\n문단: {paragraph}" for paragraph, age in items]
+        qna = [None] * len(items)
+        pending = list(range(len(items)))
+        for _ in range(retries + 1):
+            candidates = []
+            for i in range(0, len(pending), QNA_BATCH_SIZE):
+                batch = [prompts[j] for j in pending[i:i + QNA_BATCH_SIZE]]
+                candidates.extend(self._generate_t5_outputs(batch, num_return_sequences))
+
+            failed = []
+            for j, outputs in zip(pending, candidates):
+                parsed = [self._split_qna(output) for output in outputs]
+                found = next(((q, a) for q, a in parsed if a), None)
+                if found is None:
+                    # 다시 생성해도 정답이 없으면 처음 출력의 질문을 사용
+                    found = qna[j] or parsed[0]
+                    failed.append(j)
+                qna[j] = found
+            pending = failed
+            if not pending:
+                break
+
+        results = []
+        for (paragraph, age), (question, answer) in zip(items, qna):
+
+            # 정답이 없으면 오답도 생성 불가
+            if not answer:
+                results.append({
+                    "question": question,
+                    "answer": answer,
+                    "distractors": [],
+                    "choices": []
+                })
+                continue
+
+            # 오답 생성
+            distractors = self._generate_distractors(answer, paragraph, db_words, age)
+
+            # 선택지 생성
+            all_choices = list(set(distractors + [answer]))
+            random.shuffle(all_choices)
+
+            results.append({
                 "question": question,
                 "answer": answer,
-                "distractors": [],
-                "choices": []
-            }
+                "distractors": distractors,
+                "choices": all_choices
+            })
+        return results
 
-        # 오답 생성
-        distractors = self._generate_distractors(answer, paragraph, db_words, age)
+    def generate_qna_from_paragraph(self, age: int, paragraph: str, db_words: list[str] = None) -> dict:
+        """
+        T5 모델로 QnA 생성 + 오답 생성 (문단 하나, generate_qna_batch 사용)
 
-        # 선택지 생성
-        all_choices = list(set(distractors + [answer]))
-        random.shuffle(all_choices)
+        Args:
+            age: 난이도 (연령)
+            paragraph: 문단
+            db_words: DB에서 가져온 단어 리스트 (오답 후보용)
 
-        return {
-            "question": question,
-            "answer": answer,
-            "distractors": distractors,
-            "choices": all_choices
-        }
+        Returns:
+            dict: {question, answer, distractors, choices}
+        """
+        return self.generate_qna_batch([(paragraph, age)], db_words)[0]
 
 
     # def load_json_files(self) -> list[dict]:
@@ -491,15 +536,16 @@ class ReadingAssessment:
         return paragraph, avg_difficulty
 
 
-    def generate_random_paragraphs(self, num_paragraphs: int = 10) -> list[tuple[str, int]]:
+    def sample_paragraphs(self, num_paragraphs: int = 10) -> list[tuple[str, str, int]]:
         """
-        JSON 파일에서 랜덤으로 문단 생성
+        JSON 파일에서 랜덤으로 문단 생성 (문단 ID 포함)
 
         Args:
             num_paragraphs: 생성할 문단 개수
 
         Returns:
-            [(paragraph, difficulty), ...]
+            [(paragraph_id, paragraph, difficulty), ...]
+            paragraph_id: "동화 번호:가운데 문장 번호" (같은 문단이면 항상 같은 ID)
         """
         all_data = self.load_json_file()
 
@@ -507,18 +553,18 @@ class ReadingAssessment:
             raise ValueError("JSON 데이터를 찾을 수 없습니다.")
 
         # labeled_text가 있는 객체만 필터링
-        valid_objects = [obj for obj in all_data if "labeled_text" in obj and obj["labeled_text"]]
+        valid_objects = [i for i, obj in enumerate(all_data) if "labeled_text" in obj and obj["labeled_text"]]
 
         if len(valid_objects) < num_paragraphs:
             print(f"⚠️ 요청한 개수({num_paragraphs})보다 적은 데이터({len(valid_objects)})만 있습니다.")
             num_paragraphs = len(valid_objects)
 
-        # 랜덤으로 객체 선택
+        # 랜덤으로 객체 선택 (번호)
         selected_objects = random.sample(valid_objects, num_paragraphs)
 
         paragraphs = []
-        for obj in selected_objects:
-            labeled_text = obj["labeled_text"]
+        for obj_index in selected_objects:
+            labeled_text = all_data[obj_index]["labeled_text"]
 
             # labeled_text 내에서 랜덤하게 하나 선택
             if len(labeled_text) >= 3:
@@ -532,10 +578,22 @@ class ReadingAssessment:
                 random_index = 0
 
             paragraph, difficulty = self.create_paragraph_from_sentences(labeled_text, random_index)
-            paragraphs.append((paragraph, difficulty))
+            paragraphs.append((f"{obj_index}:{random_index}", paragraph, difficulty))
 
         return paragraphs
 
+    def generate_random_paragraphs(self, num_paragraphs: int = 10) -> list[tuple[str, int]]:
+        """
+        JSON 파일에서 랜덤으로 문단 생성
+
+        Args:
+            num_paragraphs: 생성할 문단 개수
+
+        Returns:
+            [(paragraph, difficulty), ...]
+        """
+        return [(paragraph, difficulty) for _, paragraph, difficulty in self.sample_paragraphs(num_paragraphs)]
+
 
 if __name__ == '__main__':
     assessment = ReadingAssessment()
@@ -0,0 +1,119 @@
+"""
+문해력 평가 T5 LoRA 모델 로드 (백엔드 선택) + 내보내기
+
+백엔드 (READING_MODEL_BACKEND, 기본 peft):
+- peft:   기본 모델 위에 PeftModel을 씌운 그대로 (fp32, 기존 방식)
+- merged: LoRA를 기본 가중치에 병합한 fp32 모델 (generate마다 어댑터 연산이 없음)
+
+실험용 (benchmarks/bench_reading_model.py로 속도/메모리/정답 일치율을 측정하기 전까지 서버에서 선택 불가):
+- int8:   병합 모델의 Linear를 동적 int8 양자화 (CPU 전용, 로드할 때 양자화 - 몇 초)
+- onnx:   병합 모델을 ONNX로 내보낸 것 (optimum[onnxruntime] 필요, CPU)
+
+merged/int8은 내보낸 병합 모델(EXPORT_DIR/merged)이 있으면 그것을, 없으면 허브 어댑터를 받아 메모리에서 병합한다.
+
+내보내기: python -m Test.reading_model merged   (backend 디렉토리에서)
+          python -m Test.reading_model onnx     (merged를 먼저, optimum[onnxruntime] 필요)
+"""
+import os, sys, time
+from typing import Tuple
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+from peft import PeftModel, PeftConfig
+
+MODEL_DIR = "eunchea/t5_fairytale_read"
+BACKENDS = ('peft', 'merged')
+EXPERIMENTAL_BACKENDS = ('int8', 'onnx')
+EXPORT_DIR = os.getenv("READING_MODEL_EXPORT_DIR",
+                       os.path.join(os.path.dirname(os.path.abspath(__file__)), "data/reading_model"))
+MERGED_DIR = os.path.join(EXPORT_DIR, "merged")
+ONNX_DIR = os.path.join(EXPORT_DIR, "onnx")
+
+
+def _load_peft(device: str):
+    config = PeftConfig.from_pretrained(MODEL_DIR)
+    base = AutoModelForSeq2SeqLM.from_pretrained(config.base_model_name_or_path)
+    return PeftModel.from_pretrained(base, MODEL_DIR).to(device)
+
+
+def merge_lora(device: str = "cpu"):
+    """LoRA 어댑터를 기본 가중치에 병합한 일반 T5 모델"""
+    return _load_peft(device).merge_and_unload()
+
+
+def _load_merged(device: str):
+    if os.path.isdir(MERGED_DIR):
+        return AutoModelForSeq2SeqLM.from_pretrained(MERGED_DIR).to(device)
+    print(f"⚠️ 병합 모델이 없어 메모리에서 병합합니다 ({MERGED_DIR}, python -m Test.reading_model merged 로 생성)")
+    return merge_lora(device)
+
+
+def quantize_int8(model):
+    """Linear 가중치를 int8로 (활성값은 실행 중 동적 양자화, CPU 전용)"""
+    return torch.quantization.quantize_dynamic(model.to("cpu"), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def load_reading_model(backend: str = None, device: str = None,
+                       experimental: bool = False) -> Tuple[object, object, str]:
+    """
+    백엔드별 (모델, 토크나이저, 장치) - 모두 generate(**inputs, ...)로 같게 사용
+
+    int8/onnx는 CPU에서만 실행, experimental=True일 때만 (벤치마크용)
+    """
+    backend = backend or os.getenv("READING_MODEL_BACKEND", "peft")
+    allowed = BACKENDS + EXPERIMENTAL_BACKENDS if experimental else BACKENDS
+    if backend not in allowed:
+        raise ValueError(f"알 수 없는 문해력 모델 백엔드: {backend} ({', '.join(allowed)})")
+    device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+
+    start = time.perf_counter()
+    if backend == 'peft':
+        model = _load_peft(device)
+    elif backend == 'merged':
+        model = _load_merged(device)
+    elif backend == 'int8':
+        device = "cpu"
+        model = quantize_int8(_load_merged(device))
+    else:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        device = "cpu"
+        if not os.path.isdir(ONNX_DIR):
+            raise FileNotFoundError(f"ONNX 모델이 없습니다: {ONNX_DIR} (python -m Test.reading_model onnx 로 생성)")
+        model = ORTModelForSeq2SeqLM.from_pretrained(ONNX_DIR)
+
+    if hasattr(model, "eval"):
+        model.eval()
+    tokenizer_dir = MERGED_DIR if backend != 'peft' and os.path.isdir(MERGED_DIR) else MODEL_DIR
+    tokenizer = AutoTokenizer.from_pretrained(tokenizer_dir)
+    print(f"✅ 문해력 모델 로드 완료: {backend} ({device}, {time.perf_counter() - start:.1f}s)")
+    return model, tokenizer, device
+
+
+def export_merged(out_dir: str = MERGED_DIR) -> str:
+    model = merge_lora()
+    model.save_pretrained(out_dir, safe_serialization=True)
+    AutoTokenizer.from_pretrained(MODEL_DIR).save_pretrained(out_dir)
+    print(f"✅ 병합 모델 저장 완료: {out_dir}")
+    return out_dir
+
+
+def export_onnx(out_dir: str = ONNX_DIR) -> str:
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+    merged_dir = MERGED_DIR if os.path.isdir(MERGED_DIR) else export_merged()
+    model = ORTModelForSeq2SeqLM.from_pretrained(merged_dir, export=True)
+    model.save_pretrained(out_dir)
+    AutoTokenizer.from_pretrained(merged_dir).save_pretrained(out_dir)
+    print(f"✅ ONNX 모델 저장 완료: {out_dir}")
+    return out_dir
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "merged"
+    if target == "merged":
+        export_merged()
+    elif target == "onnx":
+        export_onnx()
+    else:
+        raise SystemExit("사용법: python -m Test.reading_model [merged|onnx]")
@@ -0,0 +1,142 @@
+# Test/reading_question_bank.py (문해력 평가 문제 은행 - T5 문제를 미리 만들어 두는 큐)
+import os, asyncio, threading
+from collections import OrderedDict
+from typing import Callable, List
+
+from sqlalchemy.orm import Session
+
+from app.games.low_water_bank import LowWaterBank
+from database import get_db_words
+from Test.reading_assessment import QNA_BATCH_SIZE, QNA_RETURN_SEQUENCES, ReadingAssessment
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'reading_question_bank.json')
+
+
+def is_valid_question(question: dict) -> bool:
+    """바로 내보낼 수 있는 문제인지 (질문/정답이 있고, 서로 다른 보기 4개 중 correct_index가 정답)"""
+    choices = question.get('choices') or []
+    answer = question.get('correct_answer')
+    correct_index = question.get('correct_index', -1)
+    return (bool(question.get('question')) and bool(answer) and len(choices) == 4
+            and len(set(choices)) == 4 and 0 <= correct_index < 4 and choices[correct_index] == answer)
+
+
+class ReadingQuestionBank(LowWaterBank):
+    """
+    (문단 ID, 나이)별로 create_question_from_qna 결과를 미리 쌓아두는 은행
+
+    - 백그라운드 작업이 문단을 뽑아 T5 배치 생성 → 파싱/clean_question → 오답 생성 → 검증까지 끝낸 문제만 담음
+      (T5는 스레드에서 실행해 이벤트 루프를 막지 않음)
+    - capacity개까지만 담고 꺼낸 문제는 다시 쓰지 않음, low_water 아래로 떨어지면 다시 채움
+    - 채울 때마다/종료 시 스냅샷 파일로 저장 → 재시작해도 바로 문제를 꺼낼 수 있음
+    - 워커가 여러 개면 잠금을 얻은 워커 하나만 T5로 채우고 내보냄 (LowWaterBank)
+    - pop()은 동기 라우트(스레드풀)에서 호출되므로 큐는 lock으로 보호
+    """
+
+    label = '문해력 문제 은행'
+
+    def __init__(self, session_factory: Callable[[], Session], capacity: int = 200, low_water: int = 50,
+                 batch_size: int = QNA_BATCH_SIZE * 2, snapshot_path: str = DEFAULT_SNAPSHOT_PATH):
+        super().__init__(snapshot_path)
+        self.session_factory = session_factory
+        self.capacity = capacity
+        self.low_water = low_water
+        self.batch_size = batch_size
+
+        # "문단 ID@나이" → 문제
+        self.questions: 'OrderedDict[str, dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(paragraph_id: str, age: int) -> str:
+        return f"{paragraph_id}@{age}"
+
+    def size(self) -> int:
+        return len(self.questions)
+
+    def pop(self, count: int) -> List[dict]:
+        """먼저 만든 문제부터 count개 꺼내기 (부족하면 있는 만큼)"""
+        with self._lock:
+            problems = [self.questions.popitem(last=False)[1] for _ in range(min(count, len(self.questions)))]
+            remaining = len(self.questions)
+
+        if remaining < self.low_water:
+            self._notify_low()
+        return problems
+
+    def _generate(self, count: int) -> List[dict]:
+        """문단 count개를 뽑아 검증을 통과한 문제만 반환 (스레드에서 실행)"""
+        # 모델 로드는 서버 시작 시 한 번만 (실패했으면 여기서 다시 시도하지 않음)
+        if not ReadingAssessment._model_loaded:
+            raise RuntimeError("T5 모델이 로드되지 않았습니다.")
+
+        with self.session_factory() as db:
+            assessment = ReadingAssessment(db_session=db)
+            db_words = get_db_words(db)
+
+            sampled = assessment.sample_paragraphs(count)
+            with self._lock:
+                sources = [(paragraph_id, paragraph, age) for paragraph_id, paragraph, age in sampled
+                           if paragraph and self._key(paragraph_id, age) not in self.questions]
+            # 요청 경로 밖이므로 문단마다 후보를 여러 개 뽑아 한 번에 (다시 생성하지 않음)
+            qna_results = assessment.generate_qna_batch([(paragraph, age) for _, paragraph, age in sources],
+                                                        db_words=db_words,
+                                                        num_return_sequences=QNA_RETURN_SEQUENCES, retries=0)
+
+            questions = []
+            for (paragraph_id, paragraph, age), qna_result in zip(sources, qna_results):
+                try:
+                    question = assessment.create_question_from_qna(paragraph, qna_result, age_level=age)
+                except ValueError:
+                    # 정답을 파싱하지 못한 문단
+                    continue
+                if is_valid_question(question):
+                    question['paragraph_id'] = paragraph_id
+                    questions.append(question)
+            return questions
+
+    async def refill(self) -> int:
+        """한 번 배치 생성해서 capacity까지 채우고 추가된 개수 반환"""
+        if self.size() >= self.capacity:
+            return 0
+
+        candidates = await asyncio.to_thread(self._generate, self.batch_size)
+        added = 0
+        with self._lock:
+            for question in candidates:
+                if len(self.questions) >= self.capacity:
+                    break
+                key = self._key(question['paragraph_id'], question['age_level'])
+                if key not in self.questions:
+                    self.questions[key] = question
+                    added += 1
+        return added
+
+    async def _fill(self):
+        # 한 번에 batch_size개씩, 새로 추가되지 않으면 다음 주기에 다시 시도
+        refilled = False
+        while self.size() < self.capacity:
+            try:
+                added = await self.refill()
+            except Exception as e:
+                print(f"⚠️ 문해력 문제 은행 채우기 실패: {e}")
+                break
+            print(f"🔄 문해력 문제 은행: +{added}개 (현재 {self.size()}개)")
+            if not added:
+                break
+            refilled = True
+            await asyncio.to_thread(self.save_snapshot)
+
+        if refilled:
+            print(f"✅ 문해력 문제 은행 채우기 완료: {self.size()}개")
+
+    def _snapshot_data(self) -> dict:
+        with self._lock:
+            return dict(self.questions)
+
+    def _restore_snapshot(self, data: dict):
+        with self._lock:
+            for key, question in list(data.items())[:self.capacity]:
+                if is_valid_question(question) and key not in self.questions:
+                    self.questions[key] = question
+        print(f"✅ 문해력 문제 은행 스냅샷 로드: {len(self.questions)}개")
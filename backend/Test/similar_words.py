@@ -0,0 +1,151 @@
+"""
+오답 보기용 유사 단어 검색 (voca_labels.embedding, pgvector)
+
+기존 쿼리는 voca_labels를 자기 자신과 JOIN해서 문제마다 테이블 전체와의 거리를 계산하고
+거리 내림차순으로 정렬했다 (인덱스를 쓸 수 없음).
+
+- DB 검색: 정답 단어 임베딩을 한 번 조회한 뒤, 반대 벡터(-a)와 가까운 순으로 HNSW 인덱스 검색
+  (코사인 거리 d(v, -a) = 2 - d(v, a) 이므로 "a와 가장 먼 단어" = "-a와 가장 가까운 단어")
+  인덱스: CREATE INDEX voca_labels_embedding_hnsw ON voca_labels USING hnsw (embedding vector_cosine_ops);
+  가장 먼 후보들이 MAX_DISTANCE 밖이면 후보 수(와 ef_search)를 넓혀 다시 검색, 그래도 limit개가 안 되면 메모리 검색
+- 메모리 검색: 모든 임베딩을 정규화한 NumPy 행렬로 한 번 로드해 두고 행렬 곱 한 번으로 거리 구간 선택
+  (DB 검색이 실패할 때, 또는 VOCAB_EMBEDDINGS_IN_MEMORY=1 이면 항상 사용)
+"""
+import os, threading
+from typing import List, Optional, Tuple
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import bindparam, text
+from sqlalchemy.orm import Session
+
+from models import VocaLabels
+
+EMBEDDING_DIM = 768
+# 정답과 이 거리 이상 떨어진 단어만 (유사도 0.5 이하 → 동의어/비슷한 말이 보기로 나오지 않음)
+MIN_DISTANCE = 0.5
+# 이 거리보다 먼 단어는 제외 (유사도 -0.2 미만 → 임베딩이 반대 방향인 이상치/노이즈 단어가 먼저 뽑히지 않음)
+MAX_DISTANCE = 1.2
+# 인덱스에서 먼저 가져올 후보 수 (limit의 배수, 거리 조건/정답 제외 후 limit개를 채우기 위해)
+# 가장 먼 후보들이 MAX_DISTANCE 밖이라 limit개가 안 되면 CANDIDATE_FACTOR배씩 넓혀서 다시 검색
+CANDIDATE_FACTOR = 4
+# 후보 수 상한 (pgvector hnsw.ef_search 최댓값, 이만큼 넓혀도 모자라면 메모리 검색 사용)
+MAX_CANDIDATES = 1000
+
+_BAND_QUERY = text("""
+    SELECT word, 2 - anti_distance AS distance
+    FROM (
+        SELECT word, embedding <=> :anti AS anti_distance
+        FROM voca_labels
+        WHERE word != :word
+        ORDER BY embedding <=> :anti
+        LIMIT :candidates
+    ) AS nearest
+    WHERE 2 - anti_distance >= :min_distance AND 2 - anti_distance <= :max_distance
+    ORDER BY anti_distance
+    LIMIT :limit
+""").bindparams(bindparam("anti", type_=Vector(EMBEDDING_DIM)))
+# HNSW 검색이 후보를 ef_search개까지만 찾으므로 이번 트랜잭션에서 후보 수만큼 늘림
+_EF_SEARCH_QUERY = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+
+class EmbeddingMatrix:
+    """voca_labels 임베딩 전체 (정규화 float32 행렬, 내적 = 코사인 유사도)"""
+
+    def __init__(self, words: List[str], embeddings: np.ndarray):
+        self.words = words
+        self.matrix = normalize(embeddings)
+        self.row_of = {word: i for i, word in enumerate(words)}
+
+    @classmethod
+    def from_db(cls, db: Session) -> 'EmbeddingMatrix':
+        rows = db.query(VocaLabels.word, VocaLabels.embedding).filter(VocaLabels.embedding.isnot(None)).all()
+        words = [row[0] for row in rows]
+        embeddings = np.stack([np.asarray(row[1], dtype=np.float32) for row in rows]) if rows \
+            else np.zeros((0, EMBEDDING_DIM), dtype=np.float32)
+        print(f"✅ 단어 임베딩 행렬 로드 완료: {embeddings.shape}")
+        return cls(words, embeddings)
+
+    def band(self, anchor: np.ndarray, exclude: str, limit: int, min_distance: float = MIN_DISTANCE,
+             max_distance: float = MAX_DISTANCE) -> List[str]:
+        """anchor와 거리가 [min_distance, max_distance]인 단어를 먼 순서로 limit개 (행렬 곱 한 번)"""
+        if not len(self.words):
+            return []
+        distances = 1.0 - self.matrix @ normalize(anchor)
+        candidates = np.flatnonzero((distances >= min_distance) & (distances <= max_distance))
+        if exclude in self.row_of:
+            candidates = candidates[candidates != self.row_of[exclude]]
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-distances[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-distances[candidates], kind='stable')]
+        return [self.words[i] for i in candidates]
+
+    def search(self, word: str, limit: int, **band) -> List[str]:
+        row = self.row_of.get(word)
+        if row is None:
+            return []
+        return self.band(self.matrix[row], word, limit, **band)
+
+
+_matrix: Optional[EmbeddingMatrix] = None
+_matrix_lock = threading.Lock()
+
+
+def get_embedding_matrix(db: Session) -> EmbeddingMatrix:
+    """메모리 검색용 행렬 (프로세스당 한 번 로드)"""
+    global _matrix
+    if _matrix is None:
+        with _matrix_lock:
+            if _matrix is None:
+                _matrix = EmbeddingMatrix.from_db(db)
+    return _matrix
+
+
+def _anchor_embedding(db: Session, word: str) -> Optional[np.ndarray]:
+    row = db.query(VocaLabels.embedding).filter(VocaLabels.word == word, VocaLabels.embedding.isnot(None)).first()
+    return np.asarray(row[0], dtype=np.float32) if row else None
+
+
+def search_db(db: Session, word: str, limit: int = 10, min_distance: float = MIN_DISTANCE,
+              max_distance: float = MAX_DISTANCE) -> List[Tuple[str, float]]:
+    """인덱스 검색 → [(단어, 정답과의 거리)] (먼 순서, 후보를 넓혀도 모자라면 limit개보다 적을 수 있음)"""
+    anchor = _anchor_embedding(db, word)
+    if anchor is None:
+        return []
+    params = {
+        "anti": (-normalize(anchor)).tolist(),
+        "word": word,
+        "min_distance": min_distance,
+        "max_distance": max_distance,
+        "limit": limit,
+    }
+    candidates = min(limit * CANDIDATE_FACTOR, MAX_CANDIDATES)
+    while True:
+        db.execute(_EF_SEARCH_QUERY, {"ef_search": str(max(candidates, 40))})
+        rows = db.execute(_BAND_QUERY, dict(params, candidates=candidates)).fetchall()
+        if len(rows) >= limit or candidates >= MAX_CANDIDATES:
+            return [(row[0], float(row[1])) for row in rows]
+        candidates = min(candidates * CANDIDATE_FACTOR, MAX_CANDIDATES)
+
+
+def find_distant_words(db: Session, word: str, limit: int = 10, min_distance: float = MIN_DISTANCE,
+                       max_distance: float = MAX_DISTANCE) -> List[str]:
+    """정답 단어와 뜻이 충분히 먼 단어 limit개 (오답 보기 후보)"""
+    if db is None:
+        return []
+    if os.getenv("VOCAB_EMBEDDINGS_IN_MEMORY") != "1":
+        try:
+            words = [w for w, _ in search_db(db, word, limit, min_distance, max_distance)]
+        except Exception as e:
+            db.rollback()
+            print(f"⚠️ DB 유사도 검색 실패, 메모리 검색 사용: {e}")
+        else:
+            if len(words) >= limit or _anchor_embedding(db, word) is None:
+                return words
+            print(f"⚠️ DB 유사도 검색 결과 부족 ({len(words)}/{limit}개, {word}), 메모리 검색 사용")
+    return get_embedding_matrix(db).search(word, limit, min_distance=min_distance, max_distance=max_distance)
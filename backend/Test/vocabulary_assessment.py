@@ -1,17 +1,68 @@
-import random, re, os, json
-from kiwipiepy import Kiwi
+import random, re, os, json, threading
 from sqlalchemy.orm import Session
 from sqlalchemy import text
+from Test.similar_words import find_distant_words
+from Test.distractor_table import get_distractor_table
+from Ai.ai_common.kiwi_provider import get_kiwi_provider
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 filepath = os.path.join(BASE_DIR, "data/labeled_fairytale.json")
 
+# 빈 칸으로 낼 수 있는 단어 (한글/영문이 하나라도 있는 단어, 숫자/기호만 있는 단어 제외)
+_BLANK_WORD = re.compile(r"[가-힣A-Za-z]")
+
+
+class SentenceIndex:
+    """
+    labeled_fairytale.json 문장 인덱스 (프로세스당 한 번만 로드)
+
+    - by_age[난이도]: (문장, 단어 튜플, 빈 칸 후보 위치 튜플) 목록
+    - all: 모든 문장 (해당 난이도 문장이 없을 때)
+    """
+
+    def __init__(self, data: list[dict]):
+        self.by_age: dict[int, list[tuple]] = {}
+        self.all: list[tuple] = []
+        for obj in data:
+            for s in obj.get("labeled_text", []):
+                sentence = s["sentence"].strip()
+                words = tuple(sentence.split())
+                if not words:
+                    continue
+                positions = tuple(i for i, w in enumerate(words) if _BLANK_WORD.search(w)) or tuple(range(len(words)))
+                entry = (sentence, words, positions)
+                self.by_age.setdefault(s.get("difficulty", 7), []).append(entry)
+                self.all.append(entry)
+
+    def draw(self, age_level: int) -> tuple:
+        """(문장, 단어 튜플, 빈 칸 위치) 하나 무작위 선택"""
+        sentence, words, positions = random.choice(self.by_age.get(age_level) or self.all)
+        return sentence, words, random.choice(positions)
+
+
+_sentence_index = None
+_sentence_index_lock = threading.Lock()
+
+
+def get_sentence_index() -> SentenceIndex:
+    """문장 인덱스 (프로세스당 한 번 로드, 로드에 실패해 비어 있으면 캐시하지 않고 다음 호출에 다시 시도)"""
+    global _sentence_index
+    if _sentence_index is None:
+        with _sentence_index_lock:
+            if _sentence_index is None:
+                index = SentenceIndex(VocabularyAssessment.load_json_file())
+                if not index.all:
+                    return index
+                _sentence_index = index
+                print(f"✅ 어휘력 평가 문장 인덱스 로드 완료: {len(_sentence_index.all)}개 문장")
+    return _sentence_index
+
 class VocabularyAssessment:
     def __init__(self, db_session: Session = None):
         self.db = db_session
-        self.kiwi = Kiwi()
 
-    def load_json_file(self) -> list[dict]:
+    @staticmethod
+    def load_json_file() -> list[dict]:
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
                 data = json.load(f)
@@ -21,43 +72,23 @@ class VocabularyAssessment:
             return []
 
     def _extract_nouns_from_paragraph(self, paragraph: str) -> list[str]:
-        result = self.kiwi.analyze(paragraph)
-        nouns = [token.form for token in result[0][0] if token.tag in ['NNG', 'NNP'] and len(token.form) >= 2]
-        return list(set(nouns))
+        # 프로세스 공용 Kiwi (문단별 결과 캐시)
+        return get_kiwi_provider().nouns(paragraph)
 
     def _find_similar_words_from_db(self, correct_answer: str, limit: int = 10) -> list[str]:
-        """DB에서 임베딩 유사도 기반으로 유사 단어 찾기"""
+        """DB에서 임베딩 유사도 기반으로 유사 단어 찾기 (정답과 거리 0.5 이상, 먼 순서)"""
         if not self.db:
             return []
 
         try:
-            # voca_labels 테이블 내에서 임베딩 유사도 계산
-            query = text("""
-                        SELECT v2.word, 1 - (v1.embedding <=> v2.embedding) AS similarity
-                        FROM voca_labels v1
-                        JOIN voca_labels v2 ON v1.word != v2.word
-                        WHERE v1.word = :correct_answer
-                        -- 🎯 유사도가 0.5 이하인 단어만 선택 (거리 >= 0.5)
-                        AND (v1.embedding <=> v2.embedding) >= 0.5 
-                        ORDER BY 
-                            -- 🎯 거리가 가장 먼(유사도가 가장 낮은) 단어부터 정렬
-                            v1.embedding <=> v2.embedding DESC
-                        LIMIT :limit
-                    """)
-
-            result = self.db.execute(
-                query,
-                {"correct_answer": correct_answer, "limit": limit}
-            )
-
-            similar_words = [row[0] for row in result.fetchall()]
-            return similar_words
-
+            # 정답 임베딩을 한 번 조회하고 HNSW 인덱스로 검색 (실패하면 메모리 행렬 검색)
+            return find_distant_words(self.db, correct_answer, limit=limit)
         except Exception as e:
             print(f"⚠️ DB 유사도 검색 실패: {e}")
             return []
 
-    def _is_valid_distractor(self, word: str, answer: str) -> bool:
+    @staticmethod
+    def _is_valid_distractor(word: str, answer: str) -> bool:
         word = word.strip()
         # 1️⃣ 길이 제한 완화
         if len(word) < 2:
@@ -79,9 +110,12 @@ class VocabularyAssessment:
 
     def _generate_distractors(self, correct_word: str, sentence: str, age_level: int = 7) -> list[str]:
         distractors = []
+        # 미리 계산한 오답 표가 있으면 DB 대신 사용 (python -m Test.distractor_table)
+        table = get_distractor_table()
 
-        # 1️⃣ DB 임베딩 유사도 기반
-        db_words = self._find_similar_words_from_db(correct_word, limit=10)
+        # 1️⃣ DB 임베딩 유사도 기반 (표에는 이미 _is_valid_distractor를 통과한 단어만 있음)
+        db_words = table.lookup(correct_word, limit=10) if table else \
+            self._find_similar_words_from_db(correct_word, limit=10)
         distractors.extend([w for w in db_words if self._is_valid_distractor(w, correct_word)])
 
         # 2️⃣ 문장 명사 기반
@@ -94,7 +128,13 @@ class VocabularyAssessment:
                         break
 
         # 3️⃣ 같은 난이도 DB 단어 랜덤
-        if len(distractors) < 3 and self.db:
+        if len(distractors) < 3 and table:
+            for w in table.random_words(age_level, correct_word):
+                if self._is_valid_distractor(w, correct_word) and w not in distractors:
+                    distractors.append(w)
+                    if len(distractors) >= 3:
+                        break
+        elif len(distractors) < 3 and self.db:
             try:
                 query = text("""
                     SELECT word FROM voca_labels
@@ -118,14 +158,13 @@ class VocabularyAssessment:
         return distractors[:3]
 
     def generate_fill_in_blank_question(self, age_level: int = 7) -> dict:
-        data = self.load_json_file()
-        candidate_sentences = [s["sentence"] for obj in data for s in obj.get("labeled_text", []) if s.get("difficulty", 7) == age_level]
-        if not candidate_sentences:
-            candidate_sentences = [s["sentence"] for obj in data for s in obj.get("labeled_text", [])]
-
-        sentence = random.choice(candidate_sentences).strip()
-        words = sentence.split()
-        blank_idx = random.randint(0, len(words)-1)
+        # 문장은 처음 한 번만 로드해서 난이도별로 나눠 둔 인덱스에서 선택
+        index = get_sentence_index()
+        if not index.all:
+            return {"error": "어휘력 평가 문장 데이터가 없습니다"}
+
+        sentence, words, blank_idx = index.draw(age_level)
+        words = list(words)
         correct_word = words[blank_idx]
         words[blank_idx] = "_____"
         blank_sentence = " ".join(words)
@@ -0,0 +1,185 @@
+# game/game_result_writer.py (게임 결과 DB 저장 - 모아서 한 번에 INSERT)
+import asyncio
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from models import UserGames
+
+
+class GameResultWriter:
+    """
+    끝난 게임의 UserGames 행을 메모리에 모았다가 여러 행 INSERT 한 번으로 저장 (write-behind)
+
+    - enqueue는 큐에 넣기만 하므로 게임 종료 응답이 Postgres를 기다리지 않음
+    - batch_size개가 모이거나 flush_interval초가 지나면 백그라운드 작업이 저장
+    - 여러 행 INSERT가 실패하면 한 건씩 다시 저장해서 문제 있는 행만 골라냄
+      (DB에 연결할 수 없으면 전부 큐 앞에 되돌려 다음 주기에 다시 시도, max_pending 초과분은 버림)
+    - 한 건씩 저장해도 실패한 행은 큐 뒤로 보내고 max_attempts번 실패하면 버림
+      (저장할 수 없는 행 하나가 큐 앞에서 뒤의 결과를 막지 않도록)
+    - 종료 시 stop()은 작업을 취소하지 않고 진행 중인 저장이 끝나기를 기다린 뒤 남은 행을 모두 저장
+      (flush 도중 취소되면 꺼내 둔 행을 큐 앞에 되돌림 - 저장 중이던 배치는 다시 저장될 수 있음)
+    """
+
+    def __init__(self, session_factory: Callable[[], Session], batch_size: int = 50,
+                 flush_interval: float = 2.0, max_pending: int = 10000, max_attempts: int = 3):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_attempts = max_attempts
+
+        self._pending: List[dict] = []
+        # 한 건씩 저장해도 실패한 행의 실패 횟수 (id(row) → 횟수)
+        self._attempts: Dict[int, int] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def enqueue(self, user_id: int, game_type: str, difficulty: str, score: int, word_history: dict = None):
+        """저장할 결과 한 건 추가 (played_at은 DB 기본값 now()로 저장 시각이 들어감)"""
+        if len(self._pending) >= self.max_pending:
+            print(f"⚠️ 게임 결과 저장 대기열이 가득 참 ({self.max_pending}개), 결과를 버립니다 (user_id={user_id})")
+            return
+
+        self._pending.append({
+            'user_id': user_id,
+            'game_type': game_type,
+            'difficulty': difficulty,
+            'score': score,
+            'word_history': word_history
+        })
+        if len(self._pending) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _write(self, rows: List[dict]):
+        """여러 행 INSERT 한 번 (스레드에서 실행)"""
+        with self.session_factory() as db:
+            try:
+                db.execute(insert(UserGames).values(rows))
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+
+    def _write_each(self, rows: List[dict]) -> List[Tuple[dict, Exception]]:
+        """한 건씩 INSERT하고 실패한 (행, 오류) 반환 (스레드에서 실행)"""
+        failed = []
+        with self.session_factory() as db:
+            for row in rows:
+                try:
+                    db.execute(insert(UserGames).values([row]))
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    failed.append((row, e))
+        return failed
+
+    def _ping(self) -> bool:
+        """DB에 연결되는지 (전부 실패했을 때 장애인지 행 문제인지 구분)"""
+        try:
+            with self.session_factory() as db:
+                db.execute(text("SELECT 1"))
+            return True
+        except Exception:
+            return False
+
+    def _requeue(self, rows: List[dict], front: bool):
+        room = max(0, self.max_pending - len(self._pending))
+        if len(rows) > room:
+            print(f"⚠️ 게임 결과 저장 대기열이 가득 참 ({self.max_pending}개), {len(rows) - room}개를 버립니다")
+            for row in rows[room:]:
+                self._attempts.pop(id(row), None)
+            rows = rows[:room]
+        if front:
+            self._pending[:0] = rows
+        else:
+            self._pending.extend(rows)
+
+    async def flush(self) -> int:
+        """대기 중인 결과를 모두 저장하고 저장한 개수 반환 (이번 호출 전에 들어온 행만 한 번씩 시도)"""
+        saved = 0
+        queue, self._pending = self._pending, []
+        retry: List[dict] = []
+        # 저장 중인 배치 (결과를 확인하기 전에 취소되면 되돌릴 행)
+        rows: List[dict] = []
+        try:
+            while queue:
+                rows = queue[:self.batch_size]
+                del queue[:len(rows)]
+                try:
+                    await asyncio.to_thread(self._write, rows)
+                except Exception as e:
+                    print(f"⚠️ 게임 결과 일괄 저장 실패 ({len(rows)}개), 한 건씩 다시 저장: {e}")
+                else:
+                    saved += len(rows)
+                    for row in rows:
+                        self._attempts.pop(id(row), None)
+                    rows = []
+                    continue
+
+                failed = await asyncio.to_thread(self._write_each, rows)
+                if len(failed) == len(rows) and not await asyncio.to_thread(self._ping):
+                    # DB 장애 → 실패 횟수를 세지 않고 남은 행과 함께 다음 주기에 다시 시도
+                    print(f"❌ 게임 결과 저장 실패 (DB 연결 불가), 다음 주기에 다시 시도: {failed[0][1]}")
+                    self._requeue(rows + queue + retry, front=True)
+                    return saved
+
+                failed_ids = {id(row) for row, _ in failed}
+                for row in rows:
+                    if id(row) not in failed_ids:
+                        self._attempts.pop(id(row), None)
+                saved += len(rows) - len(failed)
+                for row, error in failed:
+                    attempts = self._attempts.get(id(row), 0) + 1
+                    if attempts >= self.max_attempts:
+                        self._attempts.pop(id(row), None)
+                        print(f"❌ 게임 결과를 버립니다 ({attempts}번 실패, user_id={row.get('user_id')}): {error}")
+                    else:
+                        self._attempts[id(row)] = attempts
+                        retry.append(row)
+                rows = []
+        except asyncio.CancelledError:
+            # 꺼내 둔 행이 사라지지 않도록 큐 앞에 되돌리고 취소를 그대로 전달
+            self._requeue(rows + queue + retry, front=True)
+            raise
+
+        # 실패한 행은 새로 들어온 결과 뒤에서 다음 주기에 다시 시도
+        self._requeue(retry, front=False)
+        if saved:
+            print(f"✅ 게임 결과 일괄 저장 완료: {saved}개")
+        return saved
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        """백그라운드 저장 작업 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+        print("✅ 게임 결과 저장 작업 시작")
+
+    async def stop(self):
+        """진행 중인 저장을 끝까지 기다린 뒤 남은 행을 모두 저장 (작업을 취소하면 꺼내 둔 행이 사라지므로 취소하지 않음)"""
+        if self._task is not None:
+            self._stopping = True
+            self._wakeup.set()
+            try:
+                await self._task
+            except Exception as e:
+                print(f"❌ 게임 결과 저장 작업 오류: {e}")
+            self._task = None
+        await self.flush()
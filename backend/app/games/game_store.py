@@ -0,0 +1,239 @@
+# game/game_store.py (게임 상태 저장소 - TTL + LRU)
+import time, heapq
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+
+class SlotRecord:
+    """
+    __slots__ 상태 레코드 공통 기능
+
+    세션 저장소(Redis 등)에 넣을 때 필드 이름 없이 __slots__ 순서대로 리스트로 직렬화한다.
+    필드를 추가할 때는 항상 __slots__ 맨 뒤에 추가할 것 (이전에 저장된 레코드는 None으로 채워짐)
+    """
+    __slots__ = ()
+    tag = ''  # 직렬화 시 타입 구분용 짧은 이름
+    set_fields: Tuple[str, ...] = ()  # set으로 복원할 필드
+
+    def to_list(self) -> list:
+        return [list(value) if name in self.set_fields else value
+                for name, value in ((name, getattr(self, name)) for name in self.__slots__)]
+
+    @classmethod
+    def from_list(cls, values: list) -> 'SlotRecord':
+        record = cls.__new__(cls)
+        for i, name in enumerate(cls.__slots__):
+            value = values[i] if i < len(values) else None
+            setattr(record, name, set(value or ()) if name in cls.set_fields else value)
+        return record
+
+
+class WordChainState(SlotRecord):
+    """끝말잇기 게임 한 판의 상태"""
+    tag = 'wc'
+    set_fields = ('used_words',)
+    __slots__ = ('game_id', 'difficulty', 'score', 'history', 'game_over', 'user_id',
+                 'last_word', 'used_words', 'winner', 'mistake_rate', 'trap_rate')
+
+    def __init__(self, game_id: str, difficulty: str, first_word: Optional[str] = None,
+                 user_id: Optional[int] = None, mistake_rate: float = 0.8, trap_rate: float = 0.2):
+        self.game_id = game_id
+        self.difficulty = difficulty
+        self.score = 0
+        self.history: List[str] = [first_word] if first_word else []
+        self.game_over = False
+        self.user_id = user_id
+        self.last_word = first_word
+        self.used_words: Set[str] = {first_word} if first_word else set()
+        self.winner: Optional[str] = None
+        self.mistake_rate = mistake_rate
+        self.trap_rate = trap_rate
+
+
+class WordSpellState(SlotRecord):
+    """초성퀴즈 게임 한 판의 상태"""
+    tag = 'ws'
+    __slots__ = ('difficulty', 'problems', 'current', 'score', 'finished', 'user_id')
+
+    def __init__(self, difficulty: str, problems: List[dict], user_id: Optional[int] = None):
+        self.difficulty = difficulty
+        self.problems = problems
+        self.current = 0
+        self.score = 0
+        self.finished = False
+        self.user_id = user_id
+
+
+class PuzzleState(SlotRecord):
+    """문장 퍼즐 한 문제의 상태"""
+    tag = 'pz'
+    __slots__ = ('original_sentence', 'age', 'created_at', 'attempts', 'hints_used',
+                 'processed', 'solved', 'score', 'max_attempts', 'sentence_id')
+
+    def __init__(self, original_sentence: str, age: int, max_attempts: int = 2, sentence_id: int = None):
+        self.original_sentence = original_sentence
+        self.age = age
+        self.created_at = time.time()
+        self.attempts = 0
+        self.hints_used = 0
+        self.processed = False  # 처리 여부 (맞췄든 틀렸든)
+        self.solved = False  # 정답 여부
+        self.score = 0
+        self.max_attempts = max_attempts  # 최대 시도 횟수
+        self.sentence_id = sentence_id  # 말뭉치 문장 ID (단어/끝맺음은 말뭉치에서 바로 조회)
+
+
+class PuzzleSessionState(SlotRecord):
+    """
+    문장 퍼즐 10문제 세션 (세션에서 낸 퍼즐도 함께 저장)
+
+    퍼즐 상태를 세션 안에 두어서 답안 처리 한 번이 세션 키 하나만 갱신하도록 함
+    """
+    tag = 'ps'
+    __slots__ = ('session_id', 'user_id', 'initial_age', 'current_age', 'puzzles_solved',
+                 'total_puzzles', 'total_score', 'completed', 'started_at', 'puzzles', 'seen')
+    _PUZZLES = __slots__.index('puzzles')  # 직렬화할 때 퍼즐 목록 위치
+
+    def __init__(self, session_id: str, user_id: int, age: int):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.initial_age = age  # 첫 문제의 난이도로 고정
+        self.current_age = age
+        self.puzzles_solved = 0  # 맞춘 문제 수
+        self.total_puzzles = 0  # 시도한 총 문제 수
+        self.total_score = 0
+        self.completed = False
+        self.started_at = time.time()
+        self.puzzles: List[PuzzleState] = []
+        self.seen: Optional[str] = None  # 이전 세션까지 받은 문장 비트맵 (SeenSentences.dumps)
+
+    def to_list(self) -> list:
+        values = super().to_list()
+        values[self._PUZZLES] = [puzzle.to_list() for puzzle in self.puzzles]
+        return values
+
+    @classmethod
+    def from_list(cls, values: list) -> 'PuzzleSessionState':
+        record = super().from_list(values)
+        record.puzzles = [PuzzleState.from_list(puzzle) for puzzle in record.puzzles or ()]
+        return record
+
+
+RECORD_TYPES: Dict[str, type] = {cls.tag: cls for cls in (WordChainState, WordSpellState, PuzzleState, PuzzleSessionState)}
+
+
+class GameStore:
+    """
+    게임 상태 저장소 (dict 대신 사용)
+
+    - ttl_seconds: 이 시간이 지나면 만료 (닫힌 탭의 게임 정리), put에서 항목별로 지정 가능
+    - sliding: True면 get할 때도 만료 시간 연장 (False면 put한 시점 기준, Redis EXPIRE와 같음)
+    - max_games: 넘으면 가장 오래 접근하지 않은 게임부터 제거 (LRU)
+    - 만료는 접근할 때 확인하고, 만료 시각 힙으로 만료된 항목만 골라 정리 (k개 정리에 O(k log n))
+    """
+
+    def __init__(self, ttl_seconds: float = 1800, max_games: int = 10000, name: str = 'games',
+                 clock: Callable[[], float] = time.monotonic, sliding: bool = True):
+        self.ttl_seconds = ttl_seconds
+        self.max_games = max_games
+        self.name = name
+        self.sliding = sliding
+        self._clock = clock
+        self._data: 'OrderedDict[str, Tuple[float, float, Any]]' = OrderedDict()
+        # 만료 시각 힙 (키마다 하나, 힙에 넣은 뒤 만료 시각이 늦춰지면 꺼낼 때 다시 넣음)
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._scheduled: Dict[str, float] = {}
+        self.metrics: Dict[str, int] = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            self.metrics['misses'] += 1
+            return default
+
+        now = self._clock()
+        expires_at, ttl, value = item
+        if expires_at <= now:
+            del self._data[key]
+            self.metrics['expired'] += 1
+            self.metrics['misses'] += 1
+            return default
+
+        if self.sliding:
+            self._data[key] = (now + ttl, ttl, value)
+        self._data.move_to_end(key)
+        self.metrics['hits'] += 1
+        return value
+
+    def put(self, key: str, value: Any, ttl: float = None):
+        now = self._clock()
+        ttl = self.ttl_seconds if ttl is None else ttl
+        self._data[key] = (now + ttl, ttl, value)
+        self._data.move_to_end(key)
+        if key not in self._scheduled:
+            self._schedule(key, now + ttl)
+
+        self.purge_expired(now)
+        while len(self._data) > self.max_games:
+            self._data.popitem(last=False)
+            self.metrics['evicted'] += 1
+
+    def delete(self, key: str) -> bool:
+        return self._data.pop(key, None) is not None
+
+    def _schedule(self, key: str, expires_at: float):
+        self._scheduled[key] = expires_at
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+
+    def purge_expired(self, now: float = None) -> int:
+        """만료 시각이 지난 항목만 힙에서 꺼내 정리, 정리한 개수 반환"""
+        now = self._clock() if now is None else now
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] <= now:
+            scheduled_at, key = heapq.heappop(heap)
+            if self._scheduled.get(key) != scheduled_at:
+                continue
+
+            item = self._data.get(key)
+            if item is None:
+                # 이미 삭제/LRU 제거된 항목
+                del self._scheduled[key]
+            elif item[0] <= now:
+                del self._data[key]
+                del self._scheduled[key]
+                removed += 1
+            else:
+                # 그 사이 다시 저장/접근되어 만료 시각이 늦춰짐
+                self._schedule(key, item[0])
+
+        self.metrics['expired'] += removed
+        return removed
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.put(key, value)
+
+    def __delitem__(self, key: str):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        self.purge_expired()
+        return len(self._data)
+
+    def __iter__(self) -> Iterator[str]:
+        self.purge_expired()
+        return iter(list(self._data))
+
+    def stats(self) -> Dict[str, Any]:
+        return {'name': self.name, 'size': len(self), 'max_games': self.max_games,
+                'ttl_seconds': self.ttl_seconds, **self.metrics}
@@ -0,0 +1,87 @@
+# game/hangul.py (한글 음절 초성/중성/종성 분해 - 표 기반)
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172  # 가(0xAC00) ~ 힣(0xD7A3)
+JUNGSEONG_COUNT = 21
+JONGSEONG_COUNT = 28
+CHOSEONG_STRIDE = JUNGSEONG_COUNT * JONGSEONG_COUNT  # 588
+
+# hgtk와 같은 호환 자모(ㄱ U+3131 ...)로 반환
+CHOSEONG = ['ㄱ', 'ㄲ', 'ㄴ', 'ㄷ', 'ㄸ', 'ㄹ', 'ㅁ', 'ㅂ', 'ㅃ', 'ㅅ',
+            'ㅆ', 'ㅇ', 'ㅈ', 'ㅉ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+JUNGSEONG = ['ㅏ', 'ㅐ', 'ㅑ', 'ㅒ', 'ㅓ', 'ㅔ', 'ㅕ', 'ㅖ', 'ㅗ', 'ㅘ', 'ㅙ',
+             'ㅚ', 'ㅛ', 'ㅜ', 'ㅝ', 'ㅞ', 'ㅟ', 'ㅠ', 'ㅡ', 'ㅢ', 'ㅣ']
+JONGSEONG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ',
+             'ㄿ', 'ㅀ', 'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+
+# 음절 코드 → 초성 문자 (str.translate / NumPy 배치 변환에 같이 사용)
+_CHOSEONG_CODES = np.array([ord(CHOSEONG[i // CHOSEONG_STRIDE]) for i in range(HANGUL_COUNT)], dtype=np.uint32)
+_INITIALS_TABLE = {HANGUL_BASE + i: int(code) for i, code in enumerate(_CHOSEONG_CODES)}
+
+
+def _syllable_offset(ch: str) -> int:
+    """가(0)부터의 음절 번호, 한글 음절이 아니면 -1"""
+    if len(ch) != 1:
+        return -1
+    offset = ord(ch) - HANGUL_BASE
+    return offset if 0 <= offset < HANGUL_COUNT else -1
+
+
+def is_hangul_syllable(ch: str) -> bool:
+    return _syllable_offset(ch) >= 0
+
+
+def choseong_index(ch: str) -> int:
+    """초성 번호 (ㄱ=0 ... ㅎ=18), 한글 음절이 아니면 -1"""
+    offset = _syllable_offset(ch)
+    return offset // CHOSEONG_STRIDE if offset >= 0 else -1
+
+
+def jungseong_index(ch: str) -> int:
+    """중성 번호 (ㅏ=0 ... ㅣ=20), 한글 음절이 아니면 -1"""
+    offset = _syllable_offset(ch)
+    return (offset % CHOSEONG_STRIDE) // JONGSEONG_COUNT if offset >= 0 else -1
+
+
+def jongseong_index(ch: str) -> int:
+    """종성(받침) 번호 (없음=0, ㄱ=1 ... ㅎ=27), 한글 음절이 아니면 -1"""
+    offset = _syllable_offset(ch)
+    return offset % JONGSEONG_COUNT if offset >= 0 else -1
+
+
+def decompose(ch: str) -> Optional[Tuple[str, str, str]]:
+    """음절 → (초성, 중성, 종성) 호환 자모, 한글 음절이 아니면 None"""
+    offset = _syllable_offset(ch)
+    if offset < 0:
+        return None
+    return (CHOSEONG[offset // CHOSEONG_STRIDE],
+            JUNGSEONG[(offset % CHOSEONG_STRIDE) // JONGSEONG_COUNT],
+            JONGSEONG[offset % JONGSEONG_COUNT])
+
+
+def get_initials(word: str) -> str:
+    """단어를 초성으로 변환 (한글 음절이 아닌 문자는 그대로)"""
+    return word.translate(_INITIALS_TABLE)
+
+
+def get_initials_batch(words: Sequence[str]) -> List[str]:
+    """
+    단어 목록 전체를 한 번에 초성으로 변환 (사전/문제 은행 전체 전처리용)
+
+    단어들을 고정 길이 UCS-4 배열로 만든 뒤 코드값 배열에서 한 번에 초성 코드로 바꾼다.
+    """
+    if not words:
+        return []
+
+    codes = np.array(words, dtype=str)
+    width = codes.dtype.itemsize // 4
+    points = codes.view(np.uint32).reshape(len(words), width)
+
+    offsets = points.astype(np.int64) - HANGUL_BASE
+    is_syllable = (offsets >= 0) & (offsets < HANGUL_COUNT)
+    converted = np.where(is_syllable, _CHOSEONG_CODES[np.where(is_syllable, offsets, 0)], points)
+
+    return converted.astype(np.uint32).view(f'<U{width}').ravel().tolist()
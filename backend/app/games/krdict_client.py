@@ -0,0 +1,148 @@
+# game/krdict_client.py (한국어기초사전 krdict 검색 API 공용 비동기 클라이언트)
+import asyncio, time
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Any
+
+import httpx
+
+KRDICT_SEARCH_URL = 'https://krdict.korean.go.kr/api/search'
+
+# krdict word_grade → 검색 API level 파라미터와 같은 표기로 통일
+GRADE_TO_LEVEL = {
+    '초급': 'level1',
+    '중급': 'level2',
+    '고급': 'level3'
+}
+
+
+def parse_krdict_items(xml_text: str) -> List[Dict[str, Any]]:
+    """krdict 검색 API XML 응답 → [{word, pos, definition, level}]"""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError:
+        return []
+
+    items = []
+    for item in root.iter('item'):
+        word = (item.findtext('word') or '').strip()
+        if not word:
+            continue
+        items.append({
+            'word': word,
+            'pos': (item.findtext('pos') or '').strip(),
+            'definition': (item.findtext('sense/definition') or '').strip(),
+            'level': GRADE_TO_LEVEL.get((item.findtext('word_grade') or '').strip(), '')
+        })
+    return items
+
+
+class RetryBudget:
+    """
+    재시도 예산: 요청마다 ratio만큼 토큰이 쌓이고 재시도 1회에 토큰 1개를 쓴다.
+    krdict가 느려지거나 죽었을 때 재시도가 요청 수를 몇 배로 불리지 않도록 막는다.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_per_sec: float = 1.0, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.min_per_sec = min_per_sec
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self._last = time.monotonic()
+
+    def deposit(self):
+        now = time.monotonic()
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio + (now - self._last) * self.min_per_sec)
+        self._last = now
+
+    def try_withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+class KrdictClient:
+    """
+    WordChainGame / InitialQuizGame이 함께 쓰는 krdict 클라이언트
+    - httpx.AsyncClient 하나로 keep-alive 커넥션 재사용 (요청마다 TCP+TLS 핸드셰이크 없음)
+    - 세마포어로 krdict 동시 요청 수 제한
+    - 요청별 타임아웃 + 재시도 예산
+    - ElementTree로 XML 파싱
+    """
+
+    def __init__(self, api_key: str, max_concurrency: int = 8, max_connections: int = 16,
+                 timeout: float = 3.0, max_retries: int = 2, retry_budget: RetryBudget = None):
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_budget = retry_budget or RetryBudget()
+
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=30.0
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    async def _get(self, params: Dict[str, Any]) -> Optional[str]:
+        client = self._get_client()
+        params = {'key': self.api_key, **params}
+        self.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                async with self._semaphore:
+                    response = await client.get(KRDICT_SEARCH_URL, params=params)
+                if response.status_code < 500:
+                    return response.text
+                error = f"HTTP {response.status_code}"
+            except httpx.HTTPError as e:
+                error = repr(e)
+
+            attempt += 1
+            if attempt > self.max_retries or not self.retry_budget.try_withdraw():
+                print(f"❌ krdict 요청 실패 (q={params.get('q')}): {error}")
+                return None
+            await asyncio.sleep(0.1 * attempt)
+
+    async def search(self, q: str, pos: int = 1, level: str = None, num: int = 100, start: int = 1,
+                     sort: str = 'popular') -> List[Dict[str, Any]]:
+        """
+        단어 검색 (q 끝에 '*'를 붙이면 해당 글자로 시작하는 단어 검색)
+
+        Returns:
+            [{word, pos, definition, level}] - 실패 시 빈 리스트
+        """
+        params = {'part': 'word', 'pos': pos, 'sort': sort, 'num': num, 'start': start, 'q': q}
+        if level:
+            params['level'] = level
+
+        text = await self._get(params)
+        if text is None:
+            return []
+        return parse_krdict_items(text)
+
+    async def lookup(self, word: str) -> Optional[Dict[str, Any]]:
+        """정확히 일치하는 명사 항목 (없으면 None)"""
+        for item in await self.search(word):
+            if item['word'] == word and item['pos'] == '명사':
+                return item
+        return None
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
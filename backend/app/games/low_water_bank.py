@@ -0,0 +1,150 @@
+# game/low_water_bank.py (미리 채워두는 문제 은행 공통 - 백그라운드 채우기 / 스냅샷 / 워커 간 역할 분담)
+import os, json, asyncio, tempfile
+from typing import Any, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 잠금 없이 항상 이 프로세스가 채움
+    fcntl = None
+
+
+class LowWaterBank:
+    """
+    low_water 아래로 떨어지면 백그라운드 작업이 다시 채우는 문제 은행 공통 기능
+
+    하위 클래스가 구현:
+    - _fill(): 부족한 만큼 채우기 (필요하면 중간중간 save_snapshot)
+    - _snapshot_data() / _restore_snapshot(data): 은행 내용 ↔ 스냅샷 JSON
+    - pop()에서 low_water 아래로 떨어지면 _notify_low() (스레드풀에서 불러도 됨)
+
+    uvicorn 워커가 여러 개일 때:
+    - snapshot_path + '.lock' 파일 잠금을 얻은 워커 하나만 스냅샷을 읽고 채움
+      (워커마다 채우기 작업을 돌리지 않고, 같은 스냅샷의 문제를 여러 워커가 나눠 내보내지 않음)
+    - 잠금을 못 얻은 워커의 은행은 비어 있음 → 바로 생성 경로 사용, interval마다 잠금을 다시 시도해서
+      채우던 워커가 죽으면 이어받음
+    - 스냅샷은 프로세스별 임시 파일(mkstemp)에 쓴 뒤 os.replace
+    """
+
+    label = '문제 은행'
+
+    def __init__(self, snapshot_path: str):
+        self.snapshot_path = snapshot_path
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._owner = False
+        self._lock_file = None
+
+    # ---------- 하위 클래스 구현 ----------
+    async def _fill(self):
+        raise NotImplementedError
+
+    def _snapshot_data(self) -> Any:
+        raise NotImplementedError
+
+    def _restore_snapshot(self, data: Any):
+        raise NotImplementedError
+
+    # ---------- 채우기 작업 ----------
+    @property
+    def is_owner(self) -> bool:
+        """이 워커가 은행을 채우는지"""
+        return self._owner
+
+    def _notify_low(self):
+        if self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _acquire_owner(self) -> bool:
+        """다른 워커가 잡고 있지 않으면 잠금 파일을 잡고 True (프로세스가 끝나면 잠금은 자동으로 풀림)"""
+        if self._owner:
+            return True
+        if fcntl is not None:
+            try:
+                os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+                lock_file = open(self.snapshot_path + '.lock', 'a')
+            except OSError as e:
+                # 잠금 파일을 만들 수 없으면 예전처럼 이 워커가 채움
+                print(f"⚠️ {self.label} 잠금 파일 생성 실패, 잠금 없이 채웁니다: {e}")
+            else:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    lock_file.close()
+                    return False
+                self._lock_file = lock_file
+        self._owner = True
+        return True
+
+    def _release_owner(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self._owner = False
+
+    async def _run(self, interval: float):
+        if not self._acquire_owner():
+            print(f"ℹ️ {self.label}: 다른 워커가 채우는 중 (이 워커는 바로 생성)")
+            while not self._acquire_owner():
+                await asyncio.sleep(interval)
+        self.load_snapshot()
+        print(f"✅ {self.label} 채우기 담당")
+
+        while True:
+            # 크기를 확인하기 전에 clear → 채우는 동안 pop()이 보낸 신호는 남아서 바로 다시 확인
+            self._wakeup.clear()
+            await self._fill()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self, interval: float = 60.0):
+        """백그라운드 채우기 작업 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(interval))
+        print(f"✅ {self.label} 백그라운드 작업 시작")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 채우던 워커만 저장 (다른 워커의 빈 은행으로 스냅샷을 덮어쓰지 않음)
+        if self.is_owner:
+            self.save_snapshot()
+            self._release_owner()
+
+    # ---------- 스냅샷 ----------
+    def save_snapshot(self):
+        tmp_path = None
+        try:
+            data = self._snapshot_data()
+            directory = os.path.dirname(self.snapshot_path)
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=os.path.basename(self.snapshot_path) + '.',
+                                            suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.snapshot_path)
+        except Exception as e:
+            print(f"⚠️ {self.label} 저장 실패: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def load_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"⚠️ {self.label} 스냅샷 로드 실패: {e}")
+            return
+        self._restore_snapshot(data)
@@ -0,0 +1,284 @@
+# game/puzzle_corpus.py (문장 퍼즐 말뭉치 - 열 단위 바이너리 포맷, mmap으로 로드)
+import os, re, sys, json, mmap, pickle
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# 파일 구조
+#   MAGIC(8) | 헤더 길이(uint64) | 헤더 JSON | 8바이트 정렬된 열(column) 배열들
+#   헤더: {version, types, forms, thresholds, columns: {이름: [dtype, 시작 위치, 개수]}}
+#
+# 열 목록
+#   이야기(원본 항목)  text/title/meta 문자열 (arena: utf-8 바이트, offsets: int64 n+1개)
+#                     age(int16), type(uint8 → types), form(uint8 → forms), word_count(int32)
+#   문장(미리 분리)    sentence 문자열, sentence_story(int32), sentence_age(int16), sentence_word_count(int16),
+#                     sentence_kind(uint8: 0 문장, 1 요약문 전체)
+#                     (kind, age, word_count) 순으로 정렬 → 같은 (나이, 단어 수)는 연속 구간
+#                     정렬된 순서의 번호가 문장 ID (같은 말뭉치 파일이면 워커/재시작과 상관없이 같음)
+#   문장 단어          word 문자열(단어 사전), token_arena(int32 단어 번호), token_offsets(int64 n+1개)
+#                     퍼즐 조각/끝맺음/힌트는 여기서 바로 꺼냄 (요청마다 split하지 않음)
+MAGIC = b'SSTCORP1'
+FORMAT_VERSION = 2
+SENTENCE = 0
+SUMMARY = 1
+_ALIGN = 8
+
+# 마침표/느낌표/물음표 + 공백 + 대문자 or 따옴표
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?"])\s+(?=[A-Z가-힣"\'])')
+
+
+def split_into_sentences(text: str) -> List[str]:
+    """이야기 본문 → 문장 목록 (끝에 문장 부호가 없으면 마침표 추가)"""
+    clean_sentences = []
+    for sent in _SENTENCE_BOUNDARY.split(text):
+        sent = sent.strip()
+        if not sent:
+            continue
+        # 따옴표로 시작하지 않고 끝에 마침표가 없으면 추가
+        if sent[-1] not in '.!?"':
+            sent += '.'
+        clean_sentences.append(sent)
+    return clean_sentences
+
+
+def _pack_strings(strings: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    arena = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    return arena, offsets
+
+
+def _json_default(value):
+    # thresholds에 numpy 값이 섞여 있을 수 있음
+    return value.tolist() if hasattr(value, 'tolist') else str(value)
+
+
+def _vocab_codes(values: List[str]) -> Tuple[List[str], np.ndarray]:
+    vocab = sorted(set(values))
+    lookup = {value: code for code, value in enumerate(vocab)}
+    return vocab, np.array([lookup[v] for v in values], dtype=np.uint8)
+
+
+class PuzzleCorpus:
+    """
+    퍼즐 말뭉치 (열 단위 배열, 파일에서 열면 mmap이라 워커끼리 OS 페이지를 공유)
+
+    - len(corpus), corpus[i] → 기존 pickle 항목과 같은 dict (필요할 때만 만듦)
+    - sentence(i), sentence_story/sentence_age/sentence_word_count: 미리 분리한 문장 (i가 문장 ID)
+    - sentence_tokens(i), sentence_words(i), ending_tokens(i): 문장의 단어 (미리 토큰화)
+    - bucket(age, word_count) → 문장 번호 구간 (start, end)
+    - summary_range(age) → 나이별 요약문 구간 (맞는 문장이 없을 때 출제)
+    """
+
+    def __init__(self, buffer, header: Dict[str, Any], data_offset: int):
+        self._buffer = buffer
+        self.types: List[str] = header['types']
+        self.forms: List[str] = header['forms']
+        self.thresholds: Dict[str, Any] = header.get('thresholds', {})
+
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.frombuffer(buffer, dtype=np.dtype(dtype), count=count, offset=data_offset + start)
+            for name, (dtype, start, count) in header['columns'].items()
+        }
+        for name, column in self.columns.items():
+            setattr(self, name, column)
+
+        # (나이, 단어 수) → 문장 구간 (정렬되어 있으므로 시작 위치/개수만 계산), 요약문은 뒤쪽에 나이별로
+        num_sentences = int(np.searchsorted(self.sentence_kind, SUMMARY))
+        keys = self.sentence_age[:num_sentences].astype(np.int64) * 65536 + self.sentence_word_count[:num_sentences]
+        unique, starts, counts = np.unique(keys, return_index=True, return_counts=True)
+        self.buckets: Dict[Tuple[int, int], Tuple[int, int]] = {
+            (int(key // 65536), int(key % 65536)): (int(start), int(start + count))
+            for key, start, count in zip(unique, starts, counts)
+        }
+        unique, starts, counts = np.unique(self.sentence_age[num_sentences:], return_index=True, return_counts=True)
+        self.summary_ranges: Dict[int, Tuple[int, int]] = {
+            int(age): (num_sentences + int(start), num_sentences + int(start + count))
+            for age, start, count in zip(unique, starts, counts)
+        }
+
+    # ---------- 조회 ----------
+    @staticmethod
+    def _string(arena: np.ndarray, offsets: np.ndarray, i: int) -> str:
+        return arena[offsets[i]:offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __len__(self) -> int:
+        return len(self.age)
+
+    def text(self, i: int) -> str:
+        return self._string(self.text_arena, self.text_offsets, i)
+
+    def title(self, i: int) -> str:
+        return self._string(self.title_arena, self.title_offsets, i)
+
+    def sentence(self, i: int) -> str:
+        return self._string(self.sentence_arena, self.sentence_offsets, i)
+
+    def num_sentences(self) -> int:
+        return len(self.sentence_age)
+
+    def word(self, token: int) -> str:
+        return self._string(self.word_arena, self.word_offsets, token)
+
+    def sentence_tokens(self, i: int) -> np.ndarray:
+        return self.token_arena[self.token_offsets[i]:self.token_offsets[i + 1]]
+
+    def sentence_words(self, i: int) -> List[str]:
+        return [self.word(token) for token in self.sentence_tokens(i)]
+
+    def ending_tokens(self, i: int) -> np.ndarray:
+        """문장 끝맺음 확인에 쓰는 마지막 두 단어"""
+        return self.sentence_tokens(i)[-2:]
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        record = {
+            'text': self.text(i),
+            'title': self.title(i),
+            'age': int(self.age[i]),
+            'type': self.types[self.type[i]],
+            'form': self.forms[self.form[i]],
+        }
+        meta = self._string(self.meta_arena, self.meta_offsets, i)
+        if meta:
+            record['metadata'] = json.loads(meta)
+        return record
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def bucket(self, age: int, word_count: int) -> Tuple[int, int]:
+        return self.buckets.get((age, word_count), (0, 0))
+
+    def summary_range(self, age: int) -> Tuple[int, int]:
+        return self.summary_ranges.get(age, (0, 0))
+
+    def ages(self) -> List[int]:
+        return [int(age) for age in np.unique(self.age) if age]
+
+    # ---------- 생성 / 저장 / 로드 ----------
+    @classmethod
+    def build(cls, records: List[Dict[str, Any]], split: Callable[[str], List[str]] = split_into_sentences,
+              thresholds: Dict[str, Any] = None) -> 'PuzzleCorpus':
+        """pickle 항목 목록 → 메모리 위의 말뭉치 (문장 분리는 여기서 한 번만)"""
+        return cls.from_bytes(cls._serialize(records, split, thresholds or {}))
+
+    @classmethod
+    def _serialize(cls, records, split, thresholds) -> bytes:
+        texts = [r.get('text') or '' for r in records]
+        ages = np.array([r.get('age') or 0 for r in records], dtype=np.int16)
+        types, type_codes = _vocab_codes([str(r.get('type') or '') for r in records])
+        forms, form_codes = _vocab_codes([str(r.get('form') or '') for r in records])
+
+        sentences, sentence_story, sentence_age, sentence_kind = [], [], [], []
+
+        def add(sent, story, age, kind):
+            sentences.append(sent)
+            sentence_story.append(story)
+            sentence_age.append(age)
+            sentence_kind.append(kind)
+
+        for story, (text, age) in enumerate(zip(texts, ages)):
+            if not age:
+                continue
+            for sent in split(text):
+                add(sent, story, age, SENTENCE)
+            # 요약문은 통째로도 출제 후보 (끝에 문장 부호가 없으면 마침표)
+            summary = text.strip()
+            if types[type_codes[story]] == 'summary' and summary:
+                add(summary if summary[-1] in '.!?"' else summary + '.', story, age, SUMMARY)
+
+        sentence_words = [sent.split() for sent in sentences]
+        sentence_age = np.array(sentence_age, dtype=np.int16)
+        sentence_kind = np.array(sentence_kind, dtype=np.uint8)
+        sentence_word_count = np.array([min(len(words), np.iinfo(np.int16).max) for words in sentence_words],
+                                       dtype=np.int16)
+        order = np.lexsort((sentence_word_count, sentence_age, sentence_kind))
+
+        # 단어 사전 + 문장별 단어 번호 (정렬된 문장 순서로)
+        vocab: Dict[str, int] = {}
+        tokens = [[vocab.setdefault(w, len(vocab)) for w in sentence_words[i]] for i in order]
+        token_offsets = np.zeros(len(tokens) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in tokens], out=token_offsets[1:])
+        word_arena, word_offsets = _pack_strings(vocab)
+
+        text_arena, text_offsets = _pack_strings(texts)
+        title_arena, title_offsets = _pack_strings(str(r.get('title') or '') for r in records)
+        meta_arena, meta_offsets = _pack_strings(
+            json.dumps(r['metadata'], ensure_ascii=False) if r.get('metadata') else '' for r in records)
+        sentence_arena, sentence_offsets = _pack_strings(sentences[i] for i in order)
+
+        columns = {
+            'text_arena': text_arena, 'text_offsets': text_offsets,
+            'title_arena': title_arena, 'title_offsets': title_offsets,
+            'meta_arena': meta_arena, 'meta_offsets': meta_offsets,
+            'age': ages, 'type': type_codes, 'form': form_codes,
+            'word_count': np.array([len(t.split()) for t in texts], dtype=np.int32),
+            'sentence_arena': sentence_arena, 'sentence_offsets': sentence_offsets,
+            'sentence_story': np.array(sentence_story, dtype=np.int32)[order],
+            'sentence_age': sentence_age[order],
+            'sentence_word_count': sentence_word_count[order],
+            'sentence_kind': sentence_kind[order],
+            'word_arena': word_arena, 'word_offsets': word_offsets,
+            'token_arena': np.fromiter((t for row in tokens for t in row), dtype=np.int32,
+                                       count=int(token_offsets[-1])),
+            'token_offsets': token_offsets,
+        }
+
+        layout, chunks, position = {}, [], 0
+        for name, column in columns.items():
+            data = np.ascontiguousarray(column).tobytes()
+            layout[name] = [column.dtype.str, position, len(column)]
+            padding = -len(data) % _ALIGN
+            chunks.append(data + b'\0' * padding)
+            position += len(data) + padding
+
+        header = json.dumps({'version': FORMAT_VERSION, 'types': types, 'forms': forms,
+                             'thresholds': thresholds, 'columns': layout},
+                            ensure_ascii=False, default=_json_default).encode('utf-8')
+        header += b' ' * (-(len(MAGIC) + 8 + len(header)) % _ALIGN)
+        return MAGIC + np.uint64(len(header)).tobytes() + header + b''.join(chunks)
+
+    @classmethod
+    def _parse(cls, buffer) -> 'PuzzleCorpus':
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError("퍼즐 말뭉치 파일 형식이 아닙니다")
+        header_size = int(np.frombuffer(buffer, dtype=np.uint64, count=1, offset=len(MAGIC))[0])
+        header_start = len(MAGIC) + 8
+        header = json.loads(bytes(buffer[header_start:header_start + header_size]))
+        if header['version'] != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 퍼즐 말뭉치 버전: {header['version']}")
+        return cls(buffer, header, header_start + header_size)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'PuzzleCorpus':
+        return cls._parse(data)
+
+    @classmethod
+    def load(cls, path: str) -> 'PuzzleCorpus':
+        """파일을 mmap으로 열기 (읽기 전용, 실제로 읽는 페이지만 메모리에 올라감)"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls._parse(buffer)
+
+
+def export_corpus(pkl_path: str, out_path: str = None) -> str:
+    """processed_sentences.pkl → processed_sentences.corpus (오프라인 변환, 배포 전에 한 번 실행)"""
+    out_path = out_path or os.path.splitext(pkl_path)[0] + '.corpus'
+    with open(pkl_path, 'rb') as f:
+        data = pickle.load(f)
+
+    records = data['train']
+    payload = PuzzleCorpus._serialize(records, split_into_sentences,
+                                      data.get('thresholds', {}))
+    tmp_path = out_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp_path, out_path)
+    print(f"✅ 퍼즐 말뭉치 변환 완료: {out_path} ({len(records)}개 항목, {len(payload) / 1024 / 1024:.1f}MB)")
+    return out_path
+
+
+if __name__ == "__main__":
+    # python -m app.games.puzzle_corpus app/games/data/pickle/processed_sentences.pkl  (backend 디렉토리에서 실행)
+    export_corpus(*sys.argv[1:3])
@@ -0,0 +1,188 @@
+# game/puzzle_embeddings.py (문장 퍼즐 의미 유사도 - 말뭉치 임베딩 미리 계산 + 답안 임베딩 묶음 처리)
+# 말뭉치 임베딩 행렬은 오프라인 전용 (퍼즐 채점은 단어 위치/순서로 하므로 요청 경로에서 읽지 않음)
+import os, sys, json, asyncio, hashlib
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 파일 구조 (말뭉치 옆에 저장)
+#   processed_sentences.embeddings.npy   float16 [문장 수, 차원], 행마다 L2 정규화 (내적 = 코사인 유사도)
+#   processed_sentences.embeddings.json  {model_name, num_sentences, dim, corpus_checksum}
+#                                        (말뭉치/모델이 바뀌었는지 확인용)
+EMBEDDING_DTYPE = np.float16
+
+
+def embeddings_path(data_path: str) -> str:
+    return os.path.splitext(data_path)[0] + '.embeddings.npy'
+
+
+def corpus_checksum(corpus) -> str:
+    """말뭉치 문장 내용의 sha256 (문장 수가 같아도 문장이 바뀌면 달라짐, pickle/.corpus 어느 쪽에서 읽어도 같음)"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(corpus.sentence_offsets, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(corpus.sentence_arena).tobytes())
+    return digest.hexdigest()
+
+
+def load_corpus_embeddings(data_path: str, model_name: str, corpus) -> Optional[np.ndarray]:
+    """미리 계산한 말뭉치 임베딩 (mmap), 없거나 말뭉치/모델과 맞지 않으면 None"""
+    path = embeddings_path(data_path)
+    info_path = os.path.splitext(path)[0] + '.json'
+    if not os.path.exists(path) or not os.path.exists(info_path):
+        return None
+
+    with open(info_path, encoding='utf-8') as f:
+        info = json.load(f)
+    if (info.get('model_name') != model_name or info.get('num_sentences') != corpus.num_sentences()
+            or info.get('corpus_checksum') != corpus_checksum(corpus)):
+        print(f"⚠️ {path}: 말뭉치 또는 모델이 바뀌어 사용하지 않습니다 (python -m app.games.puzzle_embeddings 로 다시 생성)")
+        return None
+
+    embeddings = np.load(path, mmap_mode='r')
+    print(f"✓ 말뭉치 임베딩 로드 완료: {path} {embeddings.shape}")
+    return embeddings
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class AnswerEncoder:
+    """
+    답안 문장 임베딩 (정규화된 float32 벡터)
+
+    - 최근 답안은 LRU 캐시 (같은 답안/자주 나오는 오답은 다시 계산하지 않음)
+    - encode(): 동시에 들어온 요청을 max_wait초 동안 최대 max_batch개까지 모아 모델 호출 한 번으로 처리
+      (같은 문장이 동시에 들어오면 한 번만 계산), 모델은 스레드에서 실행해 이벤트 루프를 막지 않음
+    - encode_many(): 동기 코드용, 캐시에 없는 문장만 한 번에 계산
+    """
+
+    def __init__(self, encode_batch: Callable[[List[str]], np.ndarray], max_batch: int = 32,
+                 max_wait: float = 0.01, cache_size: int = 4096):
+        self.encode_batch = encode_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.cache_size = cache_size
+
+        self._cache: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.metrics: Dict[str, int] = {'hits': 0, 'misses': 0, 'batches': 0}
+
+    # ---------- 캐시 ----------
+    def _cached(self, text: str) -> Optional[np.ndarray]:
+        vector = self._cache.get(text)
+        if vector is not None:
+            self._cache.move_to_end(text)
+            self.metrics['hits'] += 1
+        return vector
+
+    def _remember(self, text: str, vector: np.ndarray):
+        self._cache[text] = vector
+        self._cache.move_to_end(text)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def _compute(self, texts: List[str]) -> np.ndarray:
+        self.metrics['misses'] += len(texts)
+        self.metrics['batches'] += 1
+        return normalize(self.encode_batch(texts))
+
+    # ---------- 동기 ----------
+    def encode_many(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = {text: self._cached(text) for text in texts}
+        missing = [text for text, vector in vectors.items() if vector is None]
+        if missing:
+            for text, vector in zip(missing, self._compute(missing)):
+                self._remember(text, vector)
+                vectors[text] = vector
+        return np.stack([vectors[text] for text in texts])
+
+    # ---------- 비동기 (묶음 처리) ----------
+    async def encode(self, text: str) -> np.ndarray:
+        vector = self._cached(text)
+        if vector is not None:
+            return vector
+
+        future = self._pending.get(text)
+        if future is None:
+            if self._task is None:
+                self._queue = asyncio.Queue()
+                self._task = asyncio.create_task(self._run())
+            future = asyncio.get_running_loop().create_future()
+            self._pending[text] = future
+            self._queue.put_nowait(text)
+        return await asyncio.shield(future)
+
+    async def _next_batch(self) -> List[str]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                vectors = await asyncio.to_thread(self._compute, batch)
+            except Exception as e:
+                for text in batch:
+                    self._pending.pop(text).set_exception(e)
+                continue
+            for text, vector in zip(batch, vectors):
+                self._remember(text, vector)
+                self._pending.pop(text).set_result(vector)
+
+    async def aclose(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def stats(self) -> dict:
+        return {'cached': len(self._cache), **self.metrics}
+
+
+def export_embeddings(data_path: str, model_name: str = 'jhgan/ko-sroberta-multitask',
+                      batch_size: int = 256) -> Tuple[str, Tuple[int, int]]:
+    """말뭉치 문장 전체 임베딩 → .embeddings.npy (오프라인, 배포 전에 한 번 실행)"""
+    from .train_embedding import FairytalePuzzleGenerator
+
+    generator = FairytalePuzzleGenerator(data_path=data_path, model_name=model_name)
+    corpus = generator.corpus
+    sentences = [corpus.sentence(i) for i in range(corpus.num_sentences())]
+    embeddings = generator.model.encode(sentences, batch_size=batch_size, normalize_embeddings=True,
+                                        convert_to_numpy=True, show_progress_bar=True)
+    embeddings = normalize(embeddings).astype(EMBEDDING_DTYPE)
+
+    path = embeddings_path(data_path)
+    np.save(path + '.tmp.npy', embeddings)
+    os.replace(path + '.tmp.npy', path)
+    with open(os.path.splitext(path)[0] + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'model_name': model_name, 'num_sentences': len(sentences), 'dim': int(embeddings.shape[1]),
+                   'corpus_checksum': corpus_checksum(corpus)}, f)
+    print(f"✅ 말뭉치 임베딩 저장 완료: {path} {embeddings.shape}, {embeddings.nbytes / 1024 / 1024:.1f}MB")
+    return path, embeddings.shape
+
+
+if __name__ == "__main__":
+    # python -m app.games.puzzle_embeddings app/games/data/pickle/processed_sentences.pkl  (backend 디렉토리에서)
+    export_embeddings(*sys.argv[1:3])
@@ -0,0 +1,106 @@
+# game/puzzle_scheduler.py (문장 퍼즐 출제 순서 - 사용자별 푼 문장 제외 + 나이 난이도 자동 조절)
+import base64, random, zlib
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# 난이도 조절 기준 (현재 나이에서 푼 결과만 봄)
+LEVEL_UP_STREAK = 3     # 연속으로 맞히면 한 단계 위 나이
+LEVEL_DOWN_STREAK = 2   # 연속으로 틀리면 한 단계 아래 나이
+# 무작위로 뽑아서 안 본 문장이 나오지 않으면 구간 전체에서 안 본 문장을 찾음
+_RANDOM_TRIES = 8
+
+
+class SeenSentences:
+    """
+    사용자가 이미 받은 문장 (말뭉치 문장 ID 비트맵, 문장 50만 개여도 62KB)
+
+    dumps()는 zlib 압축 + base64 문자열 (대부분 0이라 수백 바이트), 말뭉치 크기가 다르면 loads에서 버림
+    """
+
+    def __init__(self, size: int, bits: np.ndarray = None):
+        self.size = size
+        self.bits = bits if bits is not None else np.zeros((size + 7) // 8, dtype=np.uint8)
+
+    def add(self, sentence_id: int):
+        self.bits[sentence_id >> 3] |= np.uint8(1 << (sentence_id & 7))
+
+    def update(self, sentence_ids: Iterable[int]):
+        for sentence_id in sentence_ids:
+            if sentence_id is not None and 0 <= sentence_id < self.size:
+                self.add(sentence_id)
+
+    def __contains__(self, sentence_id: int) -> bool:
+        return bool(self.bits[sentence_id >> 3] & (1 << (sentence_id & 7)))
+
+    def __len__(self) -> int:
+        return int(np.unpackbits(self.bits).sum())
+
+    def mask(self, start: int, end: int) -> np.ndarray:
+        """문장 ID start ~ end-1의 본 문장 여부 (bool 배열)"""
+        first = start >> 3
+        bits = np.unpackbits(self.bits[first:(end + 7) >> 3], bitorder='little')
+        return bits[start - first * 8:end - first * 8].astype(bool)
+
+    def dumps(self) -> str:
+        return f"{self.size}:{base64.b64encode(zlib.compress(self.bits.tobytes())).decode('ascii')}"
+
+    @classmethod
+    def loads(cls, text: Optional[str], size: int) -> 'SeenSentences':
+        if text:
+            stored_size, _, payload = text.partition(':')
+            if stored_size == str(size):
+                try:
+                    bits = np.frombuffer(zlib.decompress(base64.b64decode(payload)), dtype=np.uint8).copy()
+                    if len(bits) == (size + 7) // 8:
+                        return cls(size, bits)
+                except (ValueError, zlib.error):
+                    pass
+        return cls(size)
+
+
+class PuzzleScheduler:
+    """
+    다음 문제 고르기
+
+    - adjust_age: 현재 나이에서 LEVEL_UP_STREAK번 연속 정답이면 위로, LEVEL_DOWN_STREAK번 연속 오답이면 아래로
+    - pick: 나이별 (나이, 단어 수) 문장 구간에서 본 문장을 빼고 무작위 선택 (없으면 요약문, 다 봤으면 중복 허용)
+    """
+
+    def __init__(self, ages: Sequence[int], pools: dict, summary_pools: dict, rng: random.Random = None):
+        self.ages = sorted(ages)
+        self.pools = pools
+        self.summary_pools = summary_pools
+        self.rng = rng or random.Random()
+
+    def adjust_age(self, age: int, results: List[bool]) -> int:
+        """results: 현재 나이에서 푼 문제의 정답 여부 (오래된 순)"""
+        if age not in self.ages or not results:
+            return age
+        level = self.ages.index(age)
+        if len(results) >= LEVEL_UP_STREAK and all(results[-LEVEL_UP_STREAK:]):
+            level = min(level + 1, len(self.ages) - 1)
+        elif len(results) >= LEVEL_DOWN_STREAK and not any(results[-LEVEL_DOWN_STREAK:]):
+            level = max(level - 1, 0)
+        return self.ages[level]
+
+    def _ranges(self, age: int) -> List[Tuple[int, int]]:
+        ranges = (self.pools.get(age, (0, 0)), self.summary_pools.get(age, (0, 0)))
+        return [(start, end) for start, end in ranges if end > start]
+
+    def pick(self, age: int, seen: SeenSentences) -> Optional[int]:
+        ranges = self._ranges(age)
+        for start, end in ranges:
+            for _ in range(_RANDOM_TRIES):
+                sentence_id = self.rng.randrange(start, end)
+                if sentence_id not in seen:
+                    return sentence_id
+            unseen = np.flatnonzero(~seen.mask(start, end))
+            if len(unseen):
+                return start + int(unseen[self.rng.randrange(len(unseen))])
+
+        # 전부 본 경우 다시 출제
+        if ranges:
+            start, end = ranges[0]
+            return self.rng.randrange(start, end)
+        return None
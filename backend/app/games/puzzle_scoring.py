@@ -0,0 +1,205 @@
+# game/puzzle_scoring.py (문장 퍼즐 채점 - 위치/순서 유사도, 여러 답안 일괄 채점)
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+# 정답 판정 기준 (SentencePuzzleGame과 같은 값)
+POSITION_THRESHOLD = 0.95
+SEQUENCE_THRESHOLD = 0.90
+
+# 한 번에 비트 연산으로 처리하는 최대 단어 수 (uint64 한 칸), 넘는 문장은 정수 비트 연산으로 따로 계산
+_WORD_BITS = 64
+# 바이트 → 1인 비트 수
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def position_similarity(original_words: Sequence[str], user_words: Sequence[str]) -> float:
+    """같은 자리에 같은 단어가 있는 비율 (단어 수가 다르면 0)"""
+    if len(original_words) != len(user_words) or not original_words:
+        return 0.0
+    return sum(a == b for a, b in zip(original_words, user_words)) / len(original_words)
+
+
+def lcs_length(a: Sequence, b: Sequence) -> int:
+    """
+    최장 공통 부분 수열 길이 (비트 병렬, Hyyrö)
+
+    a의 각 단어 위치를 비트 하나로 두고 b의 단어마다 비트 연산 한 번 → O(len(b)) 번의 정수 연산
+    """
+    if not a or not b:
+        return 0
+    masks: Dict = {}
+    for i, token in enumerate(a):
+        masks[token] = masks.get(token, 0) | (1 << i)
+
+    full = (1 << len(a)) - 1
+    v = full
+    for token in b:
+        u = v & masks.get(token, 0)
+        v = ((v + u) | (v - u)) & full
+    return len(a) - bin(v).count('1')
+
+
+def sequence_similarity(original_words: Sequence[str], user_words: Sequence[str]) -> float:
+    """LCS 길이 / 원문 단어 수 (단어 수가 다르면 0)"""
+    if len(original_words) != len(user_words) or not original_words:
+        return 0.0
+    return lcs_length(original_words, user_words) / len(original_words)
+
+
+def check_sentence_ending(original_words: Sequence[str], user_words: Sequence[str]) -> bool:
+    """마지막 단어(두 단어 이상이면 마지막 두 단어)가 같은지"""
+    if not original_words or not user_words:
+        return False
+    if original_words[-1] != user_words[-1]:
+        return False
+    if len(original_words) >= 2 and len(user_words) >= 2 and original_words[-2] != user_words[-2]:
+        return False
+    return True
+
+
+# ---------- 일괄 채점 ----------
+def encode_pairs(originals: Sequence[str], attempts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (원문, 답안) 문장 쌍 → 단어 ID 배열
+
+    반환: (원문 ID [N, L], 답안 ID [N, L], 원문 단어 수 [N], 답안 단어 수 [N])
+    빈 칸은 원문 -1, 답안 -2로 채워서 서로 일치하지 않게 함
+    """
+    original_words = [s.split() for s in originals]
+    attempt_words = [s.split() for s in attempts]
+    flat = [w for words in original_words for w in words] + [w for words in attempt_words for w in words]
+
+    vocab = dict.fromkeys(flat)
+    for token, word in enumerate(vocab):
+        vocab[word] = token
+    ids = np.fromiter(map(vocab.__getitem__, flat), dtype=np.int32, count=len(flat))
+
+    original_lengths = np.array([len(words) for words in original_words], dtype=np.int64)
+    attempt_lengths = np.array([len(words) for words in attempt_words], dtype=np.int64)
+    width = int(max(original_lengths.max(initial=0), attempt_lengths.max(initial=0), 1))
+    split = int(original_lengths.sum())
+
+    return (_pad(ids[:split], original_lengths, width, -1), _pad(ids[split:], attempt_lengths, width, -2),
+            original_lengths, attempt_lengths)
+
+
+def _pad(flat_ids: np.ndarray, lengths: np.ndarray, width: int, fill: int) -> np.ndarray:
+    ids = np.full((len(lengths), width), fill, dtype=np.int32)
+    ids[np.arange(width) < lengths[:, None]] = flat_ids
+    return ids
+
+
+def position_similarity_batch(original_ids: np.ndarray, attempt_ids: np.ndarray,
+                              original_lengths: np.ndarray, attempt_lengths: np.ndarray) -> np.ndarray:
+    same_length = (original_lengths == attempt_lengths) & (original_lengths > 0)
+    matches = (original_ids == attempt_ids).sum(axis=1)
+    return np.where(same_length, matches / np.maximum(original_lengths, 1), 0.0)
+
+
+def lcs_length_batch(original_ids: np.ndarray, attempt_ids: np.ndarray,
+                     original_lengths: np.ndarray, attempt_lengths: np.ndarray) -> np.ndarray:
+    """
+    쌍마다 LCS 길이 (비트 병렬 LCS를 N개 쌍에 동시에 적용)
+
+    원문이 64단어 이하인 쌍은 uint64 배열 하나로, 넘는 쌍만 lcs_length로 계산
+    """
+    n, width = original_ids.shape
+    result = np.zeros(n, dtype=np.int64)
+    wide = original_lengths > _WORD_BITS
+    rows = np.flatnonzero(~wide)
+
+    if len(rows):
+        bits = min(width, _WORD_BITS)
+        originals = original_ids[rows, :bits]
+        attempts = attempt_ids[rows]
+        weights = np.left_shift(np.uint64(1), np.arange(bits, dtype=np.uint64))
+        full = np.where(original_lengths[rows] >= _WORD_BITS, np.uint64(~np.uint64(0)),
+                        np.left_shift(np.uint64(1), original_lengths[rows].astype(np.uint64)) - np.uint64(1))
+
+        v = full.copy()
+        for j in range(int(attempt_lengths[rows].max(initial=0))):
+            # 답안 j번째 단어가 원문 어디에 있는지 → 비트 마스크 (빈 칸 -2는 어디에도 일치하지 않음)
+            match = ((originals == attempts[:, j:j + 1]) * weights).sum(axis=1, dtype=np.uint64)
+            u = v & match
+            v = ((v + u) | (v - u)) & full
+        ones = _POPCOUNT8[v.view(np.uint8)].reshape(len(rows), 8).sum(axis=1)
+        result[rows] = original_lengths[rows] - ones
+
+    for i in np.flatnonzero(wide):
+        result[i] = lcs_length(original_ids[i, :original_lengths[i]].tolist(),
+                               attempt_ids[i, :attempt_lengths[i]].tolist())
+    return result
+
+
+def sentence_ending_batch(original_ids: np.ndarray, attempt_ids: np.ndarray,
+                          original_lengths: np.ndarray, attempt_lengths: np.ndarray) -> np.ndarray:
+    rows = np.arange(len(original_ids))
+
+    def word_from_end(ids, lengths, k):
+        return ids[rows, np.maximum(lengths - k, 0)]
+
+    both = (original_lengths > 0) & (attempt_lengths > 0)
+    last = word_from_end(original_ids, original_lengths, 1) == word_from_end(attempt_ids, attempt_lengths, 1)
+    two = (original_lengths >= 2) & (attempt_lengths >= 2)
+    second = word_from_end(original_ids, original_lengths, 2) == word_from_end(attempt_ids, attempt_lengths, 2)
+    return both & last & (~two | second)
+
+
+def same_words_batch(original_ids: np.ndarray, attempt_ids: np.ndarray,
+                     original_lengths: np.ndarray, attempt_lengths: np.ndarray) -> np.ndarray:
+    """단어 집합이 같은지 (행마다 정렬 → 중복 제거 → 다시 정렬해서 비교)"""
+    width = original_ids.shape[1]
+    pad = np.iinfo(np.int32).max
+
+    def unique_rows(ids, lengths):
+        rows = np.where(np.arange(width) < lengths[:, None], ids, pad)
+        rows.sort(axis=1)
+        rows[:, 1:][rows[:, 1:] == rows[:, :-1]] = pad
+        rows.sort(axis=1)
+        return rows
+
+    return (unique_rows(original_ids, original_lengths) == unique_rows(attempt_ids, attempt_lengths)).all(axis=1)
+
+
+def score_token_ids(original_ids: np.ndarray, attempt_ids: np.ndarray,
+                    original_lengths: np.ndarray, attempt_lengths: np.ndarray,
+                    position_threshold: float = POSITION_THRESHOLD,
+                    sequence_threshold: float = SEQUENCE_THRESHOLD) -> Dict[str, np.ndarray]:
+    """
+    단어 ID 배열로 여러 쌍을 한 번에 채점 (encode_pairs 결과, 또는 미리 토큰화해 둔 ID 배열)
+
+    SentencePuzzleGame._verify와 같은 판정 순서:
+    완전 일치 → 단어 집합 일치 → 끝맺음 → 위치/순서 유사도가 기준 이상이면 정답
+    완전 일치는 단어 단위로 비교 (단어 사이 공백 개수는 무시)
+    """
+    args = (original_ids, attempt_ids, original_lengths, attempt_lengths)
+    same_length = (original_lengths == attempt_lengths) & (original_lengths > 0)
+    padding = np.arange(original_ids.shape[1]) >= original_lengths[:, None]
+    exact = same_length & ((original_ids == attempt_ids) | padding).all(axis=1)
+    same_words = same_words_batch(*args)
+    ending = sentence_ending_batch(*args)
+    position = position_similarity_batch(*args)
+    sequence = np.where(same_length, lcs_length_batch(*args) / np.maximum(original_lengths, 1), 0.0)
+
+    passed = exact | (same_words & ending & (position >= position_threshold) & (sequence >= sequence_threshold))
+    return {
+        'exact_match': exact,
+        'same_words': same_words,
+        'ending_correct': ending,
+        'position_similarity': position,
+        'sequence_similarity': sequence,
+        'passed': passed,
+    }
+
+
+def score_answers(originals: Sequence[str], attempts: Sequence[str],
+                  position_threshold: float = POSITION_THRESHOLD,
+                  sequence_threshold: float = SEQUENCE_THRESHOLD) -> Dict[str, np.ndarray]:
+    """(원문, 답안) 문장 여러 쌍을 한 번에 채점 (지난 게임 기록 재채점, 기준값을 바꿔 본 분석 등)"""
+    scores = score_token_ids(*encode_pairs(originals, attempts),
+                             position_threshold=position_threshold, sequence_threshold=sequence_threshold)
+    # 문장 비교는 _verify처럼 앞뒤 공백만 제거하고 문자열 그대로
+    scores['exact_match'] = np.array([a.strip() == b.strip() for a, b in zip(originals, attempts)], dtype=bool)
+    scores['passed'] |= scores['exact_match']
+    return scores
@@ -1,77 +1,109 @@
 # game/sentence_puzzle_game.py (10문제 단위 저장 - 틀린 문제도 포함)
-import os
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
+import os, uuid, time, asyncio
+from typing import Dict, Any, List, Optional, Tuple
 # print("+++", os.path.join(os.path.dirname(__file__), 'data', 'pickle', 'processed_sentences.pkl'))
 from sqlalchemy.orm import Session
 from .train_embedding import FairytalePuzzleGenerator
+from .game_store import PuzzleState, PuzzleSessionState
+from .session_backend import SessionBackend, MemorySessionBackend
+from .game_result_writer import GameResultWriter
+from .puzzle_scheduler import PuzzleScheduler, SeenSentences
+from .puzzle_scoring import (POSITION_THRESHOLD, SEQUENCE_THRESHOLD, check_sentence_ending,
+                             position_similarity, sequence_similarity)
 from models import UserGames
 
 class SentencePuzzleGame:
-    def __init__(self, data_path: str = './data/pickle/processed_sentences.pkl', db: Session = None):
+    def __init__(self, data_path: str = './data/pickle/processed_sentences.pkl', db: Session = None,
+                 sessions: SessionBackend = None, results: GameResultWriter = None):
+        # 10문제 단위 게임 세션 (퍼즐 상태는 세션 안에 저장, 시작하고 24시간이 지나면 만료)
+        self.session_ttl = 24 * 3600
+        self.sessions = sessions if sessions is not None else MemorySessionBackend(
+            ttl_seconds=self.session_ttl, name='sentence_puzzle')
+        self.db = db
+        # 있으면 결과를 모아서 저장 (없으면 self.db로 바로 저장)
+        self.results = results
+        # 사용자별로 받은 문장 비트맵 (세션 저장소에 보관, 원본은 UserGames.word_history['seen'])
+        self.history_ttl = 30 * 24 * 3600
+        self.scheduler = None
         try:
             self.puzzle_generator = FairytalePuzzleGenerator(data_path=data_path)
-            self.storage = {}  # 개별 퍼즐 저장소
-            self.game_sessions = {}  # 10문제 단위 게임 세션
-            self.db = db
+            self.scheduler = PuzzleScheduler(self.puzzle_generator.sentences_by_age.keys(),
+                                             self.puzzle_generator.puzzle_pools,
+                                             self.puzzle_generator.summary_pools)
             print("✅ 문장 퍼즐 생성기 초기화 완료")
         except Exception as e:
             print(f"❌ 문장 퍼즐 생성기 초기화 실패: {e}")
             self.puzzle_generator = None
-    def _get_or_create_session(self, user_id: int, age: int) -> str:
-        """현재 진행중인 세션 찾기 또는 새 세션 생성"""
+
+    def _session_key(self, session_id: str) -> str:
+        return f"puzzle_session:{session_id}"
+
+    def _user_key(self, user_id: int) -> str:
+        # 사용자 → 진행 중인 세션 ID
+        return f"puzzle_user:{user_id}"
+
+    def _history_key(self, user_id: int) -> str:
+        # 사용자 → 지금까지 받은 문장 비트맵
+        return f"puzzle_history:{user_id}"
+
+    def _remaining_ttl(self, session: PuzzleSessionState) -> float:
+        """세션 시작 시각 기준 남은 시간 (저장할 때마다 연장되지 않도록)"""
+        return max(1.0, session.started_at + self.session_ttl - time.time())
+
+    async def _get_or_create_session(self, user_id: int, age: int) -> Tuple[PuzzleSessionState, int]:
+        """현재 진행중인 세션 찾기 또는 새 세션 생성 → (세션, 버전)"""
+        user_key = self._user_key(user_id)
+        session_id, user_version = await self.sessions.load(user_key)
+
         # 해당 유저의 진행중인 세션 찾기
-        for session_id, session in self.game_sessions.items():
-            if (session['user_id'] == user_id and
-                    not session['completed'] and
-                    session['total_puzzles'] < 10):  # total_puzzles로 변경
-                return session_id
-
-        # 새 세션 생성
-        session_id = f"{user_id}_{datetime.now().timestamp()}"
-        self.game_sessions[session_id] = {
-            'user_id': user_id,
-            'initial_age': age,  # 첫 문제의 난이도로 고정
-            'current_age': age,
-            'puzzles_solved': 0,  # 맞춘 문제 수
-            'total_puzzles': 0,  # 시도한 총 문제 수
-            'total_score': 0,
-            'completed': False,
-            'started_at': datetime.now()
-        }
-        return session_id
+        if session_id:
+            session, version = await self.sessions.load(self._session_key(session_id))
+            if (session is not None and
+                    not session.completed and
+                    session.total_puzzles < 10):  # total_puzzles로 변경
+                return session, version
+
+        # 새 세션 생성 (세션 자체는 첫 퍼즐과 함께 저장)
+        session = PuzzleSessionState(uuid.uuid4().hex, user_id, age)
+        session.seen = await self._load_seen(user_id)
+        await self.sessions.commit(user_key, session.session_id, user_version, ttl=self._remaining_ttl(session))
+        return session, 0
+
+    async def _load_puzzle(self, puzzle_id: str) -> Tuple[PuzzleSessionState, PuzzleState, int]:
+        """퍼즐 ID(세션ID-번호) → (세션, 퍼즐, 세션 버전)"""
+        session_id, _, index = puzzle_id.rpartition('-')
+        session, version = await self.sessions.load(self._session_key(session_id)) if session_id else (None, 0)
+        if session is None or not index.isdigit() or int(index) >= len(session.puzzles):
+            raise ValueError(f"퍼즐을 찾을 수 없습니다: {puzzle_id}")
+        return session, session.puzzles[int(index)], version
 
-    def generate_puzzle(self, age: int, user_id: int) -> Dict[str, Any]:
+    async def generate_puzzle(self, age: int, user_id: int) -> Dict[str, Any]:
         """퍼즐 생성"""
         if not self.puzzle_generator:
             raise Exception("퍼즐 생성기가 초기화되지 않았습니다")
 
-        puzzle = self.puzzle_generator.generate_puzzle(age=age)
+        if age not in self.puzzle_generator.sentences_by_age:
+            raise ValueError(f"{age}세 데이터가 없습니다.")
 
-        if not puzzle:
-            raise Exception("해당 조건에 맞는 퍼즐을 생성할 수 없습니다")
+        # 세션 찾기/생성
+        session, version = await self._get_or_create_session(user_id, age)
 
-        puzzle_id = str(puzzle['puzzle_id'])
+        # 세션 중에는 최근 결과로 나이를 조절하고, 이전에 받은 문장은 빼고 출제
+        if session.puzzles:
+            age = self._next_age(session)
+        sentence_id = self.scheduler.pick(age, self._seen_sentences(session))
+        puzzle = self.puzzle_generator.generate_puzzle(age=age, sentence_id=sentence_id) \
+            if sentence_id is not None else None
 
-        # 세션 찾기/생성
-        session_id = self._get_or_create_session(user_id, age)
+        if not puzzle:
+            raise Exception("해당 조건에 맞는 퍼즐을 생성할 수 없습니다")
 
-        # 퍼즐 정보 저장
-        self.storage[puzzle_id] = {
-            'user_id': user_id,
-            'session_id': session_id,
-            'original_sentence': puzzle['original_sentence'],
-            'age': puzzle['age'],
-            'created_at': datetime.now(),
-            'attempts': 0,
-            'hints_used': 0,
-            'processed': False,  # 처리 여부 (맞췄든 틀렸든)
-            'solved': False,  # 정답 여부
-            'score': 0,
-            'max_attempts': 2  # 최대 시도 횟수
-        }
+        # 퍼즐 정보 저장 (같은 문장이 다시 나와도 겹치지 않게 세션 안의 번호로 ID 생성, 문장은 문장 ID로 기록)
+        puzzle_id = f"{session.session_id}-{len(session.puzzles)}"
+        session.puzzles.append(PuzzleState(puzzle['original_sentence'], puzzle['age'],
+                                           sentence_id=puzzle['sentence_id']))
+        await self.sessions.commit(self._session_key(session.session_id), session, version, ttl=self._remaining_ttl(session))
 
-        session = self.game_sessions[session_id]
         return {
             'puzzle_id': puzzle_id,
             'age': puzzle['age'],
@@ -79,27 +111,82 @@ class SentencePuzzleGame:
             'pieces': puzzle['pieces'],
             'word_count': puzzle['word_count'],
             'metadata': puzzle['metadata'],
-            'session_progress': f"{session['total_puzzles']}/10"  # 진행 상황
+            'session_progress': f"{session.total_puzzles}/10"  # 진행 상황
         }
 
-    def verify_answer(
-            self,
-            puzzle_id: str,
-            user_answer: str
-    ) -> Dict[str, Any]:
+    async def verify_answer(self, puzzle_id: str, user_answer: str) -> Dict[str, Any]:
         """답안 검증 및 결과 처리"""
         if not self.puzzle_generator:
             raise Exception("퍼즐 생성기가 초기화되지 않았습니다")
 
-        if puzzle_id not in self.storage:
-            raise ValueError(f"퍼즐을 찾을 수 없습니다: {puzzle_id}")
+        session, puzzle_info, version = await self._load_puzzle(puzzle_id)
+        was_completed = session.completed
+
+        response = self._verify(session, puzzle_info, user_answer)
+        await self._commit_session(session, version, was_completed)
+        return response
+
+    async def _commit_session(self, session: PuzzleSessionState, version: int, was_completed: bool):
+        """세션 저장 후 이번 요청으로 10문제가 끝났으면 DB 저장"""
+        await self.sessions.commit(self._session_key(session.session_id), session, version, ttl=self._remaining_ttl(session))
+        if session.completed and not was_completed:
+            seen = self._seen_sentences(session).dumps()
+            await self._save_seen(session.user_id, seen)
+            self._save_session_to_db(session, seen)
+
+    # ---------- 출제 순서 (난이도 조절 / 받은 문장 제외) ----------
+    def _next_age(self, session: PuzzleSessionState) -> int:
+        """현재 나이에서 푼 문제들의 정답 여부로 다음 문제 나이 결정"""
+        results = [puzzle.solved for puzzle in session.puzzles
+                   if puzzle.processed and puzzle.age == session.current_age]
+        return self.scheduler.adjust_age(session.current_age, results)
+
+    def _seen_sentences(self, session: PuzzleSessionState) -> SeenSentences:
+        """이전 세션까지 받은 문장 + 이번 세션에서 받은 문장"""
+        seen = SeenSentences.loads(session.seen, self.puzzle_generator.corpus.num_sentences())
+        seen.update(puzzle.sentence_id for puzzle in session.puzzles)
+        return seen
+
+    async def _load_seen(self, user_id: int) -> Optional[str]:
+        seen, _ = await self.sessions.load(self._history_key(user_id))
+        if seen is None:
+            # 저장소에 없으면 (만료/재시작) 마지막 10문제 결과에서 복원
+            seen = await asyncio.to_thread(self._load_seen_from_db, user_id)
+        return seen
+
+    def _load_seen_from_db(self, user_id: int) -> Optional[str]:
+        def latest(db: Session):
+            row = (db.query(UserGames.word_history)
+                   .filter(UserGames.user_id == user_id, UserGames.game_type == 'sentence_completion')
+                   .order_by(UserGames.played_at.desc())
+                   .first())
+            return (row.word_history or {}).get('seen') if row else None
 
-        puzzle_info = self.storage[puzzle_id]
+        try:
+            if self.results is not None:
+                with self.results.session_factory() as db:
+                    return latest(db)
+            if self.db:
+                return latest(self.db)
+        except Exception as e:
+            print(f"❌ 받은 문장 기록 조회 실패 (user_id={user_id}): {e}")
+        return None
 
+    async def _save_seen(self, user_id: int, seen: str):
+        key = self._history_key(user_id)
+        _, version = await self.sessions.load(key)
+        # 같은 사용자의 세션 두 개가 동시에 끝난 경우에만 충돌 → 먼저 저장된 기록 유지
+        await self.sessions.save(key, seen, version, ttl=self.history_ttl)
+
+    def _verify(
+            self,
+            session: PuzzleSessionState,
+            puzzle_info: PuzzleState,
+            user_answer: str
+    ) -> Dict[str, Any]:
+        """답안 검증 (세션/퍼즐 상태만 변경)"""
         # 이미 처리된 퍼즐인지 확인
-        if puzzle_info['processed']:
-            session_id = puzzle_info['session_id']
-            session = self.game_sessions[session_id]
+        if puzzle_info.processed:
             return {
                 'passed': False,
                 'similarity': 0.0,
@@ -107,11 +194,11 @@ class SentencePuzzleGame:
                 'message': "이미 처리된 퍼즐입니다. 다음 문제를 진행하세요.",
                 'user_sentence': user_answer,
                 'original_sentence': None,
-                'session_progress': f"{session['total_puzzles']}/10"
+                'session_progress': f"{session.total_puzzles}/10"
             }
 
-        original_sentence = puzzle_info['original_sentence']
-        puzzle_info['attempts'] += 1
+        original_sentence = puzzle_info.original_sentence
+        puzzle_info.attempts += 1
 
         # 1. 완전 일치 확인
         is_exact_match = original_sentence.strip() == user_answer.strip()
@@ -119,20 +206,16 @@ class SentencePuzzleGame:
         if is_exact_match:
             # 점수 계산
             base_score = 100
-            hint_penalty = puzzle_info['hints_used'] * 10
-            attempt_penalty = max(0, (puzzle_info['attempts'] - 1) * 5)
+            hint_penalty = puzzle_info.hints_used * 10
+            attempt_penalty = max(0, (puzzle_info.attempts - 1) * 5)
             final_score = max(0, base_score - hint_penalty - attempt_penalty)
 
-            puzzle_info['solved'] = True
-            puzzle_info['score'] = final_score
-            puzzle_info['processed'] = True  # 처리 완료
+            puzzle_info.solved = True
+            puzzle_info.score = final_score
+            puzzle_info.processed = True  # 처리 완료
 
             # 세션에 추가
-            self._add_to_session(puzzle_info, success=True)
-
-            # 세션 상태 확인
-            session_id = puzzle_info['session_id']
-            session = self.game_sessions[session_id]
+            self._add_to_session(session, puzzle_info, success=True)
 
             response = {
                 'passed': True,
@@ -143,55 +226,50 @@ class SentencePuzzleGame:
                 'feedback': "완벽합니다! 정확히 맞췄어요! 🎉",
                 'user_sentence': user_answer,
                 'original_sentence': original_sentence,
-                'session_progress': f"{session['total_puzzles']}/10",
-                'session_complete': session['total_puzzles'] >= 10
+                'session_progress': f"{session.total_puzzles}/10",
+                'session_complete': session.total_puzzles >= 10
             }
 
-            # 10문제 완료시 DB 저장
-            if session['total_puzzles'] >= 10:
-                self._save_session_to_db(session_id)
-                response['final_score'] = session['total_score']
+            # 10문제 완료 (DB 저장은 세션 저장 후 _commit_session에서)
+            if session.total_puzzles >= 10:
+                response['final_score'] = session.total_score
                 response[
-                    'final_message'] = f"10문제 완료! 총점: {session['total_score']} (맞춘 문제: {session['puzzles_solved']}개)"
+                    'final_message'] = f"10문제 완료! 총점: {session.total_score} (맞춘 문제: {session.puzzles_solved}개)"
 
             return response
 
         # 2. 단어 검증 로직
-        original_words_list = original_sentence.strip().split()
+        original_words_list = self._original_words(puzzle_info)
         user_words_list = user_answer.strip().split()
 
         original_words_set = set(original_words_list)
         user_words_set = set(user_words_list)
 
         # 최대 시도 횟수 초과 체크
-        if puzzle_info['attempts'] >= puzzle_info['max_attempts']:
-            puzzle_info['processed'] = True  # 처리 완료 (실패)
-            puzzle_info['solved'] = False
-            puzzle_info['score'] = 0
+        if puzzle_info.attempts >= puzzle_info.max_attempts:
+            puzzle_info.processed = True  # 처리 완료 (실패)
+            puzzle_info.solved = False
+            puzzle_info.score = 0
 
             # 세션에 추가 (실패한 문제도 추가)
-            self._add_to_session(puzzle_info, success=False)
-
-            session_id = puzzle_info['session_id']
-            session = self.game_sessions[session_id]
+            self._add_to_session(session, puzzle_info, success=False)
 
             response = {
                 'passed': False,
                 'similarity': 0.0,
                 'exact_match': False,
-                'message': f"최대 시도 횟수({puzzle_info['max_attempts']}회)를 초과했습니다. 정답: {original_sentence}",
+                'message': f"최대 시도 횟수({puzzle_info.max_attempts}회)를 초과했습니다. 정답: {original_sentence}",
                 'user_sentence': user_answer,
                 'original_sentence': original_sentence,
-                'session_progress': f"{session['total_puzzles']}/10",
-                'session_complete': session['total_puzzles'] >= 10
+                'session_progress': f"{session.total_puzzles}/10",
+                'session_complete': session.total_puzzles >= 10
             }
 
-            # 10문제 완료시 DB 저장
-            if session['total_puzzles'] >= 10:
-                self._save_session_to_db(session_id)
-                response['final_score'] = session['total_score']
+            # 10문제 완료 (DB 저장은 세션 저장 후 _commit_session에서)
+            if session.total_puzzles >= 10:
+                response['final_score'] = session.total_score
                 response[
-                    'final_message'] = f"10문제 완료! 총점: {session['total_score']} (맞춘 문제: {session['puzzles_solved']}개)"
+                    'final_message'] = f"10문제 완료! 총점: {session.total_score} (맞춘 문제: {session.puzzles_solved}개)"
 
             return response
 
@@ -205,7 +283,7 @@ class SentencePuzzleGame:
             if extra_words:
                 feedback += f" 추가된 단어: {', '.join(extra_words)}"
 
-            feedback += f" (시도: {puzzle_info['attempts']}/{puzzle_info['max_attempts']})"
+            feedback += f" (시도: {puzzle_info.attempts}/{puzzle_info.max_attempts})"
 
             return {
                 'passed': False,
@@ -213,7 +291,7 @@ class SentencePuzzleGame:
                 'exact_match': False,
                 'message': feedback,
                 'user_sentence': user_answer,
-                'original_sentence': original_sentence if puzzle_info['attempts'] >= 2 else None
+                'original_sentence': original_sentence if puzzle_info.attempts >= 2 else None
             }
 
         # 3. 문장 끝맺음 체크
@@ -224,9 +302,9 @@ class SentencePuzzleGame:
                 'passed': False,
                 'similarity': 0.0,
                 'exact_match': False,
-                'message': f"문장의 끝맺음이 다릅니다. 마지막 단어들의 순서를 확인해보세요. ({puzzle_info['attempts']}/{puzzle_info['max_attempts']})",
+                'message': f"문장의 끝맺음이 다릅니다. 마지막 단어들의 순서를 확인해보세요. ({puzzle_info.attempts}/{puzzle_info.max_attempts})",
                 'user_sentence': user_answer,
-                'original_sentence': original_sentence if puzzle_info['attempts'] >= 2 else None
+                'original_sentence': original_sentence if puzzle_info.attempts >= 2 else None
             }
 
         # 4. 위치/순서 유사도 계산
@@ -234,29 +312,25 @@ class SentencePuzzleGame:
         sequence_similarity = self._calculate_sequence_similarity(original_words_list, user_words_list)
 
         # 5. 최종 판정
-        is_correct = (position_similarity >= 0.95 and
-                      sequence_similarity >= 0.90 and
+        is_correct = (position_similarity >= POSITION_THRESHOLD and
+                      sequence_similarity >= SEQUENCE_THRESHOLD and
                       ending_correct)
 
         if is_correct:
             base_score = 100
-            hint_penalty = puzzle_info['hints_used'] * 10
-            attempt_penalty = max(0, (puzzle_info['attempts'] - 1) * 5)
+            hint_penalty = puzzle_info.hints_used * 10
+            attempt_penalty = max(0, (puzzle_info.attempts - 1) * 5)
             position_penalty = int((1.0 - position_similarity) * 20)
             final_score = max(0, base_score - hint_penalty - attempt_penalty - position_penalty)
 
-            puzzle_info['solved'] = True
-            puzzle_info['score'] = final_score
-            puzzle_info['processed'] = True  # 처리 완료
+            puzzle_info.solved = True
+            puzzle_info.score = final_score
+            puzzle_info.processed = True  # 처리 완료
 
             feedback = f"정답입니다! (위치: {position_similarity * 100:.0f}%, 순서: {sequence_similarity * 100:.0f}%)"
 
             # 세션에 추가
-            self._add_to_session(puzzle_info, success=True)
-
-            # 세션 상태 확인
-            session_id = puzzle_info['session_id']
-            session = self.game_sessions[session_id]
+            self._add_to_session(session, puzzle_info, success=True)
 
             response = {
                 'passed': True,
@@ -267,23 +341,22 @@ class SentencePuzzleGame:
                 'feedback': feedback,
                 'user_sentence': user_answer,
                 'original_sentence': original_sentence,
-                'session_progress': f"{session['total_puzzles']}/10",
-                'session_complete': session['total_puzzles'] >= 10
+                'session_progress': f"{session.total_puzzles}/10",
+                'session_complete': session.total_puzzles >= 10
             }
 
-            # 10문제 완료시 DB 저장
-            if session['total_puzzles'] >= 10:
-                self._save_session_to_db(session_id)
-                response['final_score'] = session['total_score']
+            # 10문제 완료 (DB 저장은 세션 저장 후 _commit_session에서)
+            if session.total_puzzles >= 10:
+                response['final_score'] = session.total_score
                 response[
-                    'final_message'] = f"10문제 완료! 총점: {session['total_score']} (맞춘 문제: {session['puzzles_solved']}개)"
+                    'final_message'] = f"10문제 완료! 총점: {session.total_score} (맞춘 문제: {session.puzzles_solved}개)"
 
             return response
         else:
-            if position_similarity < 0.95:
-                feedback = f"단어 위치가 많이 다릅니다. (위치 일치도: {position_similarity * 100:.0f}%) (시도: {puzzle_info['attempts']}/{puzzle_info['max_attempts']})"
+            if position_similarity < POSITION_THRESHOLD:
+                feedback = f"단어 위치가 많이 다릅니다. (위치 일치도: {position_similarity * 100:.0f}%) (시도: {puzzle_info.attempts}/{puzzle_info.max_attempts})"
             else:
-                feedback = f"단어 순서를 다시 확인해보세요. (순서 일치도: {sequence_similarity * 100:.0f}%) (시도: {puzzle_info['attempts']}/{puzzle_info['max_attempts']})"
+                feedback = f"단어 순서를 다시 확인해보세요. (순서 일치도: {sequence_similarity * 100:.0f}%) (시도: {puzzle_info.attempts}/{puzzle_info.max_attempts})"
 
             return {
                 'passed': False,
@@ -291,85 +364,79 @@ class SentencePuzzleGame:
                 'exact_match': False,
                 'message': feedback,
                 'user_sentence': user_answer,
-                'original_sentence': original_sentence if puzzle_info['attempts'] >= 2 else None
+                'original_sentence': original_sentence if puzzle_info.attempts >= 2 else None
             }
 
-    def _add_to_session(self, puzzle_info: Dict[str, Any], success: bool):
+    def _add_to_session(self, session: PuzzleSessionState, puzzle_info: PuzzleState, success: bool):
         """세션에 퍼즐 결과 추가 (성공/실패 모두 포함)"""
-        session_id = puzzle_info['session_id']
-        if session_id not in self.game_sessions:
-            return
-
-        session = self.game_sessions[session_id]
-
         # 총 시도 문제 수 증가
-        session['total_puzzles'] += 1
+        session.total_puzzles += 1
 
         # 성공한 경우에만 점수 추가 및 맞춘 문제 수 증가
         if success:
-            session['puzzles_solved'] += 1
-            session['total_score'] += puzzle_info['score']
+            session.puzzles_solved += 1
+            session.total_score += puzzle_info.score
 
         # 현재 난이도 업데이트
-        session['current_age'] = puzzle_info['age']
+        session.current_age = puzzle_info.age
 
-    def _save_session_to_db(self, session_id: str):
+        # 10문제 완료
+        if session.total_puzzles >= 10:
+            session.completed = True
+
+    def _save_session_to_db(self, session: PuzzleSessionState, seen: str = None):
         """10문제 완료시 DB에 저장"""
-        if session_id not in self.game_sessions:
+        if self.results is None and not self.db:
             return
 
-        session = self.game_sessions[session_id]
+        # word_history에는 최종 난이도, 맞춘 개수, 지금까지 받은 문장 비트맵 저장
+        word_history = {
+            'final_difficulty': session.current_age,  # 마지막 문제의 난이도
+            'puzzles_solved': session.puzzles_solved,  # 실제로 맞춘 문제 수
+            'seen': seen  # 다음 세션에서 이미 푼 문장을 빼고 출제 (SeenSentences.dumps)
+        }
 
-        if not self.db or session['completed']:
+        if self.results is not None:
+            self.results.enqueue(session.user_id, 'sentence_completion', str(session.initial_age),
+                                 round(session.total_score / 10), word_history)
             return
 
         try:
-            # word_history에는 최종 난이도와 맞춘 개수만 저장
-            word_history = {
-                'final_difficulty': session['current_age'],  # 마지막 문제의 난이도
-                'puzzles_solved': session['puzzles_solved']  # 실제로 맞춘 문제 수
-            }
-
             user_game = UserGames(
-                user_id=session['user_id'],
+                user_id=session.user_id,
                 game_type='sentence_completion',
-                difficulty=str(session['initial_age']),  # 시작 난이도
-                score=round(session['total_score'] / 10),  # 총점
+                difficulty=str(session.initial_age),  # 시작 난이도
+                score=round(session.total_score / 10),  # 총점
                 word_history=word_history
             )
             self.db.add(user_game)
             self.db.commit()
 
-            session['completed'] = True
             print(
-                f"✅ 10문제 세션 결과 저장 완료 (user_id={session['user_id']}, 맞춘 문제: {session['puzzles_solved']}/10, 총점: {session['total_score']})")
+                f"✅ 10문제 세션 결과 저장 완료 (user_id={session.user_id}, 맞춘 문제: {session.puzzles_solved}/10, 총점: {session.total_score})")
 
         except Exception as e:
             self.db.rollback()
             print(f"❌ 세션 결과 저장 실패: {e}")
 
-    def get_hint(self, puzzle_id: str) -> Dict[str, Any]:
+    async def get_hint(self, puzzle_id: str) -> Dict[str, Any]:
         """힌트 제공"""
-        if puzzle_id not in self.storage:
-            raise ValueError(f"퍼즐을 찾을 수 없습니다: {puzzle_id}")
-
-        puzzle_info = self.storage[puzzle_id]
+        session, puzzle_info, version = await self._load_puzzle(puzzle_id)
 
-        if puzzle_info['processed']:
+        if puzzle_info.processed:
             return {
                 'hints': [{
                     'type': 'already_processed',
                     'message': '이미 처리된 퍼즐입니다.'
                 }],
-                'hints_used': puzzle_info['hints_used'],
+                'hints_used': puzzle_info.hints_used,
                 'max_hints': 3
             }
 
-        original_sentence = puzzle_info['original_sentence']
-        original_words = original_sentence.strip().split()
+        original_words = self._original_words(puzzle_info)
 
         max_hints = 3
-        hints_used = puzzle_info['hints_used']
+        hints_used = puzzle_info.hints_used
 
         if hints_used >= max_hints:
             return {
@@ -400,64 +467,64 @@ class SentencePuzzleGame:
                 'message': f"{mid_index + 1}번째 단어는 '{original_words[mid_index]}'입니다."
             })
 
-        puzzle_info['hints_used'] += 1
+        puzzle_info.hints_used += 1
+        await self.sessions.commit(self._session_key(session.session_id), session, version, ttl=self._remaining_ttl(session))
 
         return {
             'hints': hints,
-            'hints_used': puzzle_info['hints_used'],
+            'hints_used': puzzle_info.hints_used,
             'max_hints': max_hints
         }
 
-    def skip_puzzle(self, puzzle_id: str) -> Dict[str, Any]:
+    async def skip_puzzle(self, puzzle_id: str, user_id: int = None) -> Dict[str, Any]:
         """현재 문제 건너뛰기 (0점 처리)"""
-        if puzzle_id not in self.storage:
+        session, puzzle_info, version = await self._load_puzzle(puzzle_id)
+        if user_id is not None and session.user_id != user_id:
             raise ValueError(f"퍼즐을 찾을 수 없습니다: {puzzle_id}")
+        was_completed = session.completed
 
-        puzzle_info = self.storage[puzzle_id]
-
-        if puzzle_info['processed']:
+        if puzzle_info.processed:
             return {
                 'message': '이미 처리된 퍼즐입니다.',
                 'session_progress': None
             }
 
         # 건너뛴 문제는 0점 처리
-        puzzle_info['processed'] = True
-        puzzle_info['solved'] = False
-        puzzle_info['score'] = 0
+        puzzle_info.processed = True
+        puzzle_info.solved = False
+        puzzle_info.score = 0
 
         # 세션에 추가 (실패로 처리)
-        self._add_to_session(puzzle_info, success=False)
-
-        session_id = puzzle_info['session_id']
-        session = self.game_sessions[session_id]
+        self._add_to_session(session, puzzle_info, success=False)
 
         response = {
             'message': '문제를 건너뛰었습니다.',
-            'original_sentence': puzzle_info['original_sentence'],
-            'session_progress': f"{session['total_puzzles']}/10",
-            'session_complete': session['total_puzzles'] >= 10
+            'original_sentence': puzzle_info.original_sentence,
+            'session_progress': f"{session.total_puzzles}/10",
+            'session_complete': session.total_puzzles >= 10
         }
 
-        # 10문제 완료시 DB 저장
-        if session['total_puzzles'] >= 10:
-            self._save_session_to_db(session_id)
-            response['final_score'] = session['total_score']
-            response['final_message'] = f"10문제 완료! 총점: {session['total_score']} (맞춘 문제: {session['puzzles_solved']}개)"
+        # 10문제 완료 (DB 저장은 세션 저장 후 _commit_session에서)
+        if session.total_puzzles >= 10:
+            response['final_score'] = session.total_score
+            response['final_message'] = f"10문제 완료! 총점: {session.total_score} (맞춘 문제: {session.puzzles_solved}개)"
 
+        await self._commit_session(session, version, was_completed)
         return response
 
-    def get_user_session_status(self, user_id: int) -> Dict[str, Any]:
+    async def get_user_session_status(self, user_id: int) -> Dict[str, Any]:
         """사용자의 현재 세션 상태"""
-        for session_id, session in self.game_sessions.items():
-            if session['user_id'] == user_id and not session['completed']:
+        session_id, _ = await self.sessions.load(self._user_key(user_id))
+        if session_id:
+            session, _ = await self.sessions.load(self._session_key(session_id))
+            if session is not None and not session.completed:
                 return {
                     'in_progress': True,
-                    'total_puzzles': session['total_puzzles'],
-                    'puzzles_solved': session['puzzles_solved'],
-                    'current_score': session['total_score'],
-                    'initial_age': session['initial_age'],
-                    'current_age': session['current_age']
+                    'total_puzzles': session.total_puzzles,
+                    'puzzles_solved': session.puzzles_solved,
+                    'current_score': session.total_score,
+                    'initial_age': session.initial_age,
+                    'current_age': session.current_age
                 }
 
         return {
@@ -465,76 +532,31 @@ class SentencePuzzleGame:
             'message': '진행 중인 게임이 없습니다.'
         }
 
-    def cleanup_old_sessions(self, hours: int = 24):
-        """오래된 세션 정리"""
-        cutoff_time = datetime.now() - timedelta(hours=hours)
-
-        # 오래된 퍼즐 삭제
-        puzzles_to_remove = [
-            puzzle_id for puzzle_id, info in self.storage.items()
-            if info['created_at'] < cutoff_time
-        ]
-
-        for puzzle_id in puzzles_to_remove:
-            del self.storage[puzzle_id]
-
-        # 오래된 세션 삭제
-        sessions_to_remove = [
-            session_id for session_id, session in self.game_sessions.items()
-            if session['started_at'] < cutoff_time
-        ]
+    # Helper 메서드들 (채점 함수는 puzzle_scoring에 있음, 일괄 채점과 같은 함수 사용)
+    def _original_words(self, puzzle_info: PuzzleState) -> List[str]:
+        """정답 문장의 단어 목록 (말뭉치에 미리 토큰화된 값, 말뭉치가 바뀌어 문장이 다르면 직접 분리)"""
+        if (puzzle_info.sentence_id is not None and self.puzzle_generator and
+                puzzle_info.sentence_id < self.puzzle_generator.corpus.num_sentences()):
+            info = self.puzzle_generator.sentence_info(puzzle_info.sentence_id)
+            if info['original_sentence'] == puzzle_info.original_sentence:
+                return info['words']
+        return puzzle_info.original_sentence.strip().split()
 
-        for session_id in sessions_to_remove:
-            del self.game_sessions[session_id]
-
-        if puzzles_to_remove or sessions_to_remove:
-            print(f"✅ {len(puzzles_to_remove)}개 퍼즐, {len(sessions_to_remove)}개 세션 정리")
-
-    # Helper 메서드들
     def _check_sentence_ending(self, original_words: List[str], user_words: List[str]) -> bool:
         """문장 끝맺음 체크"""
-        if len(original_words) == 0 or len(user_words) == 0:
-            return False
-
-        if original_words[-1] != user_words[-1]:
-            return False
-
-        if len(original_words) >= 2 and len(user_words) >= 2:
-            if original_words[-2] != user_words[-2]:
-                return False
-
-        return True
+        return check_sentence_ending(original_words, user_words)
 
     def _calculate_position_similarity(self, original_words: List[str], user_words: List[str]) -> float:
         """위치 기반 유사도 계산"""
-        if len(original_words) != len(user_words):
-            return 0.0
-
-        correct_positions = sum(1 for i, word in enumerate(original_words)
-                                if i < len(user_words) and word == user_words[i])
-
-        return correct_positions / len(original_words)
+        return position_similarity(original_words, user_words)
 
     def _calculate_sequence_similarity(self, original_words: List[str], user_words: List[str]) -> float:
-        """순서 기반 유사도 계산 (LCS)"""
-        if len(original_words) != len(user_words):
-            return 0.0
-
-        m, n = len(original_words), len(user_words)
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if original_words[i - 1] == user_words[j - 1]:
-                    dp[i][j] = dp[i - 1][j - 1] + 1
-                else:
-                    dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
-
-        lcs_length = dp[m][n]
-        return lcs_length / len(original_words)
+        """순서 기반 유사도 계산 (LCS, 비트 병렬)"""
+        return sequence_similarity(original_words, user_words)
 
     def get_puzzle_count(self) -> int:
-        return len(self.storage)
+        """출제할 수 있는 문장 수 (퍼즐 상태는 세션 저장소에 있음)"""
+        return len(self.puzzle_generator.train_sentences) if self.puzzle_generator else 0
 
     def is_ready(self) -> bool:
         return self.puzzle_generator is not None
\ No newline at end of file
@@ -0,0 +1,202 @@
+# game/session_backend.py (게임 세션 저장소 - 메모리 / Redis 공용 인터페이스)
+# pip install redis  (Redis 백엔드를 쓸 때만 필요)
+import os, json, asyncio
+from typing import Any, Optional, Tuple
+
+from .game_store import GameStore, SlotRecord, RECORD_TYPES
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+
+class SessionConflict(Exception):
+    """같은 세션을 다른 요청(다른 워커)이 먼저 갱신함 (낙관적 동시성 충돌)"""
+
+
+def encode_record(value: Any) -> bytes:
+    """
+    상태 레코드 → bytes
+
+    필드 이름 없이 [tag, 필드1, 필드2, ...] 형태의 JSON 리스트로 저장
+    레코드가 아닌 값(사용자 → 세션 ID 등)은 ['', 값]
+    """
+    if isinstance(value, SlotRecord):
+        payload = [value.tag, *value.to_list()]
+    else:
+        payload = ['', value]
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def decode_record(data: bytes) -> Any:
+    tag, *values = json.loads(data)
+    if not tag:
+        return values[0]
+    return RECORD_TYPES[tag].from_list(values)
+
+
+class SessionBackend:
+    """
+    게임 세션 저장소 인터페이스
+
+    - load(key) → (값, 버전), 없으면 (None, 0)
+    - save(key, 값, 버전) → 저장된 버전이 그대로일 때만 저장 (compare-and-set), 성공 여부 반환
+    - 게임 코드는 load → 상태 변경 → commit 순서로 사용하고, commit이 실패하면 SessionConflict
+    - 메모리 백엔드도 bytes로 저장하므로 load한 객체를 고쳐도 commit 전에는 저장소에 반영되지 않음
+    - start_sweeper()로 만료 세션을 주기적으로 정리 (Redis는 키 만료가 알아서 처리)
+    """
+
+    _sweeper: Optional[asyncio.Task] = None
+
+    async def load(self, key: str) -> Tuple[Any, int]:
+        raise NotImplementedError
+
+    async def save(self, key: str, value: Any, version: int, ttl: float = None) -> bool:
+        raise NotImplementedError
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+    async def commit(self, key: str, value: Any, version: int, ttl: float = None):
+        if not await self.save(key, value, version, ttl=ttl):
+            raise SessionConflict(key)
+
+    async def count(self) -> Optional[int]:
+        """저장된 세션 수 (알 수 없으면 None)"""
+        return None
+
+    async def purge_expired(self) -> int:
+        return 0
+
+    async def _sweep(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                removed = await self.purge_expired()
+            except Exception as e:
+                print(f"❌ 만료 세션 정리 실패: {e}")
+                continue
+            if removed:
+                print(f"🧹 만료 세션 {removed}개 정리")
+
+    def start_sweeper(self, interval: float = 60):
+        """만료 세션 정리 작업 시작 (이벤트 루프 안에서 호출)"""
+        if self._sweeper is not None:
+            return
+        self._sweeper = asyncio.create_task(self._sweep(interval))
+
+    async def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+    async def aclose(self):
+        pass
+
+
+class MemorySessionBackend(SessionBackend):
+    """
+    프로세스 메모리 저장소 (워커 1개일 때, GameStore의 TTL/LRU 사용)
+
+    Redis와 같게 만료 시간은 저장할 때만 갱신 (load로는 연장되지 않음)
+    """
+
+    def __init__(self, ttl_seconds: float = 1800, max_games: int = 10000, name: str = 'games'):
+        self.store = GameStore(ttl_seconds=ttl_seconds, max_games=max_games, name=name, sliding=False)
+
+    async def load(self, key: str) -> Tuple[Any, int]:
+        item = self.store.get(key)
+        if item is None:
+            return None, 0
+        version, data = item
+        return decode_record(data), version
+
+    async def save(self, key: str, value: Any, version: int, ttl: float = None) -> bool:
+        item = self.store.get(key)
+        current = item[0] if item is not None else 0
+        if current != version:
+            return False
+        self.store.put(key, (current + 1, encode_record(value)), ttl=ttl)
+        return True
+
+    async def delete(self, key: str):
+        self.store.delete(key)
+
+    async def count(self) -> Optional[int]:
+        return len(self.store)
+
+    async def purge_expired(self) -> int:
+        return self.store.purge_expired()
+
+    def stats(self) -> dict:
+        return self.store.stats()
+
+
+# 버전이 같을 때만 저장하고 만료 시간 갱신 (한 번의 왕복으로 compare-and-set)
+_CAS_SCRIPT = """
+local current = tonumber(redis.call('HGET', KEYS[1], 'v') or '0')
+if current ~= tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'v', current + 1, 'd', ARGV[2])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return current + 1
+"""
+
+
+class RedisSessionBackend(SessionBackend):
+    """
+    Redis 프로토콜 저장소 (uvicorn/gunicorn 워커 여러 개가 세션을 공유)
+
+    키마다 해시 {v: 버전, d: 레코드}를 저장하고, 저장은 Lua 스크립트로 버전 비교 후 갱신
+    client를 주입하면 그대로 사용 (로컬 테스트용 가짜 Redis 서버 등, tests/test_session_backend.py)
+    """
+
+    def __init__(self, url: str = None, ttl_seconds: float = 1800, prefix: str = 'sst:', client=None):
+        if client is None:
+            if aioredis is None:
+                raise ImportError("Redis 세션 백엔드를 쓰려면 redis 패키지가 필요합니다 (pip install redis)")
+            client = aioredis.from_url(url, decode_responses=False)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._cas = client.register_script(_CAS_SCRIPT)
+
+    async def load(self, key: str) -> Tuple[Any, int]:
+        version, data = await self.client.hmget(self.prefix + key, 'v', 'd')
+        if data is None:
+            return None, 0
+        return decode_record(data), int(version)
+
+    async def save(self, key: str, value: Any, version: int, ttl: float = None) -> bool:
+        ttl = self.ttl_seconds if ttl is None else ttl
+        new_version = await self._cas(keys=[self.prefix + key],
+                                      args=[version, encode_record(value), int(ttl * 1000)])
+        return bool(new_version)
+
+    async def delete(self, key: str):
+        await self.client.delete(self.prefix + key)
+
+    def start_sweeper(self, interval: float = 60):
+        # Redis가 키 만료를 직접 처리하므로 정리 작업이 필요 없음
+        pass
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+def create_session_backend() -> Optional[SessionBackend]:
+    """
+    환경 변수 SESSION_REDIS_URL이 있으면 세 게임이 공유할 Redis 백엔드 생성
+    없으면 None → 각 게임이 자기 메모리 백엔드 사용 (워커 1개 전용)
+    """
+    url = os.getenv("SESSION_REDIS_URL")
+    if not url:
+        return None
+    print(f"✅ 게임 세션 저장소: Redis ({url.split('@')[-1]})")
+    return RedisSessionBackend(url)
@@ -1,7 +1,9 @@
-import random, re, pickle,os
-from torch import cuda
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import random, pickle, os, time
+import numpy as np
+from .puzzle_corpus import PuzzleCorpus, SUMMARY, split_into_sentences
+from .puzzle_embeddings import AnswerEncoder
+# torch / sentence_transformers는 임베딩 모델이 처음 필요할 때 import (퍼즐 출제/채점에는 쓰지 않음)
+
 
 class FairytalePuzzleGenerator:
     def __init__(self, data_path='/data/pickle/processed_sentences.pkl',
@@ -10,56 +12,112 @@ class FairytalePuzzleGenerator:
         self.data_path = data_path
         self.model_name = model_name
         self.device = device
-        # 디바이스 설정
-        self.device = 'cuda' if cuda.is_available() else 'cpu'
-        print(f"사용 디바이스: {self.device}")
-
-        # 데이터 로드
-        with open(data_path, 'rb') as f:
-            data = pickle.load(f)
-            self.train_sentences = data['train']
-            self.thresholds = data.get('thresholds', {})
+        self._model = None
+        # 답안 임베딩 (동시 요청 묶음 처리 + 최근 답안 LRU)
+        self.answer_encoder = AnswerEncoder(self._encode_batch)
 
-        # 임베딩 모델 로드
-        print("임베딩 모델 로드 중...")
-        self.model = SentenceTransformer(model_name, device=self.device)
-        print("✓ 모델 로드 완료!")
+        # 데이터 로드 (열 단위 말뭉치, train_sentences[i]는 기존 pickle 항목과 같은 dict)
+        self.corpus = self._load_corpus(data_path)
+        self.train_sentences = self.corpus
+        self.thresholds = self.corpus.thresholds
 
         # 나이별로 문장 그룹화
         self._group_by_age()
 
+    @property
+    def model(self):
+        """임베딩 모델 (처음 사용할 때 로드 - 워커마다 수백 MB, 수 초가 걸림)"""
+        if self._model is None:
+            from torch import cuda
+            from sentence_transformers import SentenceTransformer
+
+            # 디바이스 설정
+            if self.device is None:
+                self.device = 'cuda' if cuda.is_available() else 'cpu'
+            print(f"사용 디바이스: {self.device}")
+
+            print("임베딩 모델 로드 중...")
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+            print("✓ 모델 로드 완료!")
+        return self._model
+
+    def _encode_batch(self, texts):
+        return self.model.encode(list(texts), batch_size=len(texts), normalize_embeddings=True,
+                                 convert_to_numpy=True)
+
+    @staticmethod
+    def _load_corpus(data_path):
+        """
+        변환해 둔 .corpus 파일이 있으면 mmap으로 열고 (워커끼리 페이지 공유, 문장 분리도 이미 되어 있음)
+        없거나 pickle보다 오래됐으면 pickle을 읽어 메모리에서 변환
+        """
+        start = time.perf_counter()
+        corpus_path = os.path.splitext(data_path)[0] + '.corpus'
+        corpus = None
+        if os.path.exists(corpus_path) and (not os.path.exists(data_path) or
+                                            os.path.getmtime(corpus_path) >= os.path.getmtime(data_path)):
+            try:
+                corpus = PuzzleCorpus.load(corpus_path)
+                source = corpus_path
+            except ValueError as e:
+                # 이전 버전 형식 → pickle에서 다시 만듦
+                print(f"⚠️ {corpus_path}: {e}")
+        if corpus is None:
+            print(f"⚠️ {corpus_path} 파일이 없거나 이전 형식이라 pickle을 변환합니다 (python -m app.games.puzzle_corpus 로 미리 변환 권장)")
+            with open(data_path, 'rb') as f:
+                data = pickle.load(f)
+            corpus = PuzzleCorpus.build(data['train'], thresholds=data.get('thresholds', {}))
+            source = data_path
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✓ 퍼즐 말뭉치 로드 완료: {source} ({len(corpus)}개 항목, {elapsed:.0f}ms)")
+        return corpus
+
     def _group_by_age(self):
-        self.sentences_by_age = {}
-        for sent in self.train_sentences:
-            age = sent.get('age')
-            if age:
-                if age not in self.sentences_by_age:
-                    self.sentences_by_age[age] = []
-                self.sentences_by_age[age].append(sent)
+        # 나이 → train_sentences 번호 배열
+        self.sentences_by_age = {age: np.flatnonzero(self.corpus.age == age) for age in self.corpus.ages()}
 
         print(f"\n나이별 문장 수:")
         for age in sorted(self.sentences_by_age.keys()):
             print(f"  {age}세: {len(self.sentences_by_age[age])}개")
 
+        self._build_sentence_index()
+
+    def _build_sentence_index(self):
+        """
+        (나이, 단어 수)별 문장 구간 (문장은 말뭉치를 만들 때 한 번만 분리, (나이, 단어 수) 순으로 정렬됨)
+        - sentence_index[(age, word_count)]: 말뭉치 문장 번호 구간 (start, end)
+        - puzzle_pools[age]: 나이별 단어 수 범위에 맞는 문장 구간 (퍼즐 출제 시 randrange 한 번)
+        - summary_pools[age]: 범위에 맞는 문장이 없을 때 쓰는 요약문 구간 (요약문도 말뭉치의 문장 ID를 가짐)
+        """
+        self.sentence_index = self.corpus.buckets
+        self.summary_pools = {age: self.corpus.summary_range(age) for age in self.sentences_by_age}
+
+        self.puzzle_pools = {}
+        for age in self.sentences_by_age:
+            min_words, max_words = self._word_range(age)
+            ranges = [self.corpus.bucket(age, word_count) for word_count in range(min_words, max_words + 1)]
+            ranges = [r for r in ranges if r[1] > r[0]]
+            # 같은 나이의 단어 수 구간은 연속이므로 처음 시작 ~ 마지막 끝
+            self.puzzle_pools[age] = (ranges[0][0], ranges[-1][1]) if ranges else (0, 0)
+
+        print(f"✓ 퍼즐 문장 인덱스: {sum(end - start for start, end in self.puzzle_pools.values())}개 문장")
+
+    @staticmethod
+    def _word_range(age):
+        """나이별 퍼즐 단어 수 범위"""
+        if age <= 6:
+            return 3, 6
+        elif age <= 10:
+            return 6, 12
+        else:
+            return 10, 18
+
     def _split_into_sentences(self, text):
+        return split_into_sentences(text)
 
-        # 1. 명확한 문장 종결 패턴으로 분리
-        # 마침표/느낌표/물음표 + 공백 + 대문자 or 따옴표
-        sentences = re.split(r'(?<=[.!?"])\s+(?=[A-Z가-힣"\'])', text)
-
-        # 2. 각 문장 정제
-        clean_sentences = []
-        for sent in sentences:
-            sent = sent.strip()
-            if not sent:
-                continue
-            # 따옴표로 시작하지 않고 끝에 마침표가 없으면 추가
-            if sent and sent[-1] not in '.!?"':
-                sent += '.'
-            clean_sentences.append(sent)
-        return clean_sentences
-
-    def generate_puzzle(self, age=None, difficulty='medium'):
+    def generate_puzzle(self, age=None, difficulty='medium', sentence_id=None):
+        """퍼즐 생성 (sentence_id를 주면 그 문장으로, 없으면 나이별 풀에서 무작위)"""
         # 나이 선택
         if age is None:
             age = random.choice(list(self.sentences_by_age.keys()))
@@ -67,75 +125,64 @@ class FairytalePuzzleGenerator:
         if age not in self.sentences_by_age:
             raise ValueError(f"{age}세 데이터가 없습니다.")
 
-        # 나이와 난이도별 단어 수 범위 조정
-        if age <= 6:
-            min_words, max_words = 3, 6
-        elif age <= 10:
-            min_words, max_words = 6, 12
+        if sentence_id is None:
+            sentence_id = self._random_sentence(age)
+            if sentence_id is None:
+                return None
+
+        info = self.sentence_info(sentence_id)
+        pieces = [
+            {'id': i, 'word': word, 'position': i}
+            for i, word in enumerate(info['words'])
+        ]
+        shuffled_pieces = pieces.copy()
+        random.shuffle(shuffled_pieces)
+
+        sentence_data = self.train_sentences[info['story']]
+        if self.corpus.sentence_kind[sentence_id] == SUMMARY:
+            metadata = sentence_data.get('metadata', {})
         else:
-            min_words, max_words = 10, 18
-
-        # 여러 시도
-        for _ in range(100):
-            sentence_data = random.choice(self.sentences_by_age[age])
-            full_text = sentence_data['text']
-
-            # 문장 분리
-            sentences = self._split_into_sentences(full_text)
-
-            # 조건에 맞는 단일 문장 찾기
-            for sent in sentences:
-                words = sent.split()
-                word_count = len(words)
-
-                if min_words <= word_count <= max_words:
-                    pieces = [
-                        {'id': i, 'word': word, 'position': i}
-                        for i, word in enumerate(words)
-                    ]
-                    shuffled_pieces = pieces.copy()
-                    random.shuffle(shuffled_pieces)
-
-                    return {
-                        'puzzle_id': hash(sent),
-                        'age': age,
-                        'original_sentence': sent,
-                        'pieces': shuffled_pieces,
-                        'word_count': word_count,
-                        'title': sentence_data.get('title', ''),
-                        'metadata': {
-                            'type': sentence_data.get('type', ''),
-                            'form': sentence_data.get('form', ''),
-                        }
-                    }
-
-        # 못 찾은 경우: type이 'summary'인 것 중에서 찾기 (요약문은 더 짧음)
-        summary_sentences = [s for s in self.sentences_by_age[age] if s.get('type') == 'summary']
-        if summary_sentences:
-            sentence_data = random.choice(summary_sentences)
-            sent = sentence_data['text'].strip()
-            if not sent[-1] in '.!?"':
-                sent += '.'
-
-            words = sent.split()
-            pieces = [
-                {'id': i, 'word': word, 'position': i}
-                for i, word in enumerate(words)
-            ]
-            shuffled_pieces = pieces.copy()
-            random.shuffle(shuffled_pieces)
-
-            return {
-                'puzzle_id': hash(sent),
-                'age': age,
-                'original_sentence': sent,
-                'pieces': shuffled_pieces,
-                'word_count': len(words),
-                'title': sentence_data.get('title', ''),
-                'metadata': sentence_data.get('metadata', {})
+            metadata = {
+                'type': sentence_data.get('type', ''),
+                'form': sentence_data.get('form', ''),
             }
+
+        return {
+            'puzzle_id': sentence_id,
+            'sentence_id': sentence_id,
+            'age': age,
+            'original_sentence': info['original_sentence'],
+            'pieces': shuffled_pieces,
+            'word_count': info['word_count'],
+            'title': sentence_data.get('title', ''),
+            'metadata': metadata
+        }
+
+    def _random_sentence(self, age):
+        # 나이별 단어 수 범위에 맞는 문장 중 하나 (로드 시 미리 분리해 둔 풀에서 선택)
+        # 못 찾은 경우: type이 'summary'인 요약문 전체 중에서 찾기 (요약문은 더 짧음)
+        for start, end in (self.puzzle_pools.get(age, (0, 0)), self.summary_pools.get(age, (0, 0))):
+            if end > start:
+                return random.randrange(start, end)
         return None
 
+    def sentence_info(self, sentence_id: int) -> dict:
+        """
+        문장 ID(말뭉치의 문장 번호) → 채점/힌트용 정보 (말뭉치에 미리 토큰화해 둔 값)
+
+        - words: 퍼즐 조각이 되는 단어 목록, word_count
+        - ending: 끝맺음 확인에 쓰는 마지막 두 단어
+        """
+        words = self.corpus.sentence_words(sentence_id)
+        return {
+            'sentence_id': sentence_id,
+            'original_sentence': self.corpus.sentence(sentence_id),
+            'words': words,
+            'word_count': len(words),
+            'ending': words[-2:],
+            'story': int(self.corpus.sentence_story[sentence_id]),
+        }
+
     def calculate_similarity(self, sentence1: str, sentence2: str) -> float:
         """
         두 문장 간 의미적 유사도 계산
@@ -148,14 +195,9 @@ class FairytalePuzzleGenerator:
             코사인 유사도 (0~1 사이의 값)
         """
         try:
-            # 임베딩 계산
-            emb1 = self.model.encode(sentence1)
-            emb2 = self.model.encode(sentence2)
-
-            # 코사인 유사도 계산
-            similarity = cosine_similarity([emb1], [emb2])[0][0]
-
-            return float(similarity)
+            # 캐시에 없는 문장만 모델 호출 한 번으로 계산 (정규화된 벡터라 내적 = 코사인 유사도)
+            emb1, emb2 = self.answer_encoder.encode_many([sentence1, sentence2])
+            return float(np.dot(emb1, emb2))
         except Exception as e:
             print(f"❌ 유사도 계산 오류: {e}")
-            return 0.0
\ No newline at end of file
+            return 0.0
@@ -1,19 +1,42 @@
-import requests
 import random
-from typing import Optional, Dict, Any
+from typing import Optional, Any
 from sqlalchemy.orm import Session
-import xml.etree.ElementTree as ET
 from models import UserGames
+from .krdict_client import KrdictClient
+from .game_store import WordChainState
+from .session_backend import SessionBackend, MemorySessionBackend
+from .game_result_writer import GameResultWriter
+from .word_lexicon import WordLexicon
+from .word_chain_index import WordChainIndex, DUEUM_RULES, check_dueum, check_chisa
+from .word_chain_strategy import WordChainStrategy
 
 
 class WordChainGame:
-    def __init__(self, api_key: str, db: Session = None):
+    def __init__(self, api_key: str, db: Session = None, lexicon: WordLexicon = None, use_api_fallback: bool = True,
+                 krdict: KrdictClient = None, sessions: SessionBackend = None, results: GameResultWriter = None):
         self.api_key = api_key
-        self.base_url = f'https://krdict.korean.go.kr/api/search?key={self.api_key}'
+        # InitialQuizGame과 같은 커넥션 풀을 쓰도록 main.py에서 주입
+        self.krdict = krdict if krdict is not None else KrdictClient(api_key)
         self.blacklist = ['즘', '틱', '늄', '슘', '퓸', '늬', '뺌', '섯', '숍', '튼', '름', '늠', '쁨']
 
-        self.games: Dict[str, Dict[str, Any]] = {}
+        # 게임 상태 저장소 (기본: 프로세스 메모리, 워커가 여러 개면 main.py에서 Redis 백엔드 주입)
+        self.sessions = sessions if sessions is not None else MemorySessionBackend(name='word_chain')
+        self.session_ttl = 1800  # 30분 동안 진행이 없으면 만료
         self.db = db
+        # 있으면 결과를 모아서 저장 (없으면 self.db로 바로 저장)
+        self.results = results
+
+        # 오프라인 명사 사전 (없거나 비어 있으면 krdict API만 사용)
+        self.lexicon = lexicon if lexicon is not None else WordLexicon()
+        # 사전에 없는 단어만 krdict로 확인
+        self.use_api_fallback = use_api_fallback
+        # 끝 글자 → 후보 단어 (두음법칙/경음화 확장 포함)
+        self.chain_index = WordChainIndex(
+            w for w in self.lexicon.entries if self._is_candidate(w, set())
+        )
+
+        # 글자 그래프 기반 컴퓨터 전략 (후보 정렬/killer 글자 모두 시작 시 계산)
+        self.strategy = WordChainStrategy(self.chain_index) if len(self.chain_index) else None
 
         # 난이도별 설정
         self.mistake_rates = {
@@ -21,13 +44,23 @@ class WordChainGame:
             "medium": 0.8,  # 80% 확률로 쉬운 단어
             "hard": 0.7  # 70% 확률로 쉬운 단어
         }
+        # 전략 엔진: 상대가 이어가기 쉬운 단어를 고를 확률 (mistake_rates는 사전이 없을 때의 기존 선택에만 사용)
+        self.kind_rates = {
+            "easy": 0.9,
+            "medium": 0.6,
+            "hard": 0.2
+        }
+        # 상대가 이어가기 어려운 단어(함정)를 고를 확률
+        self.trap_rates = {
+            "easy": 0.0,
+            "medium": 0.2,
+            "hard": 0.7
+        }
 
-    def create_game(self, game_id: str, difficulty: str = 'medium') -> dict:
+    async def create_game(self, game_id: str, difficulty: str = 'medium', user_id: int = None) -> dict:
         """새 게임 생성"""
 
-        if game_id in self.games:
-            del self.games[game_id]
-            print(f"🗑️ 기존 게임 {game_id} 삭제")
+        await self.sessions.delete(self._key(game_id))
 
         computer_starts = random.choice([True, False])
 
@@ -36,9 +69,9 @@ class WordChainGame:
         message = "게임을 시작합니다!"
 
         if computer_starts:
-            first_word = self._get_random_word()
+            first_word = await self._get_random_word()
             if first_word:
-                first_definition = self._get_word_definition(first_word)
+                first_definition = await self._get_word_definition(first_word)
                 message = f"컴퓨터가 '{first_word}'로 시작합니다!"
             else:
                 computer_starts = False
@@ -46,21 +79,16 @@ class WordChainGame:
         else:
             message = "사용자가 먼저 시작합니다!"
 
-        self.games[game_id] = {
-            'game_id': game_id,
-            'difficulty': difficulty,
-            'score': 0,
-            'history': [first_word] if first_word else [],
-            'game_over': False,
-            'user_id': None,
-            'last_word': first_word,  # ✅ sword → last_word
-            'used_words': {first_word} if first_word else set(),
-            'winner': None,
-            'mistake_rate': self.mistake_rates.get(difficulty, 0.8)
-        }
+        await self.sessions.commit(self._key(game_id), WordChainState(
+            game_id,
+            difficulty,
+            first_word=first_word,
+            user_id=user_id,
+            mistake_rate=self.mistake_rates.get(difficulty, 0.8),
+            trap_rate=self.trap_rates.get(difficulty, 0.2)
+        ), version=0, ttl=self.session_ttl)
 
-        print(f"✅ 새 게임 {game_id} 생성 완료 (games에 저장됨)")
-        print(f"🔍 현재 게임 목록: {list(self.games.keys())}")
+        print(f"✅ 새 게임 {game_id} 생성 완료")
 
         return {
             'message': message,
@@ -69,58 +97,66 @@ class WordChainGame:
             'computer_starts': computer_starts
         }
 
-    def make_move(self, game_id: str, word: str, user_id: int = None) -> dict:
+    async def make_move(self, game_id: str, word: str, user_id: int = None) -> dict:
         """사용자의 단어 입력 처리"""
 
-        if game_id not in self.games:
+        key = self._key(game_id)
+        game, version = await self.sessions.load(key)
+        if game is None:
             raise Exception(f"게임 {game_id}를 찾을 수 없습니다")
 
-        game = self.games[game_id]
+        was_over = game.game_over
+        result = await self._play(game, word)
 
-        if game['game_over']:
+        # 상태를 먼저 저장하고(다른 요청이 먼저 갱신했으면 SessionConflict) 게임이 끝났을 때만 DB 기록
+        await self.sessions.commit(key, game, version, ttl=self.session_ttl)
+
+        user_id = user_id or game.user_id
+        if game.game_over and not was_over and user_id:
+            self._save_game_result(game, user_id)
+
+        return result
+
+    async def _play(self, game: WordChainState, word: str) -> dict:
+        """단어 하나를 게임 상태에 반영하고 응답 생성 (저장/DB 기록은 make_move에서)"""
+
+        if game.game_over:
             # 사용자가 패배할 때 입력한 단어도 last_word에 반영
-            game['last_word'] = word
+            game.last_word = word
             return {
                 'success': False,
                 'message': '게임이 이미 종료되었습니다',
                 'game_over': True,
-                'score': game['score'],
+                'score': game.score,
             }
 
-        if not user_id:
-            user_id = game.get('user_id')
-
         # 1. 단어 유효성 검사 → 실패 시 패배
-        if not self._is_valid_word(word):
-            game['game_over'] = True
-            game['winner'] = 'computer'
-
-            if user_id and self.db:
-                self._save_game_result(game_id, user_id, last_word=word)
+        if not await self._is_valid_word(word):
+            game.game_over = True
+            game.winner = 'computer'
+            # 사전에 없는 단어도 기록에 남김 (패배 단어 포함)
+            game.last_word = word
 
             return {
                 'success': False,
                 'message': f"😢 패배! '{word}'는 사전에 없는 단어입니다",
                 'game_over': True,
                 'winner': 'computer',
-                'score': game['score'],
+                'score': game.score,
                 'reason': f"'{word}'는 사전에 없는 단어입니다"
             }
 
         # 2. 이미 사용된 단어인지 확인 → 실패 시 패배
-        if word in game['used_words']:
-            game['game_over'] = True
-            game['winner'] = 'computer'
-
-            if user_id and self.db:
-                self._save_game_result(game_id, user_id)
+        if word in game.used_words:
+            game.game_over = True
+            game.winner = 'computer'
 
             return {
                 'success': False,
                 'message': f"😢 패배! '{word}'는 이미 사용된 단어입니다",
                 'game_over': True,
                 'winner': 'computer',
-                'score': game['score'],
+                'score': game.score,
                 'reason': f"'{word}'는 이미 사용된 단어입니다"
             }
 
@@ -131,8 +167,8 @@ class WordChainGame:
         dueum_message = ""
         chisa_message = ""
 
-        if game['last_word']:
-            last_char = game['last_word'][-1]
+        if game.last_word:
+            last_char = game.last_word[-1]
             first_char = word[0]
 
             # ✅ 두음법칙 체크
@@ -147,48 +183,44 @@ class WordChainGame:
 
             # ✅ 규칙 위반 확인
             if not dueum_applied and not chisa_applied and last_char != first_char:
-                game['game_over'] = True
-                game['winner'] = 'computer'
-
-                if user_id and self.db:
-                    self._save_game_result(game_id, user_id)
+                game.game_over = True
+                game.winner = 'computer'
 
                 return {
                     'success': False,
-                    'message': f"😢 패배! '{game['last_word']}'의 마지막 글자 '{last_char}'로 시작해야 합니다",
+                    'message': f"😢 패배! '{game.last_word}'의 마지막 글자 '{last_char}'로 시작해야 합니다",
                     'game_over': True,
                     'winner': 'computer',
-                    'score': game['score'],
-                    'reason': f"'{game['last_word']}'의 마지막 글자 '{last_char}'로 시작해야 하는데 '{first_char}'로 시작했습니다"
+                    'score': game.score,
+                    'reason': f"'{game.last_word}'의 마지막 글자 '{last_char}'로 시작해야 하는데 '{first_char}'로 시작했습니다"
                 }
 
         # 4. 사용자 단어 처리
-        user_definition = self._get_word_definition(word)
-        game['history'].append(word)
-        game['used_words'].add(word)
-        game['score'] += 10
+        user_definition = await self._get_word_definition(word)
+        game.history.append(word)
+        game.used_words.add(word)
+        game.score += 10
 
         # 5. 컴퓨터 차례
-        computer_result = self._get_computer_word(
+        computer_result = await self._get_computer_word(
             word[-1],
-            game['used_words'],
-            mistake_rate=game['mistake_rate']
+            game.used_words,
+            mistake_rate=game.mistake_rate,
+            trap_rate=game.trap_rate,
+            kind_rate=self.kind_rates.get(game.difficulty, 0.6)
         )
 
         if not computer_result:
             # 컴퓨터가 단어를 찾지 못함 → 사용자 승리
-            game['game_over'] = True
-            game['winner'] = 'user'
-
-            if user_id and self.db:
-                self._save_game_result(game_id, user_id)
+            game.game_over = True
+            game.winner = 'user'
 
             return {
                 'success': True,
                 'message': '🎉 승리! 컴퓨터가 단어를 찾지 못했습니다',
                 'game_over': True,
                 'winner': 'user',
-                'score': game['score'],
+                'score': game.score,
                 'user_word': word,
                 'user_definition': user_definition
             }
@@ -196,15 +228,15 @@ class WordChainGame:
         # 컴퓨터 단어 처리
         computer_word = computer_result["word"]
         computer_definition = computer_result["definition"]
-        game['history'].append(computer_word)
-        game['used_words'].add(computer_word)
-        game['last_word'] = computer_word
+        game.history.append(computer_word)
+        game.used_words.add(computer_word)
+        game.last_word = computer_word
 
         return {
             'success': True,
             'message': '정답입니다!',
             'game_over': False,
-            'score': game['score'],
+            'score': game.score,
             'user_word': word,
             'user_definition': user_definition,
             'computer_word': computer_word,
@@ -222,169 +254,146 @@ class WordChainGame:
         - 랴/려/례/료/류/리 → 야/여/예/요/유/이
         - 라/래/로/뢰/루/르 → 아/애/오/외/우/으
         """
-        dueum_rules = {
-            # ㄴ 두음법칙
-            '녀': ['여'], '뇨': ['요'], '뉴': ['유'], '니': ['이'],
-
-            # ㄹ 두음법칙 (ㄹ 뒤 ㅑ, ㅕ, ㅖ, ㅛ, ㅠ, ㅣ)
-            '랴': ['야'], '려': ['여'], '례': ['예'],
-            '료': ['요'], '류': ['유'], '리': ['이'],
-
-            # ㄹ 두음법칙 (ㄹ 뒤 ㅏ, ㅐ, ㅓ, ㅔ, ㅗ, ㅚ, ㅜ, ㅡ)
-            '라': ['아', '나'], '래': ['애', '내'],
-            '로': ['오', '노'], '뢰': ['외', '뇌'],
-            '루': ['우', '누'], '르': ['으', '느']
-        }
-
-        return first_char in dueum_rules.get(last_char, [])
+        return check_dueum(last_char, first_char)
 
     def _check_chisa(self, last_char: str, first_char: str) -> bool:
         """
         경음화 체크 (받침 ㄱ, ㄷ, ㅂ 뒤에서 ㄱ→ㄲ, ㄷ→ㄸ, ㅂ→ㅃ, ㅅ→ㅆ, ㅈ→ㅉ)
         """
-        try:
-            # 받침 추출
-            last_char_code = ord(last_char) - 0xAC00
-            if last_char_code < 0 or last_char_code > 11172:
-                return False
-
-            jongseong = last_char_code % 28
-
-            # ㄱ, ㄷ, ㅂ 받침 (1, 7, 17)
-            if jongseong not in [1, 7, 17]:
-                return False
-
-            # 첫 자음 추출
-            first_char_code = ord(first_char) - 0xAC00
-            if first_char_code < 0 or first_char_code > 11172:
-                return False
-
-            choseong = first_char_code // 588
-
-            # 경음화 규칙: ㄱ, ㄷ, ㅂ, ㅅ, ㅈ이 경음으로 변할 수 있음
-            # 평음: ㄱ=0, ㄷ=3, ㅂ=9, ㅅ=9, ㅈ=12
-            if choseong in [0, 3, 9, 12]:  # ㄱ, ㄷ, ㅂ, ㅈ
-                return True
+        return check_chisa(last_char, first_char)
 
-            return False
-        except:
-            return False
-
-    def _save_game_result(self, game_id: str, user_id: int, last_word: str = None):
+    def _save_game_result(self, game: WordChainState, user_id: int):
         """게임 결과를 DB에 저장"""
-        if not self.db or game_id not in self.games:
+        if self.results is None and not self.db:
             return
 
-        game = self.games[game_id]
-
-        final_history = game['history'][:]
+        final_history = game.history[:]
 
         # 마지막 단어를 반영 (패배 단어 포함)
-        if last_word and (not final_history or final_history[-1] != last_word):
-            final_history.append(last_word)
-        elif game['last_word'] and (not final_history or final_history[-1] != game['last_word']):
-            final_history.append(game['last_word'])
+        if game.last_word and (not final_history or final_history[-1] != game.last_word):
+            final_history.append(game.last_word)
 
         word_history_data = {
             "words": final_history,
-            "winner": game.get('winner')  # 'user', 'computer', or None
+            "winner": game.winner  # 'user', 'computer', or None
         }
 
+        if self.results is not None:
+            self.results.enqueue(user_id, 'word_chain', game.difficulty, game.score, word_history_data)
+            return
+
         try:
             user_game = UserGames(
                 user_id=user_id,
                 game_type='word_chain',
-                difficulty=game.get('difficulty', 'medium'),
-                score=game['score'],
+                difficulty=game.difficulty,
+                score=game.score,
                 word_history=word_history_data
             )
 
             self.db.add(user_game)
             self.db.commit()
-            print(f"✅ 끝말잇기 결과 저장 완료 (user_id={user_id}, score={game['score']})")
+            print(f"✅ 끝말잇기 결과 저장 완료 (user_id={user_id}, score={game.score})")
 
         except Exception as e:
             self.db.rollback()
             print(f"❌ 끝말잇기 결과 저장 실패: {e}")
 
-    def _is_valid_word(self, word: str) -> bool:
-        """단어가 사전에 있는지 확인"""
-        try:
-            url = self.base_url + f'&part=word&pos=1&sort=popular&num=100&q={word}'
-            response = requests.get(url, timeout=3)
+    async def _is_valid_word(self, word: str) -> bool:
+        """단어가 사전에 있는지 확인 (오프라인 사전 → krdict 폴백)"""
+        if word in self.lexicon:
+            return True
 
-            return '<word>' in response.text and 'pos>1<' not in response.text # pos>2< 이상은 동사/형용사
-        except Exception as e:
-            print(f"❌ 단어 유효성 검사 오류: {e}")
+        if self.lexicon.is_loaded() and not self.use_api_fallback:
             return False
 
-    def _get_word_definition(self, word: str) -> str:
-        """단어 정의 가져오기"""
-        try:
-            url = self.base_url + '&part=word&pos=1&sort=popular&num=100&q=' + word
-            response = requests.get(url, timeout=3)
+        item = await self.krdict.lookup(word)
+        if item:
+            # 다음부터는 메모리에서 찾도록 사전에 기록
+            self._learn_word(word, item)
+        return item is not None
 
-            if '<definition>' in response.text:
-                start = response.text.find('<definition>') + len('<definition>')
-                end = response.text.find('</definition>')
-                return response.text[start:end]
-            return "정의 없음"
-        except:
+    async def _get_word_definition(self, word: str) -> str:
+        """단어 정의 가져오기 (오프라인 사전 → krdict 폴백)"""
+        definition = self.lexicon.get_definition(word)
+        if definition:
+            return definition
+
+        if self.lexicon.is_loaded() and not self.use_api_fallback:
             return "정의 없음"
 
-    def _get_random_word(self) -> Optional[str]:
+        item = await self.krdict.lookup(word)
+        if item and item['definition']:
+            self._learn_word(word, item)
+            return item['definition']
+        return "정의 없음"
+
+    def _learn_word(self, word: str, item: dict):
+        """krdict에서 찾은 단어를 사전과 후보 인덱스에 함께 기록 (컴퓨터 후보/전략 통계도 같이 갱신)"""
+        self.lexicon.add(word, item['definition'], item['level'], item['pos'])
+        if word in self.lexicon and self._is_candidate(word, set()):
+            if self.strategy:
+                self.strategy.add(word)
+            else:
+                self.chain_index.add(word)
+
+    def _is_candidate(self, word: str, used_words: set) -> bool:
+        """컴퓨터가 쓸 수 있는 단어인지 (접두사/접미사 제거 & 검증)"""
+        return (2 <= len(word) <= 4 and
+                word not in used_words and
+                word[-1] not in self.blacklist and
+                not word.startswith(('*', '-')) and
+                not word.endswith(('*', '-')))
+
+    async def _get_random_word(self) -> Optional[str]:
         # 🔥 쉬운 글자들 중 랜덤 선택 (끝말잇기 하기 좋은 글자)
         chars = ['가', '나', '다', '라', '마', '바', '사', '아', '자', '차']
         start_char = random.choice(chars)
 
-        try:
-            url = f"{self.base_url}&part=word&pos=1&q={start_char}*"
-            response = requests.get(url, timeout=3)
-
-            words = []
-            text = response.text
-            while '<word>' in text:
-                start = text.find('<word>') + len('<word>')
-                end = text.find('</word>')
-                word = text[start:end]
+        words = [w for w in self.lexicon.words_starting_with(start_char)
+                 if 2 <= len(w) <= 4 and w[-1] not in self.blacklist]
+        if words:
+            return random.choice(words)
 
-                if 2 <= len(word) <= 4 and word[-1] not in self.blacklist:
-                    words.append(word)
-
-                text = text[end + len('</word>'):]
-
-            return random.choice(words) if words else None
-        except:
+        if self.lexicon.is_loaded() and not self.use_api_fallback:
             return None
 
-    def _get_computer_word(self, start_char: str, used_words: set, mistake_rate: float) -> dict[str, str | Any] | None:
-        """컴퓨터가 사용할 단어 찾기"""
+        items = await self.krdict.search(f'{start_char}*', sort='dict')
+        words = [item['word'] for item in items
+                 if 2 <= len(item['word']) <= 4 and item['word'][-1] not in self.blacklist]
+        return random.choice(words) if words else None
+
+    async def _get_candidate_words(self, start_char: str, used_words: set) -> list:
+        """이어갈 수 있는 후보 단어 (인덱스: 같은 글자 → 두음법칙 → 경음화 순, 없으면 krdict 폴백)"""
+        if len(self.chain_index):
+            words = self.chain_index.candidates(start_char, used_words)
+            if words:
+                return words
+
+        if self.lexicon.is_loaded() and not self.use_api_fallback:
+            return []
+
+        # 같은 글자로 못 찾으면 두음법칙 글자로 재검색
+        for char in [start_char] + DUEUM_RULES.get(start_char, []):
+            words = await self._search_candidate_words_api(char, used_words)
+            if words:
+                return words
+        return []
+
+    async def _search_candidate_words_api(self, start_char: str, used_words: set) -> list:
+        items = await self.krdict.search(f'{start_char}*', level='level1', sort='dict')
+        return [item['word'] for item in items if self._is_candidate(item['word'], used_words)]
+
+    async def _get_computer_word(self, start_char: str, used_words: set, mistake_rate: float,
+                                 trap_rate: float = 0.0, kind_rate: float = 0.6) -> dict[str, str | Any] | None:
+        """컴퓨터가 사용할 단어 찾기 (전략 엔진: kind_rate/trap_rate, 기존 선택: mistake_rate)"""
         try:
-            url = self.base_url + f'&part=word&pos=1&level=level1&q={start_char}*'
-            response = requests.get(url, timeout=3)
-
-            words = []
-            text = response.text
-            while '<word>' in text:
-                start = text.find('<word>') + len('<word>')
-                end = text.find('</word>')
-                word = text[start:end]
-
-                # 접두사/접미사 제거 & 검증
-                if (2 <= len(word) <= 4 and
-                        word not in used_words and
-                        word[-1] not in self.blacklist and
-                        not word.startswith(('*', '-')) and
-                        not word.endswith(('*', '-'))):
-                    words.append(word)
-
-                text = text[end + len('</word>'):]
+            if self.strategy:
+                chosen = self.strategy.choose(start_char, used_words, kind_rate=kind_rate, trap_rate=trap_rate)
+                if chosen:
+                    return {"word": chosen, "definition": await self._get_word_definition(chosen)}
 
-            if not words:
-                # 두음법칙 적용 시도
-                dueum_candidates = [w for w in words if self._check_dueum(start_char, w[0])]
-                if dueum_candidates:
-                    words = dueum_candidates
+            words = await self._get_candidate_words(start_char, used_words)
 
             if not words:
                 return None
@@ -394,31 +403,33 @@ class WordChainGame:
                 easy_words = [w for w in words if w[-1] in ['가', '나', '다']]
                 if easy_words:
                     chosen = random.choice(easy_words)
-                    return {"word": chosen, "definition": self._get_word_definition(chosen)}
+                    return {"word": chosen, "definition": await self._get_word_definition(chosen)}
 
                 # 일반 랜덤 선택
             chosen = random.choice(words)
-            return {"word": chosen, "definition": self._get_word_definition(chosen)}
+            return {"word": chosen, "definition": await self._get_word_definition(chosen)}
 
         except:
             return None
 
-    def get_game_count(self) -> int:
-        """현재 게임 수 반환"""
-        return len(self.games)
+    def _key(self, game_id: str) -> str:
+        return f"word_chain:{game_id}"
+
+    async def get_game_count(self) -> Optional[int]:
+        """현재 게임 수 반환 (Redis 백엔드는 None)"""
+        return await self.sessions.count()
 
-    def restart_game(self, game_id: str):
+    async def restart_game(self, game_id: str):
         """게임 재시작"""
-        if game_id in self.games:
-            del self.games[game_id]
+        await self.sessions.delete(self._key(game_id))
 
-    def get_history(self, game_id: str) -> list:
+    async def get_history(self, game_id: str) -> list:
         """게임 히스토리 조회"""
-        if game_id not in self.games:
+        game, _ = await self.sessions.load(self._key(game_id))
+        if game is None:
             raise Exception(f"게임 {game_id}를 찾을 수 없습니다")
-        return self.games[game_id].get('history', [])
+        return game.history
 
-    def delete_game(self, game_id: str):
+    async def delete_game(self, game_id: str):
         """게임 삭제"""
-        if game_id in self.games:
-            del self.games[game_id]
\ No newline at end of file
+        await self.sessions.delete(self._key(game_id))
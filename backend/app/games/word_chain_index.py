@@ -0,0 +1,166 @@
+# game/word_chain_index.py (끝말잇기 후보 단어 인덱스 - 두음법칙/경음화 확장 포함)
+import bisect, time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Iterable
+
+from .hangul import choseong_index, jongseong_index
+
+# 두음법칙: 앞 단어 끝 글자 → 이어서 시작할 수 있는 글자
+# - 녀/뇨/뉴/니 → 여/요/유/이
+# - 랴/려/례/료/류/리 → 야/여/예/요/유/이
+# - 라/래/로/뢰/루/르 → 아/애/오/외/우/으
+DUEUM_RULES = {
+    # ㄴ 두음법칙
+    '녀': ['여'], '뇨': ['요'], '뉴': ['유'], '니': ['이'],
+
+    # ㄹ 두음법칙 (ㄹ 뒤 ㅑ, ㅕ, ㅖ, ㅛ, ㅠ, ㅣ)
+    '랴': ['야'], '려': ['여'], '례': ['예'],
+    '료': ['요'], '류': ['유'], '리': ['이'],
+
+    # ㄹ 두음법칙 (ㄹ 뒤 ㅏ, ㅐ, ㅓ, ㅔ, ㅗ, ㅚ, ㅜ, ㅡ)
+    '라': ['아', '나'], '래': ['애', '내'],
+    '로': ['오', '노'], '뢰': ['외', '뇌'],
+    '루': ['우', '누'], '르': ['으', '느']
+}
+
+# 두음법칙 역방향: 시작 글자 → 그 글자로 이어갈 수 있는 앞 단어 끝 글자
+DUEUM_SOURCES: Dict[str, List[str]] = {}
+for _last, _firsts in DUEUM_RULES.items():
+    for _first in _firsts:
+        DUEUM_SOURCES.setdefault(_first, []).append(_last)
+
+# 경음화: ㄱ, ㄷ, ㅂ 받침 (1, 7, 17) 뒤에서
+CHISA_JONGSEONG = (1, 7, 17)
+# 경음으로 변할 수 있는 첫 자음: ㄱ=0, ㄷ=3, ㅅ=9, ㅈ=12
+CHISA_CHOSEONG = (0, 3, 9, 12)
+
+
+def check_dueum(last_char: str, first_char: str) -> bool:
+    """두음법칙 체크"""
+    return first_char in DUEUM_RULES.get(last_char, [])
+
+
+def check_chisa(last_char: str, first_char: str) -> bool:
+    """경음화 체크 (받침 ㄱ, ㄷ, ㅂ 뒤에서 ㄱ→ㄲ, ㄷ→ㄸ, ㅂ→ㅃ, ㅅ→ㅆ, ㅈ→ㅉ)"""
+    return _has_chisa_jongseong(last_char) and _has_chisa_choseong(first_char)
+
+
+def _has_chisa_jongseong(char: str) -> bool:
+    return jongseong_index(char) in CHISA_JONGSEONG
+
+
+def _has_chisa_choseong(char: str) -> bool:
+    return choseong_index(char) in CHISA_CHOSEONG
+
+
+class WordChainIndex:
+    """
+    끝 글자 → 이어질 수 있는 후보 단어를 미리 계산해 둔 인덱스
+
+    lookup(글자)은 (같은 글자, 두음법칙, 경음화) 3단계 후보 튜플을 돌려준다.
+    경음화 후보는 받침 ㄱ/ㄷ/ㅂ 글자 전체가 같은 목록을 쓰므로 한 번만 만들어 공유한다.
+    dead_end[단어]는 그 단어의 끝 글자로 이어갈 후보가 적을수록 1에 가까워진다.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        start = time.perf_counter()
+
+        by_first: Dict[str, List[str]] = {}
+        for word in words:
+            by_first.setdefault(word[0], []).append(word)
+        self.by_first: Dict[str, Tuple[str, ...]] = {c: tuple(ws) for c, ws in by_first.items()}
+
+        # 받침 ㄱ/ㄷ/ㅂ 뒤에 올 수 있는 단어는 모든 글자에서 동일
+        self.chisa_pool: Tuple[str, ...] = tuple(
+            w for c, ws in self.by_first.items() if _has_chisa_choseong(c) for w in ws
+        )
+
+        self._tiers: Dict[str, Tuple[Tuple[str, ...], ...]] = {}
+        self.out_degree: Dict[str, int] = {}
+        self._sort_key: Optional[Callable[[str], Any]] = None
+
+        last_chars = {w[-1] for ws in self.by_first.values() for w in ws}
+        for char in last_chars | set(self.by_first):
+            self._build(char)
+
+        self.dead_end: Dict[str, float] = {
+            w: 1.0 / (1 + self.out_degree[w[-1]])
+            for ws in self.by_first.values() for w in ws
+        }
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✅ 끝말잇기 인덱스 생성 완료: {len(self.dead_end)}개 단어, {len(self._tiers)}개 글자 ({elapsed:.0f}ms)")
+
+    def _build(self, char: str) -> Tuple[Tuple[str, ...], ...]:
+        direct = self.by_first.get(char, ())
+        dueum = tuple(w for c in DUEUM_RULES.get(char, []) for w in self.by_first.get(c, ()))
+        if self._sort_key and len(DUEUM_RULES.get(char, [])) > 1:
+            dueum = tuple(sorted(dueum, key=self._sort_key))
+        chisa = self.chisa_pool if _has_chisa_jongseong(char) else ()
+
+        tiers = (direct, dueum, chisa)
+        self._tiers[char] = tiers
+        # 첫 자음이 ㄱ/ㄷ/ㅅ/ㅈ인 글자는 같은 글자 후보가 이미 경음화 목록에 포함됨
+        overlap = len(direct) if chisa and _has_chisa_choseong(char) else 0
+        self.out_degree[char] = len(direct) + len(dueum) + len(chisa) - overlap
+        return tiers
+
+    def sort_by(self, key: Callable[[str], Any]):
+        """후보 목록을 key 순서로 정렬해서 다시 구성 (전략 엔진이 앞/뒤에서 바로 고를 수 있도록)"""
+        self._sort_key = key
+        self.by_first = {c: tuple(sorted(ws, key=key)) for c, ws in self.by_first.items()}
+        self.chisa_pool = tuple(sorted(self.chisa_pool, key=key))
+        for char in list(self._tiers):
+            self._build(char)
+
+    def _insert(self, words: Tuple[str, ...], word: str) -> Tuple[str, ...]:
+        words = list(words)
+        if self._sort_key:
+            bisect.insort(words, word, key=self._sort_key)
+        else:
+            words.append(word)
+        return tuple(words)
+
+    def add(self, word: str) -> set:
+        """
+        실행 중에 사전에 추가된 단어(krdict 폴백)를 후보로 반영하고, 후보 목록이 바뀐 글자 집합 반환
+
+        그 단어로 이어갈 수 있는 글자(같은 글자, 두음법칙, 경음화)의 후보/out_degree만 다시 계산한다.
+        """
+        if word in self.dead_end:
+            return set()
+
+        first = word[0]
+        self.by_first[first] = self._insert(self.by_first.get(first, ()), word)
+        changed = {first} | set(DUEUM_SOURCES.get(first, ()))
+        if _has_chisa_choseong(first):
+            self.chisa_pool = self._insert(self.chisa_pool, word)
+            changed |= {c for c in self._tiers if _has_chisa_jongseong(c)}
+
+        for char in changed:
+            self._build(char)
+        self.dead_end[word] = 1.0 / (1 + self.lookup_degree(word[-1]))
+        return changed
+
+    def lookup_degree(self, char: str) -> int:
+        """글자로 이어갈 수 있는 단어 수 (처음 보는 글자면 계산)"""
+        if char not in self.out_degree:
+            self._build(char)
+        return self.out_degree[char]
+
+    def lookup(self, char: str) -> Tuple[Tuple[str, ...], ...]:
+        """(같은 글자, 두음법칙, 경음화) 후보 튜플 - 사전에 없던 글자는 처음 요청 시 계산"""
+        tiers = self._tiers.get(char)
+        if tiers is None:
+            tiers = self._build(char)
+        return tiers
+
+    def candidates(self, char: str, used_words: set) -> List[str]:
+        """사용하지 않은 후보 중 우선순위가 가장 높은 단계의 단어 목록"""
+        for tier in self.lookup(char):
+            words = [w for w in tier if w not in used_words]
+            if words:
+                return words
+        return []
+
+    def __len__(self) -> int:
+        return len(self.dead_end)
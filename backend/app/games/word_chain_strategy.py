@@ -0,0 +1,134 @@
+# game/word_chain_strategy.py (끝말잇기 컴퓨터 전략 - 글자 그래프 기반)
+import random
+from typing import Dict, Optional, Tuple
+
+from .word_chain_index import WordChainIndex
+
+
+class WordChainStrategy:
+    """
+    글자를 노드, 단어를 간선으로 보는 그래프에서 미리 계산한 값으로 컴퓨터 단어를 고른다.
+
+    - out_degree[글자]: 그 글자로 이어갈 수 있는 단어 수 (인덱스에서 계산)
+    - killer 글자: 이어갈 단어가 killer_threshold개 이하인 끝 글자 (상대가 막힘)
+    - killer_replies[글자]: 그 글자에서 상대가 고를 수 있는 단어 중 killer 글자로 끝나는 수 (역으로 컴퓨터가 막힘)
+
+    후보는 (상대 out_degree, killer_replies) 오름차순으로 정렬해 두기 때문에
+    한 수를 고를 때 정렬된 후보의 앞(함정)이나 뒤(쉬운 연결)에서 몇 개만 보면 된다.
+    """
+
+    def __init__(self, index: WordChainIndex, killer_threshold: int = 0, top_k: int = 3):
+        self.index = index
+        self.killer_threshold = killer_threshold
+        self.top_k = top_k
+
+        self.killers = {c for c, degree in index.out_degree.items() if degree <= killer_threshold}
+
+        self.killer_replies: Dict[str, int] = {}
+        self._count_killer_replies()
+
+        index.sort_by(self.trap_key)
+        print(f"✅ 끝말잇기 전략 준비 완료: killer 글자 {len(self.killers)}개")
+
+    def _count_killer_replies(self):
+        # 경음화 목록은 모든 받침 ㄱ/ㄷ/ㅂ 글자가 공유하므로 killer 수도 한 번만 계산
+        index = self.index
+        chisa_killers = sum(1 for w in index.chisa_pool if w[-1] in self.killers)
+        for char in list(index.out_degree):
+            self.killer_replies[char] = sum(
+                chisa_killers if tier is index.chisa_pool else sum(1 for w in tier if w[-1] in self.killers)
+                for tier in index.lookup(char)
+            )
+
+    def add(self, word: str):
+        """
+        실행 중에 사전에 추가된 단어를 인덱스와 통계에 반영 (WordChainGame에서 lexicon.add와 함께 호출)
+
+        killer 글자가 바뀌면 killer_replies를 전부 다시 세고, 아니면 새 단어가 들어간 글자만 더한다.
+        기존 후보의 정렬 순서는 다시 만들지 않는다 (새 단어만 현재 기준으로 제자리에 삽입).
+        """
+        changed = self.index.add(word)
+        if not changed:
+            return
+
+        killers = {c for c, degree in self.index.out_degree.items() if degree <= self.killer_threshold}
+        if killers != self.killers:
+            self.killers = killers
+            self._count_killer_replies()
+            return
+
+        for char in self.index.out_degree:
+            if char not in self.killer_replies:
+                self.killer_replies[char] = sum(
+                    sum(1 for w in tier if w[-1] in self.killers) for tier in self.index.lookup(char))
+            elif char in changed and word[-1] in self.killers:
+                self.killer_replies[char] += 1
+
+    def trap_key(self, word: str) -> Tuple[int, int]:
+        """작을수록 상대가 이어가기 어려운 단어"""
+        last = word[-1]
+        return self.index.out_degree.get(last, 0), self.killer_replies.get(last, 0)
+
+    def win_probability(self, word: str) -> float:
+        """
+        word를 냈을 때 컴퓨터가 이길 확률 추정 (상대가 후보 중 무작위로 고른다고 가정)
+        - 상대가 이어갈 단어가 없으면 1.0
+        - 상대 단어가 killer 글자로 끝나 컴퓨터가 막히는 비율만큼 감소
+        """
+        degree, replies = self.trap_key(word)
+        if degree == 0:
+            return 1.0
+        return 1.0 - replies / degree
+
+    def _pick_from_front(self, tier: Tuple[str, ...], used_words: set) -> Optional[str]:
+        picked = []
+        for word in tier:
+            if word not in used_words:
+                picked.append(word)
+                if len(picked) >= self.top_k:
+                    break
+        return random.choice(picked) if picked else None
+
+    def _pick_from_back(self, tier: Tuple[str, ...], used_words: set) -> Optional[str]:
+        picked = []
+        for word in reversed(tier):
+            if word not in used_words and word[-1] not in self.killers:
+                picked.append(word)
+                if len(picked) >= self.top_k:
+                    break
+        return random.choice(picked) if picked else self._pick_from_front(tier, used_words)
+
+    def _pick_random(self, tier: Tuple[str, ...], used_words: set) -> Optional[str]:
+        # 사용된 단어는 후보에 비해 아주 적으므로 몇 번 뽑아보고, 안 되면 전체 필터링
+        for _ in range(8):
+            word = random.choice(tier)
+            if word not in used_words:
+                return word
+        words = [w for w in tier if w not in used_words]
+        return random.choice(words) if words else None
+
+    def choose(self, char: str, used_words: set, kind_rate: float, trap_rate: float) -> Optional[str]:
+        """
+        컴퓨터 단어 선택
+
+        Args:
+            char: 이어야 할 글자 (사용자 단어의 끝 글자)
+            used_words: 이미 사용한 단어
+            kind_rate: 상대가 이어가기 쉬운 단어를 고를 확률
+            trap_rate: 상대를 막히게 하는 단어를 고를 확률 (나머지는 무작위)
+        """
+        for tier in self.index.lookup(char):
+            if not tier:
+                continue
+
+            roll = random.random()
+            if roll < trap_rate:
+                word = self._pick_from_front(tier, used_words)
+            elif roll < trap_rate + kind_rate:
+                word = self._pick_from_back(tier, used_words)
+            else:
+                word = self._pick_random(tier, used_words)
+
+            if word:
+                return word
+        return None
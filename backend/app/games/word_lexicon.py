@@ -0,0 +1,131 @@
+# game/word_lexicon.py (끝말잇기용 오프라인 명사 사전)
+import os, json, time, asyncio
+from typing import Dict, List, Optional
+
+from .hangul import HANGUL_BASE, HANGUL_COUNT
+from .krdict_client import KrdictClient
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(__file__), 'data', 'lexicon', 'noun_lexicon.json')
+
+
+class WordLexicon:
+    """
+    미리 만들어 둔 명사 사전을 서버 시작 시 한 번만 메모리에 올려두는 인덱스
+    - entries: 단어 → {definition, level, pos}
+    - by_first: 첫 글자 → 단어 목록 (끝말잇기 후보 검색용)
+    """
+
+    def __init__(self, path: str = DEFAULT_LEXICON_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict[str, str]] = {}
+        self.by_first: Dict[str, List[str]] = {}
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            print(f"⚠️ 단어 사전 파일이 없습니다: {self.path} (krdict API만 사용)")
+            return
+
+        start = time.perf_counter()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"❌ 단어 사전 로드 실패 ({self.path}): {e}")
+            return
+
+        for item in data.get('words', []):
+            self.add(item['word'], item.get('definition', ''), item.get('level', ''), item.get('pos', '명사'))
+
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"✅ 단어 사전 로드 완료: {len(self.entries)}개 단어, {len(self.by_first)}개 첫 글자 ({elapsed:.0f}ms)")
+
+    def add(self, word: str, definition: str, level: str = '', pos: str = '명사'):
+        """사전에 단어 추가 (API 폴백으로 찾은 단어도 여기에 기록해서 다음부터는 메모리에서 찾음)"""
+        word = word.strip()
+        if not word or pos != '명사':
+            return
+
+        if word not in self.entries:
+            self.by_first.setdefault(word[0], []).append(word)
+            self.entries[word] = {'definition': definition, 'level': level, 'pos': pos}
+        elif definition and not self.entries[word]['definition']:
+            self.entries[word]['definition'] = definition
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def is_loaded(self) -> bool:
+        return bool(self.entries)
+
+    def get_definition(self, word: str) -> Optional[str]:
+        entry = self.entries.get(word)
+        if entry and entry['definition']:
+            return entry['definition']
+        return None
+
+    def get_level(self, word: str) -> Optional[str]:
+        entry = self.entries.get(word)
+        return entry['level'] if entry else None
+
+    def words_starting_with(self, char: str) -> List[str]:
+        """첫 글자로 시작하는 단어 목록 (원본 리스트이므로 수정하지 말 것)"""
+        return self.by_first.get(char, [])
+
+    def save(self, path: str = None):
+        path = path or self.path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        words = [
+            {'word': word, 'definition': entry['definition'], 'level': entry['level'], 'pos': entry['pos']}
+            for word, entry in self.entries.items()
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'words': words}, f, ensure_ascii=False)
+        print(f"✅ 단어 사전 저장 완료: {path} ({len(words)}개)")
+
+
+async def build_lexicon(api_key: str, out_path: str = DEFAULT_LEXICON_PATH, start_chars: List[str] = None,
+                        max_pages: int = 10) -> WordLexicon:
+    """
+    krdict에서 명사를 첫 글자별로 긁어와 사전 파일 생성 (오프라인 작업, 서버 요청 경로에서 사용하지 않음)
+
+    Args:
+        api_key: krdict API 키
+        out_path: 저장할 사전 파일 경로
+        start_chars: 수집할 첫 글자 목록 (기본값: 한글 음절 전체)
+        max_pages: 글자당 최대 페이지 수 (페이지당 100개)
+    """
+    client = KrdictClient(api_key, max_concurrency=4, timeout=10.0)
+    lexicon = WordLexicon(path=out_path)
+    chars = start_chars or [chr(HANGUL_BASE + i) for i in range(HANGUL_COUNT)]
+
+    async def collect(char: str):
+        for page in range(max_pages):
+            items = await client.search(f'{char}*', num=100, start=page * 100 + 1)
+            for item in items:
+                word = item['word']
+                if word.startswith(char) and not word.startswith(('*', '-')) and not word.endswith(('*', '-')):
+                    lexicon.add(word, item['definition'], item['level'], item['pos'])
+            if len(items) < 100:
+                break
+
+    try:
+        # 동시 요청 수는 클라이언트 세마포어가 제한
+        for offset in range(0, len(chars), 100):
+            await asyncio.gather(*(collect(c) for c in chars[offset:offset + 100]))
+            print(f"🔍 {min(offset + 100, len(chars))}/{len(chars)} 글자 처리, 누적 {len(lexicon)}개 단어")
+    finally:
+        await client.aclose()
+
+    lexicon.save(out_path)
+    return lexicon
+
+
+if __name__ == "__main__":
+    # python -m app.games.word_lexicon  (backend 디렉토리에서 실행)
+    from dotenv import load_dotenv
+    load_dotenv()
+    asyncio.run(build_lexicon(api_key=os.getenv("KOREAN_BASIC_KEY")))
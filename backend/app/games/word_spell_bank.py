@@ -0,0 +1,104 @@
+# game/word_spell_bank.py (초성퀴즈 문제 은행 - 난이도별 미리 채워두는 큐)
+import os, random
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, List
+
+from .low_water_bank import LowWaterBank
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'word_spell_bank.json')
+
+
+class ProblemBank(LowWaterBank):
+    """
+    난이도(level1/level2/level3)별로 {initial, definition, answer} 문제를 미리 쌓아두는 은행
+
+    - level마다 capacity개까지만 담는 큐 (꺼낸 문제는 다시 쓰지 않음)
+    - low_water 아래로 떨어지면 백그라운드 작업이 fetch(level)로 다시 채움
+    - 채울 때마다/종료 시 스냅샷 파일로 저장 → 재시작해도 바로 문제를 꺼낼 수 있음
+    - 워커가 여러 개면 잠금을 얻은 워커 하나만 채우고 내보냄 (LowWaterBank)
+    """
+
+    label = '초성퀴즈 문제 은행'
+
+    def __init__(self, fetch: Callable[[str], Awaitable[List[dict]]],
+                 levels: tuple = ('level1', 'level2', 'level3'),
+                 capacity: int = 300, low_water: int = 100,
+                 snapshot_path: str = DEFAULT_SNAPSHOT_PATH):
+        super().__init__(snapshot_path)
+        self.fetch = fetch
+        self.levels = levels
+        self.capacity = capacity
+        self.low_water = low_water
+
+        self.queues: Dict[str, Deque[dict]] = {level: deque() for level in levels}
+
+    def size(self, level: str) -> int:
+        return len(self.queues.get(level, ()))
+
+    def pop(self, level: str, count: int) -> List[dict]:
+        """초성이 겹치지 않는 문제 count개 꺼내기 (부족하면 있는 만큼)"""
+        queue = self.queues.get(level)
+        if queue is None:
+            return []
+
+        problems = []
+        skipped = []
+        used_initials = set()
+        while queue and len(problems) < count:
+            problem = queue.popleft()
+            if problem['initial'] in used_initials:
+                skipped.append(problem)
+                continue
+            problems.append(problem)
+            used_initials.add(problem['initial'])
+
+        # 초성이 겹쳐서 건너뛴 문제는 다음 게임에서 사용
+        queue.extend(skipped)
+
+        if len(queue) < self.low_water:
+            self._notify_low()
+        return problems
+
+    async def refill(self, level: str) -> int:
+        """level 큐를 capacity까지 채우고 추가된 개수 반환"""
+        queue = self.queues[level]
+        if len(queue) >= self.capacity:
+            return 0
+
+        candidates = await self.fetch(level)
+        queued_words = {p['answer'] for p in queue}
+        random.shuffle(candidates)
+
+        added = 0
+        for candidate in candidates:
+            if len(queue) >= self.capacity:
+                break
+            if candidate['answer'] not in queued_words:
+                queue.append(candidate)
+                queued_words.add(candidate['answer'])
+                added += 1
+        return added
+
+    async def _fill(self):
+        refilled = False
+        for level in self.levels:
+            if self.size(level) < self.low_water:
+                try:
+                    added = await self.refill(level)
+                    refilled = refilled or added > 0
+                    print(f"🔄 초성퀴즈 문제 은행 {level}: +{added}개 (현재 {self.size(level)}개)")
+                except Exception as e:
+                    print(f"⚠️ 초성퀴즈 문제 은행 {level} 채우기 실패: {e}")
+
+        if refilled:
+            self.save_snapshot()
+
+    def _snapshot_data(self) -> dict:
+        return {level: list(queue) for level, queue in self.queues.items()}
+
+    def _restore_snapshot(self, data: dict):
+        for level, problems in data.items():
+            if level in self.queues:
+                self.queues[level].extend(problems[:self.capacity - len(self.queues[level])])
+        print(f"✅ 초성퀴즈 문제 은행 스냅샷 로드: " +
+              ", ".join(f"{level} {len(q)}개" for level, q in self.queues.items()))
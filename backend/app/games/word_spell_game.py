@@ -1,132 +1,164 @@
-# pip install requests hgtk python-dotenv
-import requests, hgtk, random, os
+# pip install httpx numpy python-dotenv
+import random, os, asyncio
 from dotenv import load_dotenv
 from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 from models import UserGames
+from .hangul import get_initials, get_initials_batch
+from .krdict_client import KrdictClient
+from .word_spell_bank import ProblemBank
+from .game_store import WordSpellState
+from .session_backend import SessionBackend, MemorySessionBackend
+from .game_result_writer import GameResultWriter
 
 class InitialQuizGame:
-    def __init__(self, api_key: str, db: Session = None):
+    def __init__(self, api_key: str, db: Session = None, krdict: KrdictClient = None, use_bank: bool = False,
+                 sessions: SessionBackend = None, results: GameResultWriter = None):
         load_dotenv()
         self.api_key = os.getenv("KOREAN_BASIC_KEY")
-        self.base_url = f'https://krdict.korean.go.kr/api/search?key={self.api_key}'
+        # WordChainGame과 같은 커넥션 풀을 쓰도록 main.py에서 주입
+        self.krdict = krdict if krdict is not None else KrdictClient(self.api_key)
         self.blacklist = ['즘', '틱', '늄', '슘', '퓸', '늬', '뺌', '섯', '숍', '튼', '름', '늠', '쁨']
-        self.games: Dict[str, dict] = {}
+        # 게임 상태 저장소 (기본: 프로세스 메모리, 워커가 여러 개면 main.py에서 Redis 백엔드 주입)
+        self.sessions = sessions if sessions is not None else MemorySessionBackend(name='word_spell')
+        self.session_ttl = 1800
         self.db = db  # ✅ DB 세션 저장
+        # 있으면 결과를 모아서 저장 (없으면 self.db로 바로 저장)
+        self.results = results
 
-    def _save_game_result(self, game_id: str, user_id: int):
+        self.level_map = {
+            "easy": "level1",
+            "medium": "level2",
+            "hard": "level3"
+        }
+        self.start_chars = ['가', '나', '다', '라', '마', '바', '사', '아', '자', '차', '카', '타', '파', '하']
+        self.problems_per_game = 10
+
+        # 난이도(level)별 문제 후보 캐시: [{initial, definition, answer}]
+        self.word_pools: Dict[str, List[dict]] = {}
+        self._pool_locks: Dict[str, asyncio.Lock] = {}
+
+        # 난이도별 문제 은행 (백그라운드에서 미리 채움, 스냅샷으로 재시작 시에도 유지)
+        self.bank: Optional[ProblemBank] = ProblemBank(fetch=self._fetch_level) if use_bank else None
+
+    def _save_game_result(self, game: WordSpellState, user_id: int):
         """게임 결과를 DB에 저장"""
-        if not self.db:
+        if self.results is not None:
+            self.results.enqueue(user_id, 'word_spell', game.difficulty, game.score * 10)
             return
 
-        game = self.games.get(game_id)
-        if not game:
+        if not self.db:
             return
 
         try:
             user_game = UserGames(
                 user_id=user_id,
                 game_type='word_spell',
-                difficulty=game.get('difficulty', 'medium'),
-                score=game['score'] * 10,
+                difficulty=game.difficulty,
+                score=game.score * 10,
                 word_history=None  # ✅ 초성퀴즈는 word_history 불필요
             )
 
             self.db.add(user_game)
             self.db.commit()
-            print(f"✅ 초성퀴즈 결과 저장 완료 (user_id={user_id}, score={game['score']})")
+            print(f"✅ 초성퀴즈 결과 저장 완료 (user_id={user_id}, score={game.score})")
 
         except Exception as e:
             self.db.rollback()
             print(f"❌ 초성퀴즈 결과 저장 실패: {e}")
 
-    # ---------- 1️⃣ 단어 랜덤 추출 ----------
-    def _get_random_word(self, difficulty: str = "medium") -> Optional[dict]:
+    # ---------- 1️⃣ 문제 후보 수집 ----------
+    async def _fetch_candidates(self, level: str, start_char: str) -> List[dict]:
+        """시작 글자 하나에 대한 krdict 검색 결과 → 문제 후보 목록"""
         try:
-            level_map = {
-                "easy": "level1",
-                "medium": "level2",
-                "hard": "level3"
-            }
-            level = level_map.get(difficulty, "level2")
-
-            # 임의의 초성 선택
-            start_chars = ['가', '나', '다', '라', '마', '바', '사', '아', '자', '차', '카', '타', '파', '하']
-            start_char = random.choice(start_chars)
-            url = self.base_url + f'&part=word&pos=1&level={level}&q={start_char}*'
-
-            response = requests.get(url, timeout=5)
-
-            items = self._mid_return_all(response.text, '<item>', '</item>')
-
-            candidates = []
-
-            for w in items:
-                word = self._mid_return(w, '<word>', '</word>')
-                pos = self._mid_return(w, '<pos>', '</pos>')
-                definition = self._mid_return(w, '<definition>', '</definition>')
-
-                # 🔥 정의가 비어있지 않은지 확인
-                if (pos == '명사' and
-                        2 <= len(word) <= 4 and
-                        word[-1] not in self.blacklist and
-                        definition.strip()):  # 정의 확인
-                    candidates.append((word, definition))
-
-            if not candidates:
-                return None
-
-            word, definition = random.choice(candidates)
-            return {"word": word, "definition": definition}
-
+            items = await self.krdict.search(f'{start_char}*', level=level, num=100, sort='dict')
         except Exception as e:
-            return None
+            print(f"⚠️ 초성퀴즈 후보 수집 실패 ({level}, {start_char}): {e}")
+            return []
+
+        # 🔥 정의가 비어있지 않은지 확인
+        items = [item for item in items
+                 if item['pos'] == '명사' and
+                 2 <= len(item['word']) <= 4 and
+                 item['word'][-1] not in self.blacklist and
+                 item['definition'].strip()]  # 정의 확인
+
+        initials = get_initials_batch([item['word'] for item in items])
+        return [
+            {"initial": initial, "definition": item['definition'], "answer": item['word']}
+            for item, initial in zip(items, initials)
+        ]
+
+    async def _fetch_level(self, level: str) -> List[dict]:
+        """모든 시작 글자를 동시에 조회해서 level의 후보를 모음 (문제 은행 채우기에도 사용)"""
+        results = await asyncio.gather(*(self._fetch_candidates(level, c) for c in self.start_chars))
+
+        pool = []
+        seen_words = set()
+        for candidates in results:
+            for candidate in candidates:
+                if candidate["answer"] not in seen_words:
+                    seen_words.add(candidate["answer"])
+                    pool.append(candidate)
+        return pool
+
+    async def _get_word_pool(self, difficulty: str) -> List[dict]:
+        """난이도별 후보 풀 (문제 은행이 비었을 때 사용, 처음 한 번만 조회)"""
+        level = self.level_map.get(difficulty, "level2")
+        if self.word_pools.get(level):
+            return self.word_pools[level]
+
+        lock = self._pool_locks.setdefault(level, asyncio.Lock())
+        async with lock:
+            # 기다리는 동안 다른 요청이 채웠을 수 있음
+            if self.word_pools.get(level):
+                return self.word_pools[level]
+
+            pool = await self._fetch_level(level)
+            if pool:
+                self.word_pools[level] = pool
+                print(f"✅ 초성퀴즈 {level} 후보 {len(pool)}개 캐시")
+            return pool
+
+    def _draw_problems(self, pool: List[dict], count: int) -> List[dict]:
+        """후보 풀에서 초성이 겹치지 않게 count개를 한 번에 뽑기"""
+        problems = []
+        used_initials = set()
+
+        for candidate in random.sample(pool, len(pool)):
+            # 🔥 초성 중복 체크
+            if candidate["initial"] not in used_initials:
+                problems.append(dict(candidate))
+                used_initials.add(candidate["initial"])  # 사용된 초성 기록
+                if len(problems) >= count:
+                    break
+        return problems
 
     # ---------- 2️⃣ 초성 추출 ----------
     def _get_initials(self, word: str) -> str:
         """단어를 초성으로 변환"""
-        try:
-            initials = ''.join([
-                hgtk.letter.decompose(ch)[0] if hgtk.checker.is_hangul(ch) else ch
-                for ch in word
-            ])
-            return initials
-        except Exception as e:
-            return word
+        return get_initials(word)
 
     # ---------- 3️⃣ 게임 생성 ----------
-    def create_game(self, game_id: str, difficulty: str = "medium"):
+    async def create_game(self, game_id: str, difficulty: str = "medium", user_id: int = None):
         """게임 세션 생성"""
 
-        problems = []
-        used_initials = set()
-        max_attempts = 50  # 최대 시도 횟수
-        attempts = 0
-
-        # 🔥 10개의 문제를 확실히 생성
-        while len(problems) < 10 and attempts < max_attempts:
-            attempts += 1
-            data = self._get_random_word(difficulty)
-
-            if data:
-                initial = self._get_initials(data["word"])
-
-                # 🔥 초성 중복 체크
-                if initial and data["definition"].strip() and initial not in used_initials:
-                    problems.append({
-                        "initial": initial,
-                        "definition": data["definition"],
-                        "answer": data["word"]
-                    })
-                    used_initials.add(initial)  # 사용된 초성 기록
-
-        self.games[game_id] = {
-            "difficulty": difficulty,
-            "problems": problems,
-            "current": 0,
-            "score": 0,
-            "finished": False
-        }
+        # 🔥 문제 은행에서 10개를 꺼내고, 모자라면 캐시된 후보 풀에서 채움
+        level = self.level_map.get(difficulty, "level2")
+        problems = self.bank.pop(level, self.problems_per_game) if self.bank else []
+
+        if len(problems) < self.problems_per_game:
+            pool = await self._get_word_pool(difficulty)
+            used_initials = {p["initial"] for p in problems}
+            problems += self._draw_problems(
+                [c for c in pool if c["initial"] not in used_initials],
+                self.problems_per_game - len(problems)
+            )
+
+        key = self._key(game_id)
+        await self.sessions.delete(key)
+        await self.sessions.commit(key, WordSpellState(difficulty, problems, user_id=user_id),
+                                   version=0, ttl=self.session_ttl)
 
         first_problem = problems[0]
 
@@ -136,70 +168,57 @@ class InitialQuizGame:
             "problem": first_problem  # 🔥 이미 딕셔너리 형태로 반환
         }
 
-    def get_game_count(self) -> int:
-        return len(self.games)
+    def _key(self, game_id: str) -> str:
+        return f"word_spell:{game_id}"
+
+    async def get_game_count(self) -> Optional[int]:
+        return await self.sessions.count()
 
     # ---------- 4️⃣ 정답 확인 ----------
-    def submit_answer(self, game_id: str, user_input: str, user_id: int = None, exclude_initials: List[str] = None):
+    async def submit_answer(self, game_id: str, user_input: str, user_id: int = None, exclude_initials: List[str] = None):
         """사용자 입력을 검증"""
         # exclude_initials는 현재 사용 안 함 (이미 게임 생성 시 중복 방지됨)
         result = None
-        game = self.games.get(game_id)
-        if not game or game["finished"]:
+        key = self._key(game_id)
+        game, version = await self.sessions.load(key)
+        if game is None or game.finished:
             return {"error": "게임이 존재하지 않거나 이미 종료됨"}
 
-        current_index = game["current"]
-        problem = game["problems"][current_index]
+        current_index = game.current
+        problem = game.problems[current_index]
         correct = user_input.strip() == problem["answer"]
 
         if correct:
-            game["score"] += 1
+            game.score += 1
             result = "정답! 🎉"
-            game["current"] += 1
+            game.current += 1
         else :
-            game["score"] += 0
+            game.score += 0
             result = "오답!"
-            game["current"] += 1
+            game.current += 1
 
-        if game["current"] >= len(game["problems"]):
-            game["finished"] = True
+        if game.current >= len(game.problems):
+            game.finished = True
+            await self.sessions.commit(key, game, version, ttl=self.session_ttl)
 
             if user_id:  # ✅ user_id가 있으면 DB 저장
-                self._save_game_result(game_id, user_id)
+                self._save_game_result(game, user_id)
 
             return {
                 "correct": correct,
                 "result": result,
                 "finished": True,
-                "score": game["score"],
-                "message": f"10문제 중 {game['score']}개 맞혔어요!"
+                "score": game.score,
+                "message": f"10문제 중 {game.score}개 맞혔어요!"
             }
 
-        next_problem = game["problems"][game["current"]]
+        await self.sessions.commit(key, game, version, ttl=self.session_ttl)
+
+        next_problem = game.problems[game.current]
         return {
             "correct": correct,
             "result": result,
             "finished": False,
-            "score": game["score"],
+            "score": game.score,
             "next_problem": next_problem
         }
-
-    # ---------- 5️⃣ 유틸 ----------
-    @staticmethod
-    def _mid_return(val: str, s: str, e: str) -> str:
-        if s in val:
-            val = val[val.find(s) + len(s):]
-            if e in val:
-                val = val[:val.find(e)]
-        return val
-
-    @staticmethod
-    def _mid_return_all(val: str, s: str, e: str) -> List[str]:
-        if s in val:
-            tmp = val.split(s)
-            result = []
-            for part in tmp:
-                if e in part:
-                    result.append(part[:part.find(e)])
-            return result
-        return []
\ No newline at end of file
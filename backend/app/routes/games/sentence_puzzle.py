@@ -7,6 +7,7 @@ from data.postgresDB import SessionLocal
 from models import Users
 from ..login.login import get_current_user
 from ...games.sentence_puzzle_game import SentencePuzzleGame
+from ...games.session_backend import SessionConflict
 
 router = APIRouter(prefix="/puzzle", tags=["sentence_puzzle"])
 
@@ -104,11 +105,13 @@ async def generate_puzzle(
         raise HTTPException(status_code=503, detail="퍼즐 생성기가 준비되지 않았습니다")
     user_id=user.id
     try:
-        puzzle = puzzle_game.generate_puzzle(
+        puzzle = await puzzle_game.generate_puzzle(
             age=request.age,
             user_id=user_id
         )
         return GeneratePuzzleResponse(**puzzle)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="같은 퍼즐에 대한 요청이 동시에 처리되었습니다. 다시 시도해주세요")
     except ValueError as e:
         import traceback
         print("❌ ValueError 발생:", request.age, traceback.format_exc())
@@ -135,11 +138,13 @@ async def submit_answer(
 
     try:
         puzzle_game.db = db
-        result = puzzle_game.verify_answer(
+        result = await puzzle_game.verify_answer(
             puzzle_id=request.puzzle_id,
             user_answer=request.user_answer
         )
         return SubmitAnswerResponse(**result)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="같은 퍼즐에 대한 요청이 동시에 처리되었습니다. 다시 시도해주세요")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=f"퍼즐을 찾을 수 없습니다: {str(e)}")
     except Exception as e:
@@ -160,8 +165,10 @@ async def skip_puzzle(
 
     try:
         puzzle_game.db = db
-        result = puzzle_game.skip_puzzle(puzzle_id=request.puzzle_id, user_id=user.id)
+        result = await puzzle_game.skip_puzzle(puzzle_id=request.puzzle_id, user_id=user.id)
         return SkipPuzzleResponse(**result)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="같은 퍼즐에 대한 요청이 동시에 처리되었습니다. 다시 시도해주세요")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=f"퍼즐을 찾을 수 없습니다: {str(e)}")
     except Exception as e:
@@ -178,8 +185,10 @@ async def get_hint(request: GetHintRequest):
         raise HTTPException(status_code=503, detail="퍼즐 생성기가 준비되지 않았습니다")
 
     try:
-        result = puzzle_game.get_hint(puzzle_id=request.puzzle_id)
+        result = await puzzle_game.get_hint(puzzle_id=request.puzzle_id)
         return GetHintResponse(**result)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="같은 퍼즐에 대한 요청이 동시에 처리되었습니다. 다시 시도해주세요")
     except ValueError as e:
         raise HTTPException(status_code=404, detail=f"퍼즐을 찾을 수 없습니다: {str(e)}")
     except Exception as e:
@@ -193,7 +202,7 @@ async def get_session_status(user: Users = Depends(get_current_user)):
         raise HTTPException(status_code=503, detail="게임 서비스를 사용할 수 없습니다")
 
     try:
-        status = puzzle_game.get_user_session_status(user_id=user.id)  # ✅ user.id 사용
+        status = await puzzle_game.get_user_session_status(user_id=user.id)  # ✅ user.id 사용
         return SessionStatusResponse(**status)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"세션 상태 조회 실패: {str(e)}")
@@ -208,17 +217,6 @@ async def get_status():
     return {
         "ready": puzzle_game.is_ready(),
         "puzzle_count": puzzle_game.get_puzzle_count() if puzzle_game.is_ready() else 0,
-        "active_sessions": len(puzzle_game.game_sessions) if hasattr(puzzle_game, 'game_sessions') else 0
+        "active_sessions": await puzzle_game.sessions.count()  # Redis 백엔드는 None
     }
 
-
-@router.post("/cleanup")
-async def cleanup_old_sessions():
-    """오래된 세션과 퍼즐 정리 (관리자용)"""
-    if not puzzle_game:
-        raise HTTPException(status_code=503, detail="게임 서비스를 사용할 수 없습니다")
-    try:
-        puzzle_game.cleanup_old_sessions(hours=24)
-        return {"message": "오래된 세션과 퍼즐이 정리되었습니다"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"정리 실패: {str(e)}")
@@ -1,4 +1,5 @@
 # routes/word_chain.py
+import uuid
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
@@ -6,6 +7,7 @@ from sqlalchemy.orm import Session
 from data.postgresDB import SessionLocal
 from models import Users   # ✅ 사용자 모델 import
 from app.routes.login.login import get_current_user
+from app.games.session_backend import SessionConflict
 
 router = APIRouter(prefix="/wordchain", tags=["word_chain"])
 
@@ -76,15 +78,11 @@ async def start_game(
         # 🔥 DB 세션을 게임에 설정
         word_chain_game.db = db
 
-        # 🔥 게임 ID 생성
-        game_id = str(word_chain_game.get_game_count() + 1)
+        # 🔥 게임 ID 생성 (게임 수 기반 ID는 만료/삭제 후 진행 중인 게임과 겹칠 수 있음)
+        game_id = uuid.uuid4().hex
 
-        # 🔥 게임 생성 (create_game이 모든 초기화를 처리)
-        result = word_chain_game.create_game(game_id, request.difficulty)
-
-        # ✅ 게임 정보에 user_id 저장
-        if game_id in word_chain_game.games:
-            word_chain_game.games[game_id]['user_id'] = user.id
+        # 🔥 게임 생성 (create_game이 user_id 저장까지 모든 초기화를 처리)
+        result = await word_chain_game.create_game(game_id, request.difficulty, user_id=user.id)
 
         return StartGameResponse(
             game_id=game_id,
@@ -110,11 +108,13 @@ async def make_move(
 
     try:
         word_chain_game.db = db
-        result = word_chain_game.make_move(
+        result = await word_chain_game.make_move(
             request.game_id,
             request.word
         )
         return MoveResponse(**result)
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="같은 게임에 대한 요청이 동시에 처리되었습니다. 다시 시도해주세요")
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -126,7 +126,7 @@ async def restart_game(game_id: str):
         raise HTTPException(status_code=500, detail="게임이 초기화되지 않았습니다")
 
     try:
-        word_chain_game.restart_game(game_id)
+        await word_chain_game.restart_game(game_id)
         return {"message": "게임을 다시 시작합니다."}
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -139,7 +139,7 @@ async def get_history(game_id: str):
         raise HTTPException(status_code=500, detail="게임이 초기화되지 않았습니다")
 
     try:
-        history = word_chain_game.get_history(game_id)
+        history = await word_chain_game.get_history(game_id)
         return HistoryResponse(history=history)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -151,7 +151,7 @@ async def end_game(game_id: str):
     if word_chain_game is None:
         raise HTTPException(status_code=500, detail="게임이 초기화되지 않았습니다")
     try:
-        word_chain_game.delete_game(game_id)
+        await word_chain_game.delete_game(game_id)
         return {"message": "게임이 종료되었습니다"}
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
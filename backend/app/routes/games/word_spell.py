@@ -7,6 +7,7 @@ from typing import Optional, List
 from data.postgresDB import SessionLocal
 from models import Users   # ✅ 사용자 모델 import
 from app.routes.login.login import get_current_user
+from app.games.session_backend import SessionConflict
 
 router = APIRouter(prefix="/wordspell", tags=["word_spell"])
 
@@ -53,7 +54,7 @@ def set_word_spell_game(game_instance):
 
 # 🔹 게임 시작
 @router.post("/start", response_model=StartGameResponse)
-def start_game(
+async def start_game(
     request: StartGameRequest,
     db: Session = Depends(get_db),
     user: Users = Depends(get_current_user)   # ✅ 인증된 사용자
@@ -66,11 +67,7 @@ def start_game(
         word_spell_game.db = db
 
         # 🔥 게임 생성
-        result = word_spell_game.create_game(request.game_id, request.difficulty)
-
-        # ✅ 게임 정보에 user_id 저장
-        if request.game_id in word_spell_game.games:
-            word_spell_game.games[request.game_id]['user_id'] = user.id
+        result = await word_spell_game.create_game(request.game_id, request.difficulty, user_id=user.id)
         print(result)
         first_problem = result.get("problem", {})
 
@@ -87,7 +84,7 @@ def start_game(
 
 # 🔹 정답 제출
 @router.post("/submit", response_model=SubmitAnswerResponse)
-def submit_answer(
+async def submit_answer(
     req: SubmitAnswerRequest,
     db: Session = Depends(get_db),
     user: Users = Depends(get_current_user)   # ✅ 인증된 사용자
@@ -100,7 +97,7 @@ def submit_answer(
     try:
         word_spell_game.db = db
 
-        result = word_spell_game.submit_answer(
+        result = await word_spell_game.submit_answer(
             req.game_id,
             req.answer,
             user_id=user.id
@@ -133,6 +130,8 @@ def submit_answer(
 
     except HTTPException:
         raise
+    except SessionConflict:
+        raise HTTPException(status_code=409, detail="같은 게임에 대한 요청이 동시에 처리되었습니다. 다시 시도해주세요")
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"정답 제출 실패: {str(e)}")
@@ -8,6 +8,8 @@ from sqlalchemy import text, update
 from database import get_db_words, get_db
 from models import UserTests
 from Test.reading_assessment import ReadingAssessment
+from Test.reading_question_bank import ReadingQuestionBank
+from Ai.ai_common.kiwi_provider import get_kiwi_provider
 
 warnings.filterwarnings("ignore", category=FutureWarning, module="torch.nn.utils.weight_norm")
 
@@ -18,6 +20,13 @@ def set_reading_assessment(instance):
     global _READING_ASSESSMENT_INSTANCE
     _READING_ASSESSMENT_INSTANCE = instance
 
+_QUESTION_BANK: ReadingQuestionBank | None = None
+
+def set_question_bank(bank: ReadingQuestionBank):
+    """main.py에서 미리 만든 문제 은행을 주입하는 함수"""
+    global _QUESTION_BANK
+    _QUESTION_BANK = bank
+
 router = APIRouter()
 
 game_cache = {}
@@ -71,6 +80,18 @@ class EndGameRequest(BaseModel):
     test_type: str = "reading"
     question_history: list[dict]
 
+def _question_data(question_id: int, q: dict) -> QuestionData:
+    """create_question_from_qna 결과 → 응답용 QuestionData"""
+    return QuestionData(
+        question_id=question_id,
+        paragraph=q['context'],
+        question=q['question'],
+        choices=q['choices'],
+        correct_answer=q['correct_answer'],
+        correct_index=q['correct_index'],
+        age_level=q['age_level']
+    )
+
 def get_user_age_level(db: Session, user_id: int) -> int:
     """
     user_id 기준으로 vocabulary_age 가져오기
@@ -104,33 +125,33 @@ def start_reading_game(request: GameStartRequest, user_id: int, db: Session = De
     Returns:
         GameStartResponse: 생성된 모든 문제 리스트
     """
-    assessment = ReadingAssessment(db_session=db)
-
     try:
+        # 문제 은행에 미리 만들어 둔 문제 먼저, 부족한 만큼만 바로 생성
+        bank_questions = _QUESTION_BANK.pop(request.num_questions) if _QUESTION_BANK else []
+        missing = request.num_questions - len(bank_questions)
+        live_questions = []
+
+        if missing > 0:
+            assessment = ReadingAssessment(db_session=db)
+
+            # DB 단어 로드
+            try:
+                db_words = get_db_words(db)
+            except Exception as e:
+                print(f"⚠️ DB 단어 로드 실패: {e}")
+                db_words = []
+
+            # 랜덤 문단 생성
+            paragraphs = assessment.generate_random_paragraphs(missing)
+            # 오답 후보용 명사를 문단 전체에 대해 한 번에 분석해 캐시에 채움
+            get_kiwi_provider().nouns_many([paragraph for paragraph, _ in paragraphs])
+            # 문단 전체를 한 번에 T5로 생성
+            qna_results = assessment.generate_qna_batch(paragraphs, db_words=db_words)
+            for (paragraph, difficulty), qna_result in zip(paragraphs, qna_results):
+                live_questions.append(assessment.create_question_from_qna(paragraph, qna_result, age_level=difficulty))
 
-        # DB 단어 로드
-        try:
-            db_words = get_db_words(db)
-        except Exception as e:
-            print(f"⚠️ DB 단어 로드 실패: {e}")
-            db_words = []
-
-        # 랜덤 문단 생성
-        paragraphs = assessment.generate_random_paragraphs(request.num_questions)
         # 4. 각 문단마다 문제 생성
-        questions = []
-        for idx, (paragraph, difficulty) in enumerate(paragraphs, start=1):
-            qna_result = assessment.generate_qna_from_paragraph(age=difficulty, paragraph=paragraph, db_words=db_words)
-            q = assessment.create_question_from_qna(paragraph, qna_result, age_level=difficulty)
-            questions.append(QuestionData(
-                question_id=idx,
-                paragraph=q['context'],
-                question=q['question'],
-                choices=q['choices'],
-                correct_answer=q['correct_answer'],
-                correct_index=q['correct_index'],
-                age_level=q['age_level']
-            ))
+        questions = [_question_data(idx, q) for idx, q in enumerate(bank_questions + live_questions, start=1)]
 
             # 캐시에 저장
         with cache_lock:
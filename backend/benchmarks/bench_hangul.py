@@ -0,0 +1,48 @@
+"""
+초성 추출 마이크로 벤치마크: hgtk 글자별 분해 vs 표 기반(str.translate) vs NumPy 배치
+
+실행: python -m benchmarks.bench_hangul  (backend 디렉토리에서)
+"""
+import random, time
+
+import hgtk
+
+from app.games.hangul import HANGUL_BASE, HANGUL_COUNT, get_initials, get_initials_batch
+
+NUM_WORDS = 50_000
+
+
+def hgtk_initials(word: str) -> str:
+    """변경 전 InitialQuizGame._get_initials"""
+    try:
+        return ''.join([
+            hgtk.letter.decompose(ch)[0] if hgtk.checker.is_hangul(ch) else ch
+            for ch in word
+        ])
+    except Exception:
+        return word
+
+
+def timeit(name: str, fn, words):
+    t0 = time.perf_counter()
+    result = fn(words)
+    elapsed = time.perf_counter() - t0
+    print(f"{name:>16}: {elapsed * 1000:8.1f}ms  ({elapsed / len(words) * 1e9:7.0f}ns/단어)")
+    return result
+
+
+def main():
+    rng = random.Random(42)
+    words = [''.join(chr(HANGUL_BASE + rng.randrange(HANGUL_COUNT)) for _ in range(rng.randint(2, 4)))
+             for _ in range(NUM_WORDS)]
+
+    expected = timeit('hgtk', lambda ws: [hgtk_initials(w) for w in ws], words)
+    table = timeit('table(translate)', lambda ws: [get_initials(w) for w in ws], words)
+    batch = timeit('numpy batch', get_initials_batch, words)
+
+    assert expected == table == batch, "결과가 hgtk와 다릅니다"
+    print(f"단어 {NUM_WORDS}개, 세 방식 결과 일치")
+
+
+if __name__ == "__main__":
+    main()
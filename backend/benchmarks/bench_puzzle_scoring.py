@@ -0,0 +1,107 @@
+"""
+문장 퍼즐 채점 벤치마크: 쌍마다 Python DP vs 일괄 채점(단어 ID 배열 + 비트 병렬 LCS)
+
+- before: 변경 전 _calculate_position_similarity / _calculate_sequence_similarity (LCS 표 전체를 리스트로)
+- after: puzzle_scoring.score_answers로 (원문, 답안) 쌍을 한 번에 채점
+- after(ID): 미리 단어 ID 배열로 바꿔 둔 경우 (score_token_ids만)
+
+실행: python -m benchmarks.bench_puzzle_scoring  (backend 디렉토리에서)
+"""
+import random, time
+
+import numpy as np
+
+from app.games.puzzle_scoring import (POSITION_THRESHOLD, SEQUENCE_THRESHOLD, check_sentence_ending, encode_pairs,
+                                     score_answers, score_token_ids)
+
+NUM_PAIRS = 100_000
+WORDS = [f"word{i}" for i in range(400)] + ["the", "a", "and", "to", "was"]
+
+
+def legacy_position_similarity(original_words, user_words) -> float:
+    if len(original_words) != len(user_words):
+        return 0.0
+    correct_positions = sum(1 for i, word in enumerate(original_words)
+                            if i < len(user_words) and word == user_words[i])
+    return correct_positions / len(original_words)
+
+
+def legacy_sequence_similarity(original_words, user_words) -> float:
+    if len(original_words) != len(user_words):
+        return 0.0
+    m, n = len(original_words), len(user_words)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(1, m + 1):
+        for j in range(1, n + 1):
+            if original_words[i - 1] == user_words[j - 1]:
+                dp[i][j] = dp[i - 1][j - 1] + 1
+            else:
+                dp[i][j] = max(dp[i - 1][j], dp[i][j - 1])
+    return dp[m][n] / len(original_words)
+
+
+def legacy_score(originals, attempts) -> dict:
+    """변경 전 _verify의 판정을 쌍마다 실행"""
+    position, sequence, passed = [], [], []
+    for original, attempt in zip(originals, attempts):
+        if original.strip() == attempt.strip():
+            position.append(1.0), sequence.append(1.0), passed.append(True)
+            continue
+        a, b = original.strip().split(), attempt.strip().split()
+        p, s = legacy_position_similarity(a, b), legacy_sequence_similarity(a, b)
+        position.append(p), sequence.append(s)
+        passed.append(set(a) == set(b) and check_sentence_ending(a, b) and
+                      p >= POSITION_THRESHOLD and s >= SEQUENCE_THRESHOLD)
+    return {'position_similarity': np.array(position), 'sequence_similarity': np.array(sequence),
+            'passed': np.array(passed)}
+
+
+def make_pairs(rng: random.Random):
+    """아이들이 제출할 만한 답안: 그대로 / 두 단어 교환 / 섞기 / 단어 빠짐"""
+    originals, attempts = [], []
+    for _ in range(NUM_PAIRS):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(3, 18))]
+        answer = list(words)
+        kind = rng.random()
+        if kind < 0.3:
+            i, j = rng.randrange(len(answer)), rng.randrange(len(answer))
+            answer[i], answer[j] = answer[j], answer[i]
+        elif kind < 0.7:
+            rng.shuffle(answer)
+        elif kind < 0.85:
+            answer.pop(rng.randrange(len(answer)))
+        originals.append(' '.join(words) + '.')
+        attempts.append(' '.join(answer) + '.')
+    return originals, attempts
+
+
+def main():
+    originals, attempts = make_pairs(random.Random(42))
+
+    t0 = time.perf_counter()
+    expected = legacy_score(originals, attempts)
+    before = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    result = score_answers(originals, attempts)
+    after = time.perf_counter() - t0
+
+    encoded = encode_pairs(originals, attempts)
+    t0 = time.perf_counter()
+    by_ids = score_token_ids(*encoded)
+    after_ids = time.perf_counter() - t0
+
+    for key in ('position_similarity', 'sequence_similarity'):
+        assert np.allclose(expected[key], result[key]), f"{key} 결과가 다릅니다"
+    assert (expected['passed'] == result['passed']).all(), "정답 판정이 다릅니다"
+    assert (by_ids['passed'] == result['passed']).all(), "단어 ID 채점 결과가 다릅니다"
+
+    print(f"before(Python DP): {before:.2f}s  ({before / NUM_PAIRS * 1e6:.1f}µs/쌍)")
+    print(f" after(일괄 채점): {after:.2f}s  ({after / NUM_PAIRS * 1e6:.1f}µs/쌍)")
+    print(f"  after(단어 ID): {after_ids:.2f}s  ({after_ids / NUM_PAIRS * 1e6:.1f}µs/쌍)")
+    print(f"{NUM_PAIRS}쌍, 결과 일치, 문장 {before / after:.1f}배 / 단어 ID {before / after_ids:.1f}배 빠름 "
+          f"(정답 {int(result['passed'].sum())}개)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+문장 퍼즐 생성기 시작 시간 / 메모리(RSS) 벤치마크
+
+- eager: 기존 방식 (생성자에서 SentenceTransformer까지 로드)
+- lazy: 모델은 calculate_similarity에서 처음 쓸 때 로드 (퍼즐 출제/채점에는 필요 없음)
+
+워커 하나가 뜨는 상황을 흉내 내기 위해 모드마다 새 프로세스에서 측정한다.
+실행: python -m benchmarks.bench_puzzle_startup [pkl 경로]  (backend 디렉토리에서)
+"""
+import json, subprocess, sys
+
+DEFAULT_DATA_PATH = "app/games/data/pickle/processed_sentences.pkl"
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+from app.games.train_embedding import FairytalePuzzleGenerator
+generator = FairytalePuzzleGenerator(data_path=sys.argv[1])
+if sys.argv[2] == 'eager':
+    generator.model
+generator.generate_puzzle(age=sorted(generator.sentences_by_age)[0])
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+"""
+
+
+def measure(data_path: str, mode: str) -> dict:
+    result = subprocess.run([sys.executable, '-c', CHILD, data_path, mode],
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    data_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_DATA_PATH
+    results = {mode: measure(data_path, mode) for mode in ('eager', 'lazy')}
+
+    for mode, r in results.items():
+        print(f"{mode:>5}: 시작 {r['seconds']:.2f}s, 최대 RSS {r['max_rss_mb']:.0f}MB")
+    print(f"절감: {results['eager']['seconds'] - results['lazy']['seconds']:.2f}s, "
+          f"{results['eager']['max_rss_mb'] - results['lazy']['max_rss_mb']:.0f}MB (워커당)")
+
+
+if __name__ == "__main__":
+    main()
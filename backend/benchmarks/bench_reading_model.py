@@ -0,0 +1,112 @@
+"""
+문해력 T5 모델 백엔드 벤치마크 (CPU 전용): peft-fp32 vs merged-fp32 vs int8 (+ onnx, optimum이 있을 때)
+
+int8/onnx는 실험용 백엔드라 여기서만 로드 (결과를 확인한 뒤 Test/reading_model.BACKENDS로 옮길 것)
+
+- 같은 문단 NUM_PARAGRAPHS개를 QNA_BATCH_SIZE개씩 greedy 생성 (샘플링 없이 비교)
+- 백엔드마다 별도 프로세스에서 실행 → 로드 시간, 생성 토큰/초, 최대 RSS
+- 품질: 정답 파싱 성공률 + peft 결과와 파싱한 정답/질문이 같은 비율
+
+실행: python -m benchmarks.bench_reading_model [문단 수]  (backend 디렉토리에서)
+"""
+import json, os, random, resource, subprocess, sys, time
+
+NUM_PARAGRAPHS = 32
+MAX_NEW_TOKENS = 128
+
+
+def load_paragraphs(count: int, seed: int = 0) -> list:
+    from Test.reading_assessment import ReadingAssessment, filepath
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    stories = [obj["labeled_text"] for obj in (data if isinstance(data, list) else [data]) if obj.get("labeled_text")]
+    rng = random.Random(seed)
+    paragraphs = []
+    for labeled_text in rng.sample(stories, min(count, len(stories))):
+        index = rng.randrange(1, len(labeled_text) - 1) if len(labeled_text) >= 3 else 0
+        paragraphs.append(ReadingAssessment.create_paragraph_from_sentences(labeled_text, index))
+    return paragraphs
+
+
+def worker(backend: str, count: int):
+    """한 백엔드로 생성하고 결과를 JSON 한 줄로 출력 (별도 프로세스)"""
+    import torch
+    from Test.reading_assessment import QNA_BATCH_SIZE
+    from Test.reading_model import load_reading_model
+
+    paragraphs = load_paragraphs(count)
+    start = time.perf_counter()
+    model, tokenizer, device = load_reading_model(backend, device="cpu", experimental=True)
+    load_seconds = time.perf_counter() - start
+
+    prompts = [f"문단을 읽고 {age}세 수준의 질문과 정답을 만들어 주세요.\n\n문단: {paragraph}" for paragraph, age in paragraphs]
+    outputs, new_tokens = [], 0
+    start = time.perf_counter()
+    for i in range(0, len(prompts), QNA_BATCH_SIZE):
+        inputs = tokenizer(prompts[i:i + QNA_BATCH_SIZE], return_tensors="pt", padding=True,
+                           truncation=True, max_length=512).to(device)
+        with torch.no_grad():
+            generated = model.generate(**inputs, max_new_tokens=MAX_NEW_TOKENS, do_sample=False)
+        # 디코더 시작 토큰과 패딩은 제외
+        new_tokens += int((generated[:, 1:] != tokenizer.pad_token_id).sum())
+        outputs.extend(tokenizer.batch_decode(generated, skip_special_tokens=True))
+    seconds = time.perf_counter() - start
+
+    print(json.dumps({
+        'backend': backend,
+        'load_seconds': load_seconds,
+        'seconds': seconds,
+        'tokens_per_second': new_tokens / seconds,
+        'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'outputs': outputs,
+    }, ensure_ascii=False))
+
+
+def run(backend: str, count: int) -> dict:
+    env = dict(os.environ, CUDA_VISIBLE_DEVICES="")
+    result = subprocess.run([sys.executable, "-m", "benchmarks.bench_reading_model", "--worker", backend, str(count)],
+                            capture_output=True, text=True, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "실패")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    from Test.reading_assessment import ReadingAssessment
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_PARAGRAPHS
+    backends = ['peft', 'merged', 'int8']
+    try:
+        import optimum.onnxruntime  # noqa: F401
+        backends.append('onnx')
+    except ImportError:
+        print("optimum[onnxruntime]이 없어 onnx는 건너뜀")
+
+    # 모델 로드 없이 파싱(_split_qna)만 사용
+    parser = ReadingAssessment.__new__(ReadingAssessment)
+    print(f"문단 {count}개, greedy, max_new_tokens={MAX_NEW_TOKENS}, CPU")
+    reference = None
+    for backend in backends:
+        try:
+            result = run(backend, count)
+        except Exception as e:
+            print(f"{backend:>8}: 실패 ({e})")
+            continue
+
+        parsed = [parser._split_qna(output) for output in result['outputs']]
+        if reference is None:
+            reference, base_speed = parsed, result['tokens_per_second']
+        answered = sum(1 for _, answer in parsed if answer) / len(parsed)
+        same_answer = sum(a == b for (_, a), (_, b) in zip(parsed, reference)) / len(parsed)
+        same_question = sum(a == b for (a, _), (b, _) in zip(parsed, reference)) / len(parsed)
+        print(f"{backend:>8}: {result['tokens_per_second']:7.1f} tok/s (x{result['tokens_per_second'] / base_speed:.2f})  "
+              f"RSS {result['max_rss_mb']:7.0f}MB  로드 {result['load_seconds']:5.1f}s  "
+              f"정답 파싱 {answered:.0%}  peft와 같은 정답 {same_answer:.0%} / 질문 {same_question:.0%}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        worker(sys.argv[2], int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,145 @@
+"""
+오답 보기 유사 단어 검색 벤치마크 (voca_labels 5만 행, 768차원)
+
+- memory: 변경 전처럼 문제마다 전체 거리를 계산해 전부 정렬 vs 정규화 행렬 곱 + 거리 구간 argpartition
+- db (DATABASE_URL이 있을 때): 변경 전 자기 JOIN 쿼리 vs 정답 임베딩 조회 + HNSW 인덱스 검색
+  실제 테이블은 건드리지 않도록 같은 이름의 임시 테이블(TEMP voca_labels)을 만들어서 측정
+
+실행: python -m benchmarks.bench_similar_words [행 수]  (backend 디렉토리에서)
+"""
+import os, sys, time, statistics
+
+import numpy as np
+
+from Test.similar_words import (CANDIDATE_FACTOR, EMBEDDING_DIM, MAX_CANDIDATES, MAX_DISTANCE, MIN_DISTANCE,
+                                EmbeddingMatrix, search_db)
+
+NUM_ROWS = 50_000
+NUM_QUERIES = 50
+LIMIT = 10
+
+LEGACY_QUERY = """
+    SELECT v2.word, 1 - (v1.embedding <=> v2.embedding) AS similarity
+    FROM voca_labels v1
+    JOIN voca_labels v2 ON v1.word != v2.word
+    WHERE v1.word = :correct_answer
+    AND (v1.embedding <=> v2.embedding) BETWEEN :min_distance AND :max_distance
+    ORDER BY v1.embedding <=> v2.embedding DESC
+    LIMIT :limit
+"""
+
+
+def make_embeddings(num_rows: int, seed: int = 42):
+    rng = np.random.default_rng(seed)
+    # 실제 임베딩처럼 몇 개의 주제 방향 주변에 모이도록
+    centers = rng.standard_normal((64, EMBEDDING_DIM)).astype(np.float32)
+    embeddings = centers[rng.integers(0, 64, num_rows)] + 0.8 * rng.standard_normal((num_rows, EMBEDDING_DIM)).astype(np.float32)
+    # 1%는 주제 반대 방향의 이상치 (MAX_DISTANCE보다 멀어서 결과에서 빠져야 하는 단어)
+    outliers = rng.choice(num_rows, num_rows // 100, replace=False)
+    embeddings[outliers] = -centers[rng.integers(0, 64, len(outliers))] \
+        + 0.1 * rng.standard_normal((len(outliers), EMBEDDING_DIM)).astype(np.float32)
+    words = [f"단어{i}" for i in range(num_rows)]
+    return words, embeddings
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    print(f"{name:>24}: p50 {statistics.median(timings) * 1000:8.2f}ms  "
+          f"p99 {timings[int(len(timings) * 0.99) - 1] * 1000:8.2f}ms")
+
+
+def legacy_full_sort(matrix: np.ndarray, row: int) -> list:
+    """변경 전 쿼리와 같은 작업량: 모든 행과 거리 계산 → 전체 정렬 → 거리 구간 필터"""
+    distances = 1.0 - matrix @ matrix[row]
+    order = np.argsort(-distances, kind='stable')
+    return [int(i) for i in order if i != row and MIN_DISTANCE <= distances[i] <= MAX_DISTANCE][:LIMIT]
+
+
+def replay_band_query(matrix: np.ndarray, row: int) -> list:
+    """search_db와 같은 후보 넓히기를 정확한 최근접 검색으로 재현 (-a와 가까운 후보 → 거리 구간 필터)"""
+    distances = 1.0 - matrix @ matrix[row]
+    order = [int(i) for i in np.argsort(-distances, kind='stable') if i != row]
+    candidates = min(LIMIT * CANDIDATE_FACTOR, MAX_CANDIDATES)
+    while True:
+        result = [i for i in order[:candidates] if MIN_DISTANCE <= distances[i] <= MAX_DISTANCE][:LIMIT]
+        if len(result) >= LIMIT or candidates >= MAX_CANDIDATES:
+            return result
+        candidates = min(candidates * CANDIDATE_FACTOR, MAX_CANDIDATES)
+
+
+def bench_memory(words, embeddings, queries):
+    index = EmbeddingMatrix(words, embeddings)
+    legacy, band = [], []
+    for row in queries:
+        t0 = time.perf_counter()
+        expected = legacy_full_sort(index.matrix, row)
+        legacy.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        result = index.search(words[row], LIMIT)
+        band.append(time.perf_counter() - t0)
+        assert result == [words[i] for i in expected], "메모리 검색 결과가 다릅니다"
+        # 인덱스 검색이 정확하다면 DB 쿼리도 같은 결과여야 함 (가장 먼 후보들이 구간 밖일 때 넓히기 확인)
+        assert replay_band_query(index.matrix, row) == expected, "DB 검색 재현 결과가 다릅니다"
+
+    report("memory before(full sort)", legacy)
+    report("memory after(band)", band)
+
+
+def bench_db(database_url: str, words, embeddings, queries):
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+
+    engine = create_engine(database_url)
+    with Session(engine) as db:
+        db.execute(text(f"CREATE TEMP TABLE voca_labels (id serial PRIMARY KEY, word varchar(50), "
+                        f"embedding vector({EMBEDDING_DIM}))"))
+        db.execute(text("INSERT INTO voca_labels (word, embedding) VALUES (:word, CAST(:embedding AS vector))"),
+                   [{'word': w, 'embedding': '[' + ','.join(f'{x:.5f}' for x in e) + ']'}
+                    for w, e in zip(words, embeddings)])
+        t0 = time.perf_counter()
+        db.execute(text("CREATE INDEX ON voca_labels USING hnsw (embedding vector_cosine_ops)"))
+        db.execute(text("ANALYZE voca_labels"))
+        print(f"HNSW 인덱스 생성: {time.perf_counter() - t0:.1f}s")
+
+        legacy, indexed, same = [], [], 0
+        for row in queries:
+            t0 = time.perf_counter()
+            expected = db.execute(text(LEGACY_QUERY), {'correct_answer': words[row], 'limit': LIMIT,
+                                                       'min_distance': MIN_DISTANCE,
+                                                       'max_distance': MAX_DISTANCE}).fetchall()
+            legacy.append(time.perf_counter() - t0)
+
+            t0 = time.perf_counter()
+            result = search_db(db, words[row], LIMIT, MIN_DISTANCE, MAX_DISTANCE)
+            indexed.append(time.perf_counter() - t0)
+
+            expected = [w for w, _ in expected]
+            assert len(result) == len(expected), f"DB 검색 결과 개수가 다릅니다: {words[row]}"
+            assert all(MIN_DISTANCE <= d <= MAX_DISTANCE for _, d in result), f"거리 구간 밖 단어: {words[row]}"
+            same += [w for w, _ in result] == expected
+
+        report("db before(self join)", legacy)
+        report("db after(hnsw)", indexed)
+        # HNSW는 근사 검색이라 가장 먼 단어 몇 개가 바뀔 수 있음 → 개수/구간은 항상, 순서까지 같은 비율은 90% 이상
+        print(f"{'db 결과 일치':>24}: {same}/{len(queries)}")
+        assert same >= 0.9 * len(queries), "DB 검색 결과가 변경 전 쿼리와 너무 다릅니다"
+        db.rollback()
+
+
+def main():
+    num_rows = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_ROWS
+    words, embeddings = make_embeddings(num_rows)
+    queries = np.random.default_rng(0).integers(0, num_rows, NUM_QUERIES).tolist()
+    print(f"{num_rows}행 x {EMBEDDING_DIM}차원, 질의 {NUM_QUERIES}개")
+
+    bench_memory(words, embeddings, queries)
+    database_url = os.getenv("DATABASE_URL")
+    if database_url:
+        bench_db(database_url, words, embeddings, queries)
+    else:
+        print("DATABASE_URL이 없어 DB 측정은 건너뜀")
+
+
+if __name__ == "__main__":
+    main()
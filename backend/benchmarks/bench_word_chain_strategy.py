@@ -0,0 +1,51 @@
+"""
+끝말잇기 컴퓨터 전략 벤치마크 (인덱스 생성 시간 + 한 수 선택 시간)
+
+실행: python -m benchmarks.bench_word_chain_strategy  (backend 디렉토리에서)
+"""
+import random, time, statistics
+
+from app.games.word_chain_index import WordChainIndex
+from app.games.word_chain_strategy import WordChainStrategy
+
+NUM_WORDS = 50_000
+NUM_MOVES = 20_000
+
+
+def make_words(n: int, seed: int = 42) -> list[str]:
+    rng = random.Random(seed)
+    # 실제 사전처럼 자주 쓰이는 글자에 몰리도록 음절 일부만 사용
+    syllables = [chr(0xAC00 + i) for i in rng.sample(range(11172), 1500)]
+    words = set()
+    while len(words) < n:
+        words.add(''.join(rng.choice(syllables) for _ in range(rng.randint(2, 4))))
+    return list(words)
+
+
+def main():
+    words = make_words(NUM_WORDS)
+
+    start = time.perf_counter()
+    index = WordChainIndex(words)
+    strategy = WordChainStrategy(index)
+    build_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(0)
+    used = set(rng.sample(words, 30))
+    chars = [w[-1] for w in rng.sample(words, NUM_MOVES)]
+
+    for name, kind, trap in [('easy', 0.9, 0.0), ('medium', 0.6, 0.2), ('hard', 0.2, 0.7)]:
+        timings = []
+        for char in chars:
+            t0 = time.perf_counter()
+            strategy.choose(char, used, kind_rate=kind, trap_rate=trap)
+            timings.append((time.perf_counter() - t0) * 1e6)
+        timings.sort()
+        print(f"{name:>6}: p50={statistics.median(timings):.1f}µs "
+              f"p99={timings[int(len(timings) * 0.99)]:.1f}µs max={timings[-1]:.1f}µs")
+
+    print(f"단어 {NUM_WORDS}개, 인덱스+전략 생성 {build_ms:.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
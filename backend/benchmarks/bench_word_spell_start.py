@@ -0,0 +1,90 @@
+"""
+초성퀴즈 /start 지연시간 벤치마크 (p50/p99)
+
+- before: 기존 방식 (문제 하나당 krdict 요청 1회를 순차 실행, 최대 50회)
+- after(cold): 난이도별 후보 풀을 처음 만들 때 (시작 글자 14개 동시 요청)
+- after(warm): 캐시된 후보 풀에서 10문제 추출
+
+krdict 대신 지연시간을 흉내 내는 가짜 클라이언트를 쓴다.
+실행: python -m benchmarks.bench_word_spell_start  (backend 디렉토리에서)
+"""
+import asyncio, random, time, statistics
+
+from app.games.word_spell_game import InitialQuizGame
+
+LATENCY_MS = (80, 250)   # krdict 응답 지연 범위
+NUM_GAMES = 30
+
+
+class FakeKrdictClient:
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.requests = 0
+
+    async def search(self, q: str, level: str = None, num: int = 100, **kwargs):
+        self.requests += 1
+        await asyncio.sleep(self.rng.uniform(*LATENCY_MS) / 1000)
+        start_char = q.rstrip('*')
+        rng = random.Random(f'{start_char}{level}')
+        return [
+            {'word': start_char + ''.join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(1, 3))),
+             'pos': '명사', 'definition': '뜻풀이', 'level': level}
+            for _ in range(num)
+        ]
+
+    async def aclose(self):
+        pass
+
+
+async def legacy_create_game(game: InitialQuizGame, difficulty: str) -> list:
+    """변경 전 create_game: 문제 하나마다 krdict를 순차 호출"""
+    level = game.level_map.get(difficulty, "level2")
+    problems, used_initials, attempts = [], set(), 0
+    while len(problems) < 10 and attempts < 50:
+        attempts += 1
+        items = await game.krdict.search(f'{random.choice(game.start_chars)}*', level=level, num=10)
+        candidates = [i for i in items if 2 <= len(i['word']) <= 4 and i['word'][-1] not in game.blacklist]
+        if not candidates:
+            continue
+        item = random.choice(candidates)
+        initial = game._get_initials(item['word'])
+        if initial not in used_initials:
+            problems.append(item)
+            used_initials.add(initial)
+    return problems
+
+
+def report(name: str, timings: list):
+    timings = sorted(timings)
+    p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+    print(f"{name:>12}: p50={statistics.median(timings):8.1f}ms  p99={p99:8.1f}ms  (n={len(timings)})")
+
+
+async def main():
+    game = InitialQuizGame(api_key='bench', krdict=FakeKrdictClient())
+
+    before = []
+    for _ in range(NUM_GAMES):
+        t0 = time.perf_counter()
+        await legacy_create_game(game, 'medium')
+        before.append((time.perf_counter() - t0) * 1000)
+    report('before', before)
+
+    cold = []
+    for _ in range(5):
+        game.word_pools.clear()
+        t0 = time.perf_counter()
+        await game.create_game('bench', 'medium')
+        cold.append((time.perf_counter() - t0) * 1000)
+    report('after(cold)', cold)
+
+    warm = []
+    for i in range(NUM_GAMES * 10):
+        t0 = time.perf_counter()
+        await game.create_game(f'bench-{i}', 'medium')
+        warm.append((time.perf_counter() - t0) * 1000)
+    report('after(warm)', warm)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
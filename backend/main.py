@@ -13,6 +13,11 @@ from dotenv import load_dotenv
 from app.games.sentence_puzzle_game import SentencePuzzleGame
 from app.games.word_chain_game import WordChainGame
 from app.games.word_spell_game import InitialQuizGame
+from app.games.word_lexicon import WordLexicon
+from app.games.krdict_client import KrdictClient
+from app.games.session_backend import create_session_backend
+from app.games.game_result_writer import GameResultWriter
+from data.postgresDB import SessionLocal
 from app.routes.admin import admin_router
 from app.routes.games import game_router, sentence_puzzle, word_chain, word_spell
 
@@ -28,13 +33,15 @@ from app.routes.edit_user.edit_user import router as edit_user
 from app.routes.forum.parent import router as parent
 from app.routes.forum.student import router as readings
 from app.routes.login import auth_router
-from app.routes.tests import test_router
+from app.routes.tests import test_router, reading as reading_routes
 from app.routes.writings.activities import router as activities
 from app.subscription.billiing_scheduler import start_scheduler
 
 # 테스트 / 평가 관련
-from Test.vocabulary_assessment import VocabularyAssessment
+from Test.vocabulary_assessment import VocabularyAssessment, get_sentence_index
+from Test.distractor_table import get_distractor_table
 from Test.reading_assessment import ReadingAssessment
+from Test.reading_question_bank import ReadingQuestionBank
 
 import models
 from database import init_db
@@ -103,18 +110,41 @@ async def startup_event():
     start_scheduler()
     print("FastAPI + APScheduler 자동결제 시스템 시작")
     # 게임 초기화
-    puzzle_game = SentencePuzzleGame(data_path="app/games/data/pickle/processed_sentences.pkl")
+    # SESSION_REDIS_URL이 있으면 세 게임의 세션을 Redis에 저장 (워커 여러 개 가능), 없으면 게임별 메모리 저장소
+    session_backend = create_session_backend()
+    # 끝난 게임 결과는 모아서 한 번에 INSERT (요청 경로에서 commit을 기다리지 않음)
+    result_writer = GameResultWriter(session_factory=SessionLocal)
+    result_writer.start()
+    puzzle_game = SentencePuzzleGame(data_path="app/games/data/pickle/processed_sentences.pkl", sessions=session_backend,
+                                     results=result_writer)
     sentence_puzzle.set_puzzle_game(puzzle_game)
 
-    word_chain_game = WordChainGame(api_key=korean_api_key)
+    # 끝말잇기 명사 사전은 시작 시 한 번만 로드 (사전에 없는 단어만 krdict 조회)
+    word_lexicon = WordLexicon()
+    # krdict 커넥션 풀은 두 게임이 공유
+    krdict_client = KrdictClient(api_key=korean_api_key)
+    word_chain_game = WordChainGame(api_key=korean_api_key, lexicon=word_lexicon, krdict=krdict_client,
+                                    sessions=session_backend, results=result_writer)
     word_chain.set_word_chain_game(word_chain_game)
 
-    word_spell_game = InitialQuizGame(api_key=korean_api_key)
+    word_spell_game = InitialQuizGame(api_key=korean_api_key, krdict=krdict_client, use_bank=True,
+                                      sessions=session_backend, results=result_writer)
+    # 초성퀴즈 문제 은행은 백그라운드에서 채움 (/start는 큐에서 꺼내기만 함)
+    word_spell_game.bank.start()
     word_spell.set_word_spell_game(word_spell_game)
 
     app.state.puzzle_game = puzzle_game
     app.state.word_chain_game = word_chain_game
     app.state.word_spell_game = word_spell_game
+    app.state.krdict_client = krdict_client
+    app.state.session_backend = session_backend
+    app.state.result_writer = result_writer
+
+    # 만료된 게임 세션은 백그라운드에서 주기적으로 정리 (Redis는 키 만료로 처리)
+    game_sessions = {id(g.sessions): g.sessions for g in (puzzle_game, word_chain_game, word_spell_game)}
+    app.state.game_sessions = list(game_sessions.values())
+    for sessions in app.state.game_sessions:
+        sessions.start_sweeper()
 
     print("게임 초기화 완료 (한 번만 실행됨)")
     print("서버 시작: 최소 데이터 로딩 중...")
@@ -123,13 +153,23 @@ async def startup_event():
 
         print("어휘력 평가 시스템 초기화 중...")
         vocab = VocabularyAssessment()
+        # 문제 문장 인덱스는 여기서 한 번 로드 (요청마다 JSON을 읽지 않음)
+        get_sentence_index()
+        # 오답 보기 표도 첫 요청 전에 로드 (파일이 없으면 DB 검색 사용)
+        get_distractor_table()
 
         print("문해력 평가 시스템 초기화 중...")
         reading = ReadingAssessment()
+        # 문해력 문제는 백그라운드에서 T5로 미리 만들어 둠 (/start는 은행에서 꺼내고 부족할 때만 바로 생성)
+        # 워커가 여러 개면 스냅샷 잠금을 얻은 워커 하나만 채우고 내보냄 (나머지 워커는 바로 생성)
+        reading_bank = ReadingQuestionBank(session_factory=SessionLocal)
+        reading_bank.start()
+        reading_routes.set_question_bank(reading_bank)
 
         #  FastAPI 전역 state 저장
         app.state.vocab = vocab
         app.state.reading = reading
+        app.state.reading_bank = reading_bank
 
         from app.routes.tests.result_tts import TTS_AVAILABLE
         print("TTS 엔진 로딩" if TTS_AVAILABLE else "TTS 엔진 사용 불가 - 음성 기능 비활성화")
@@ -138,6 +178,38 @@ async def startup_event():
         print(f"초기화 실패: {e}")
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    result_writer = getattr(app.state, "result_writer", None)
+    if result_writer:
+        # 아직 저장하지 않은 게임 결과 저장
+        await result_writer.stop()
+
+    word_spell_game = getattr(app.state, "word_spell_game", None)
+    if word_spell_game and word_spell_game.bank:
+        # 남은 문제 은행을 스냅샷으로 저장해서 재시작 시 바로 사용
+        await word_spell_game.bank.stop()
+
+    reading_bank = getattr(app.state, "reading_bank", None)
+    if reading_bank:
+        await reading_bank.stop()
+
+    puzzle_game = getattr(app.state, "puzzle_game", None)
+    if puzzle_game and puzzle_game.puzzle_generator:
+        await puzzle_game.puzzle_generator.answer_encoder.aclose()
+
+    krdict_client = getattr(app.state, "krdict_client", None)
+    if krdict_client:
+        await krdict_client.aclose()
+    print("krdict 클라이언트 종료")
+
+    for sessions in getattr(app.state, "game_sessions", []):
+        await sessions.stop_sweeper()
+
+    session_backend = getattr(app.state, "session_backend", None)
+    if session_backend:
+        await session_backend.aclose()
+
 # ---------------------------------------------------
 #  전역 예외 핸들러
 # ---------------------------------------------------
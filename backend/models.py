@@ -339,6 +339,11 @@ class UserGames(Base):
 
 class VocaLabels(Base):
     __tablename__ = "voca_labels"
+    __table_args__ = (
+        # 오답 보기 검색 (Test/similar_words.py) - 코사인 거리 근접 이웃 인덱스
+        Index('voca_labels_embedding_hnsw', 'embedding', postgresql_using='hnsw',
+              postgresql_ops={'embedding': 'vector_cosine_ops'}),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     word = Column(String(50), nullable=False)
@@ -0,0 +1,5 @@
+# tests/conftest.py (테스트 공통 설정)
+import os
+
+# models/database를 import할 때 엔진을 만들기 위한 값 (테스트는 실제 DB에 연결하지 않음)
+os.environ.setdefault("DATABASE_URL", "sqlite://")
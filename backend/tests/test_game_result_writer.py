@@ -0,0 +1,73 @@
+# tests/test_game_result_writer.py (게임 결과 write-behind 저장 - 종료 시 남은 행 보존)
+import asyncio
+import threading
+
+from app.games.game_result_writer import GameResultWriter
+
+
+class FakeWriter(GameResultWriter):
+    """DB 대신 메모리에 저장, release가 set될 때까지 INSERT가 끝나지 않음"""
+
+    def __init__(self, **kwargs):
+        super().__init__(session_factory=None, **kwargs)
+        self.saved = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def _write(self, rows):
+        self.started.set()
+        self.release.wait(5)
+        self.saved.extend(row['score'] for row in rows)
+
+    def _write_each(self, rows):
+        self._write(rows)
+        return []
+
+    def _ping(self):
+        return True
+
+
+def enqueue(writer, scores):
+    for score in scores:
+        writer.enqueue(user_id=1, game_type='wordchain', difficulty='easy', score=score)
+
+
+def test_stop_waits_for_in_flight_write():
+    async def scenario():
+        writer = FakeWriter(batch_size=2, flush_interval=60)
+        writer.start()
+        enqueue(writer, range(5))
+        await asyncio.to_thread(writer.started.wait, 5)
+
+        # 첫 배치를 저장하는 중에 종료 → 꺼내 둔 배치와 그 뒤에 들어온 행까지 모두 저장
+        stopping = asyncio.create_task(writer.stop())
+        await asyncio.sleep(0.05)
+        enqueue(writer, [5])
+        writer.release.set()
+        await stopping
+
+        assert sorted(writer.saved) == list(range(6))
+        assert writer.pending_count() == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_flush_requeues_rows():
+    async def scenario():
+        writer = FakeWriter(batch_size=2)
+        enqueue(writer, range(5))
+        flushing = asyncio.create_task(writer.flush())
+        await asyncio.to_thread(writer.started.wait, 5)
+
+        flushing.cancel()
+        await asyncio.gather(flushing, return_exceptions=True)
+        # 저장 중이던 배치와 아직 시도하지 않은 행이 순서대로 큐에 남음
+        assert [row['score'] for row in writer._pending] == [0, 1, 2, 3, 4]
+
+        writer.release.set()
+        await asyncio.sleep(0.05)
+        writer.saved.clear()
+        assert await writer.flush() == 5
+        assert writer.saved == [0, 1, 2, 3, 4]
+
+    asyncio.run(scenario())
@@ -0,0 +1,53 @@
+# tests/test_game_routes.py (게임 라우트 - 같은 세션을 동시에 갱신하면 409)
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.games.game_store import WordChainState
+from app.games.session_backend import MemorySessionBackend
+from app.routes.games import word_chain
+from app.routes.login.login import get_current_user
+
+
+class RacingGame:
+    """make_move 도중 다른 요청(다른 워커)이 같은 게임을 먼저 저장하는 끝말잇기 게임"""
+
+    def __init__(self, sessions: MemorySessionBackend):
+        self.sessions = sessions
+        self.db = None
+
+    async def make_move(self, game_id: str, word: str) -> dict:
+        state, version = await self.sessions.load(game_id)
+        other, _ = await self.sessions.load(game_id)
+        other.history.append('다른 요청')
+        await self.sessions.commit(game_id, other, version)
+
+        state.history.append(word)
+        await self.sessions.commit(game_id, state, version)
+        return {'success': True, 'message': ''}
+
+
+def make_client(game) -> TestClient:
+    app = FastAPI()
+    app.include_router(word_chain.router)
+    app.dependency_overrides[word_chain.get_db] = lambda: None
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    word_chain.set_word_chain_game(game)
+    return TestClient(app)
+
+
+def test_move_conflict_returns_409():
+    sessions = MemorySessionBackend()
+    asyncio.run(sessions.commit('g1', WordChainState('g1', 'easy', first_word='사과'), 0))
+
+    try:
+        response = make_client(RacingGame(sessions)).post('/wordchain/move', json={'game_id': 'g1', 'word': '과자'})
+    finally:
+        word_chain.set_word_chain_game(None)
+
+    assert response.status_code == 409
+    # 먼저 저장한 요청만 반영됨
+    state, version = asyncio.run(sessions.load('g1'))
+    assert (state.history, version) == (['사과', '다른 요청'], 2)
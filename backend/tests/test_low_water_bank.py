@@ -0,0 +1,73 @@
+# tests/test_low_water_bank.py (문제 은행 공통 - 워커 하나만 채우기, 스냅샷 저장)
+import asyncio
+import json
+import os
+import threading
+
+from app.games.low_water_bank import LowWaterBank
+
+
+class ListBank(LowWaterBank):
+    """채울 때마다 문제 하나를 추가하는 은행"""
+
+    def __init__(self, snapshot_path):
+        super().__init__(snapshot_path)
+        self.items = []
+
+    async def _fill(self):
+        self.items.append(len(self.items))
+
+    def _snapshot_data(self):
+        return list(self.items)
+
+    def _restore_snapshot(self, data):
+        self.items.extend(data)
+
+
+def test_only_one_worker_fills(tmp_path):
+    path = str(tmp_path / 'bank.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(['saved'], f)
+
+    async def scenario():
+        # 같은 스냅샷을 쓰는 워커 두 개 (flock은 열린 파일마다 잡히므로 한 프로세스에서도 확인 가능)
+        first, second = ListBank(path), ListBank(path)
+        first.start(interval=0.05)
+        await asyncio.sleep(0.01)
+        second.start(interval=0.05)
+        await asyncio.sleep(0.02)
+
+        assert first.is_owner and not second.is_owner
+        # 스냅샷은 채우는 워커만 읽음 → 같은 문제를 두 워커가 내보내지 않음
+        assert first.items[0] == 'saved'
+        assert second.items == []
+
+        await first.stop()
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f)[0] == 'saved'
+
+        # 채우던 워커가 멈추면 다음 주기에 다른 워커가 이어받음
+        await asyncio.sleep(0.15)
+        assert second.is_owner
+        assert second.items[0] == 'saved'
+        await second.stop()
+
+    asyncio.run(scenario())
+
+
+def test_concurrent_snapshots_use_own_temp_files(tmp_path):
+    path = str(tmp_path / 'bank.json')
+    banks = [ListBank(path) for _ in range(4)]
+    for i, bank in enumerate(banks):
+        bank.items = [i] * 2000
+
+    threads = [threading.Thread(target=bank.save_snapshot) for bank in banks for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    assert len(data) == 2000 and len(set(data)) == 1
+    assert os.listdir(tmp_path) == ['bank.json']
@@ -0,0 +1,53 @@
+# tests/test_puzzle_embeddings.py (말뭉치 임베딩 파일 - 말뭉치가 바뀌면 사용하지 않음)
+import json
+
+import numpy as np
+
+from app.games.puzzle_corpus import PuzzleCorpus
+from app.games.puzzle_embeddings import (EMBEDDING_DTYPE, corpus_checksum, embeddings_path,
+                                         load_corpus_embeddings)
+
+MODEL = 'test-model'
+
+
+def make_corpus(text: str) -> PuzzleCorpus:
+    return PuzzleCorpus.build([{'text': text, 'age': 7, 'type': 'story', 'form': ''}])
+
+
+def write_embeddings(data_path: str, corpus: PuzzleCorpus):
+    path = embeddings_path(data_path)
+    np.save(path, np.ones((corpus.num_sentences(), 4), dtype=EMBEDDING_DTYPE))
+    with open(path[:-len('.npy')] + '.json', 'w', encoding='utf-8') as f:
+        json.dump({'model_name': MODEL, 'num_sentences': corpus.num_sentences(), 'dim': 4,
+                   'corpus_checksum': corpus_checksum(corpus)}, f)
+
+
+def test_rebuilt_corpus_with_same_sentence_count_is_stale(tmp_path):
+    data_path = str(tmp_path / 'processed_sentences.pkl')
+    corpus = make_corpus('토끼가 뛰었다. 거북이가 걸었다.')
+    write_embeddings(data_path, corpus)
+
+    embeddings = load_corpus_embeddings(data_path, MODEL, corpus)
+    assert embeddings is not None and embeddings.shape == (2, 4)
+    # 같은 내용으로 다시 만든 말뭉치는 그대로 사용
+    assert load_corpus_embeddings(data_path, MODEL, make_corpus('토끼가 뛰었다. 거북이가 걸었다.')) is not None
+
+    # 문장 수는 같지만 문장이 바뀌면 행이 맞지 않으므로 사용하지 않음
+    rebuilt = make_corpus('토끼가 잤다. 거북이가 걸었다.')
+    assert rebuilt.num_sentences() == corpus.num_sentences()
+    assert load_corpus_embeddings(data_path, MODEL, rebuilt) is None
+    assert load_corpus_embeddings(data_path, 'other-model', corpus) is None
+
+
+def test_sidecar_without_checksum_is_stale(tmp_path):
+    data_path = str(tmp_path / 'processed_sentences.pkl')
+    corpus = make_corpus('토끼가 뛰었다. 거북이가 걸었다.')
+    write_embeddings(data_path, corpus)
+    info_path = embeddings_path(data_path)[:-len('.npy')] + '.json'
+    with open(info_path, encoding='utf-8') as f:
+        info = json.load(f)
+    del info['corpus_checksum']
+    with open(info_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f)
+
+    assert load_corpus_embeddings(data_path, MODEL, corpus) is None
@@ -0,0 +1,172 @@
+# tests/test_session_backend.py (게임 세션 저장소 - 메모리 / 로컬 가짜 Redis 서버로 확인)
+# pip install -r requirements-dev.txt  (fakeredis[lua]: Lua 스크립트까지 실행하는 가짜 Redis)
+# 실행: python -m pytest -q tests  (backend 디렉토리에서)
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.games.game_store import WordChainState
+from app.games.session_backend import MemorySessionBackend, RedisSessionBackend, SessionConflict
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_memory_backend(ttl_seconds: float = 60) -> MemorySessionBackend:
+    backend = MemorySessionBackend(ttl_seconds=ttl_seconds)
+    backend.store._clock = FakeClock()
+    return backend
+
+
+def make_redis_backend(ttl_seconds: float = 60) -> RedisSessionBackend:
+    return RedisSessionBackend(ttl_seconds=ttl_seconds, client=fakeredis.FakeAsyncRedis())
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def make_backend(request):
+    return make_memory_backend if request.param == 'memory' else make_redis_backend
+
+
+def test_create_load_commit(make_backend):
+    async def scenario():
+        backend = make_backend()
+        assert await backend.load('g1') == (None, 0)
+
+        state = WordChainState('g1', 'easy', first_word='사과', user_id=7)
+        await backend.commit('g1', state, 0)
+
+        loaded, version = await backend.load('g1')
+        assert version == 1
+        assert isinstance(loaded, WordChainState)
+        assert loaded.to_list() == state.to_list()
+        assert loaded.used_words == {'사과'}
+
+        # load한 객체를 고쳐도 commit 전에는 저장소에 반영되지 않음
+        loaded.history.append('과자')
+        loaded.used_words.add('과자')
+        assert (await backend.load('g1'))[0].history == ['사과']
+        await backend.commit('g1', loaded, version)
+
+        loaded, version = await backend.load('g1')
+        assert version == 2
+        assert loaded.history == ['사과', '과자']
+
+        # 레코드가 아닌 값 (사용자 → 세션 ID)
+        await backend.commit('user:7', 'g1', 0)
+        assert await backend.load('user:7') == ('g1', 1)
+        await backend.aclose()
+
+    run(scenario())
+
+
+def test_version_conflict(make_backend):
+    async def scenario():
+        backend = make_backend()
+        await backend.commit('g1', WordChainState('g1', 'easy', first_word='사과'), 0)
+
+        # 두 요청이 같은 버전을 읽고 차례로 저장 → 뒤의 요청은 충돌
+        first, version = await backend.load('g1')
+        second, _ = await backend.load('g1')
+        first.score = 10
+        await backend.commit('g1', first, version)
+
+        second.score = 20
+        assert await backend.save('g1', second, version) is False
+        with pytest.raises(SessionConflict):
+            await backend.commit('g1', second, version)
+
+        loaded, version = await backend.load('g1')
+        assert (loaded.score, version) == (10, 2)
+
+        # 이미 있는 세션을 버전 0으로 새로 만들 수 없음
+        with pytest.raises(SessionConflict):
+            await backend.commit('g1', second, 0)
+        await backend.aclose()
+
+    run(scenario())
+
+
+def test_delete(make_backend):
+    async def scenario():
+        backend = make_backend()
+        state = WordChainState('g1', 'easy')
+        await backend.commit('g1', state, 0)
+        await backend.delete('g1')
+        assert await backend.load('g1') == (None, 0)
+
+        # 지운 뒤에는 버전 0부터 다시 생성
+        await backend.commit('g1', state, 0)
+        assert (await backend.load('g1'))[1] == 1
+        await backend.aclose()
+
+    run(scenario())
+
+
+def test_memory_ttl_expiry():
+    async def scenario():
+        backend = make_memory_backend(ttl_seconds=60)
+        clock = backend.store._clock
+        state = WordChainState('g1', 'easy')
+        await backend.commit('g1', state, 0)
+
+        # load로는 연장되지 않고, 저장할 때만 갱신
+        clock.now += 50
+        assert (await backend.load('g1'))[1] == 1
+        clock.now += 20
+        assert await backend.load('g1') == (None, 0)
+
+        await backend.commit('g1', state, 0)
+        clock.now += 50
+        await backend.commit('g1', state, 1)
+        clock.now += 50
+        assert (await backend.load('g1'))[1] == 2
+
+        # 저장별 ttl, 만료된 세션은 정리 작업이 지움
+        await backend.commit('g2', state, 0, ttl=5)
+        clock.now += 6
+        assert await backend.purge_expired() == 1
+        assert await backend.count() == 1
+        # 만료된 뒤의 이전 버전 저장은 충돌 (버전 0부터 다시 시작)
+        with pytest.raises(SessionConflict):
+            await backend.commit('g2', state, 1)
+
+    run(scenario())
+
+
+def test_redis_ttl_refreshed_on_save():
+    async def scenario():
+        backend = make_redis_backend(ttl_seconds=60)
+        key = backend.prefix + 'g1'
+        state = WordChainState('g1', 'easy')
+        await backend.commit('g1', state, 0)
+        assert 0 < await backend.client.pttl(key) <= 60_000
+
+        # load로는 연장되지 않고, 저장할 때만 갱신
+        await backend.client.pexpire(key, 1_000)
+        await backend.load('g1')
+        assert await backend.client.pttl(key) <= 1_000
+        await backend.commit('g1', state, 1)
+        assert await backend.client.pttl(key) > 1_000
+
+        # 저장별 ttl 지정, 충돌한 저장은 만료 시간을 건드리지 않음
+        await backend.commit('g1', state, 2, ttl=5)
+        assert 0 < await backend.client.pttl(key) <= 5_000
+        assert await backend.save('g1', state, 1, ttl=600) is False
+        assert await backend.client.pttl(key) <= 5_000
+
+        await backend.commit('g2', state, 0, ttl=0.05)
+        await asyncio.sleep(0.1)
+        assert await backend.load('g2') == (None, 0)
+        await backend.aclose()
+
+    run(scenario())